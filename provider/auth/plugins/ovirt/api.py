@@ -23,6 +23,8 @@ import requests
 from auth import Forbidden
 from auth import Timeout
 
+from .session import get_session
+
 API_PATH = '/api'
 HEADERS = {'Accept': 'application/json', 'Content-Type': 'application/json'}
 
@@ -46,7 +48,7 @@ def follow_link(obj, rel, engine_host, token, ca_file, timeout):
 
 def _http_get(url, token, ca_file, timeout, params=None):
     try:
-        response = requests.get(
+        response = get_session().get(
             url,
             headers=_get_headers(token),
             verify=ca_file,
@@ -35,16 +35,7 @@ from ovirt_provider_config import DEFAULT_ENGINE_NETWORK_ADMIN_ROLE_ID
 
 
 class AuthorizationByGroup(OVirtPlugin):
-    def validate_token(self, token):
-        return self._has_group(
-            token,
-            _admin_group_attribute_name(),
-            _admin_group_attribute_value(),
-        )
-
-    @staticmethod
-    def _has_group(token, attribute_name, attribute_value):
-
+    def _authorize(self, token):
         token_info = get_token_info(
             token=token,
             engine_url=AuthorizationByGroup._engine_url(),
@@ -57,6 +48,17 @@ class AuthorizationByGroup(OVirtPlugin):
         if not is_active(token_info):
             raise Unauthorized('Token is not active.')
 
+        return (
+            self._has_group(
+                token_info,
+                _admin_group_attribute_name(),
+                _admin_group_attribute_value(),
+            ),
+            token_info,
+        )
+
+    @staticmethod
+    def _has_group(token_info, attribute_name, attribute_value):
         return any(
             [
                 _contains(group, attribute_name, attribute_value)
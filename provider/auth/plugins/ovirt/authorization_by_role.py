@@ -42,11 +42,7 @@ STRING_ENCODING = 'ascii'
 
 
 class AuthorizationByRole(OVirtPlugin):
-    def validate_token(self, token):
-        return self._has_role(token, _admin_role_id())
-
-    @staticmethod
-    def _has_role(token, role_id):
+    def _authorize(self, token):
         profiles = get_profiles(
             token=token,
             engine_url=AuthorizationByRole._engine_url(),
@@ -68,6 +64,13 @@ class AuthorizationByRole(OVirtPlugin):
         if not is_active(token_info):
             raise Unauthorized('Token is not active.')
 
+        return (
+            self._has_role(token, token_info, profiles, _admin_role_id()),
+            token_info,
+        )
+
+    @staticmethod
+    def _has_role(token, token_info, profiles, role_id):
         user_name, authn_name = get_user_id(token_info)
 
         authz_name = extract_authz_name(profiles, authn_name)
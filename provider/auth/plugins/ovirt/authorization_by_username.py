@@ -31,12 +31,7 @@ from ovirt_provider_config import DEFAULT_ENGINE_NETWORK_ADMIN_USER_NAME
 
 
 class AuthorizationByUserName(OVirtPlugin):
-    def validate_token(self, token):
-        return self._is_user_name(token, _admin_user_name())
-
-    @staticmethod
-    def _is_user_name(token, admin_user_name):
-
+    def _authorize(self, token):
         token_info = get_token_info(
             token=token,
             engine_url=AuthorizationByUserName._engine_url(),
@@ -49,7 +44,7 @@ class AuthorizationByUserName(OVirtPlugin):
         if not is_active(token_info):
             raise Unauthorized('Token is not active.')
 
-        return admin_user_name == token_info['user_id']
+        return _admin_user_name() == token_info['user_id'], token_info
 
 
 def _admin_user_name():
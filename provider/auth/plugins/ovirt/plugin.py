@@ -18,9 +18,13 @@
 #
 from __future__ import absolute_import
 
+import abc
+
 import ovirt_provider_config
 
+from auth import Unauthorized
 from auth.plugin import Plugin
+from auth.token_cache import TokenCache
 from ovirt_provider_config import CONFIG_SECTION_OVIRT
 from ovirt_provider_config import KEY_OVIRT_HOST
 from ovirt_provider_config import KEY_OVIRT_BASE
@@ -34,11 +38,43 @@ from ovirt_provider_config import DEFAULT_OVIRT_CA_FILE
 from ovirt_provider_config import DEFAULT_OVIRT_SSO_CLIENT_ID
 from ovirt_provider_config import DEFAULT_OVIRT_SSO_CLIENT_SECRET
 from ovirt_provider_config import DEFAULT_OVIRT_AUTH_TIMEOUT
+from ovirt_provider_config_common import auth_token_cache_negative_ttl
+from ovirt_provider_config_common import auth_token_cache_size
+from ovirt_provider_config_common import auth_token_cache_ttl
 
 from . import sso
 
 
 class OVirtPlugin(Plugin):
+    def __init__(self):
+        self._token_cache = TokenCache(
+            ttl=auth_token_cache_ttl(),
+            negative_ttl=auth_token_cache_negative_ttl(),
+            max_entries=auth_token_cache_size(),
+        )
+
+    def validate_token(self, token):
+        cached = self._token_cache.get(token)
+        if cached:
+            return cached.validate()
+        try:
+            authorized, token_info = self._authorize(token)
+        except Unauthorized as e:
+            self._token_cache.put_rejected(token, str(e))
+            raise
+        self._token_cache.put(
+            token, authorized, expires_at=sso.get_expiry(token_info)
+        )
+        return authorized
+
+    @abc.abstractmethod
+    def _authorize(self, token):
+        """
+        Checks the token against the engine.
+        :return: a tuple of the authorization result and the token info
+        """
+        pass
+
     def create_token(self, user_at_domain, user_password):
         return sso.create_token(
             username=user_at_domain,
@@ -0,0 +1,160 @@
+# Copyright 2026 Red Hat, Inc.
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA
+#
+# Refer to the README and COPYING files for full details of the license
+#
+from __future__ import absolute_import
+
+from http.cookiejar import DefaultCookiePolicy
+import os
+import ssl
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.utils import DEFAULT_CA_BUNDLE_PATH
+from urllib3.util.retry import Retry
+
+import ovirt_provider_config
+from ovirt_provider_config import CONFIG_SECTION_OVIRT
+from ovirt_provider_config import KEY_OVIRT_CONNECTION_POOL_SIZE
+from ovirt_provider_config import KEY_OVIRT_CONNECTION_RETRIES
+from ovirt_provider_config import KEY_OVIRT_CONNECTION_RETRY_BACKOFF
+from ovirt_provider_config import KEY_OVIRT_KEEP_ALIVE
+from ovirt_provider_config import DEFAULT_OVIRT_CONNECTION_POOL_SIZE
+from ovirt_provider_config import DEFAULT_OVIRT_CONNECTION_RETRIES
+from ovirt_provider_config import DEFAULT_OVIRT_CONNECTION_RETRY_BACKOFF
+from ovirt_provider_config import DEFAULT_OVIRT_KEEP_ALIVE
+
+_session = None
+_session_lock = threading.Lock()
+
+
+def get_session():
+    """
+    Returns the session used for all the calls to the engine. Its connection
+    pool is thread safe, so the session is shared by all the requests.
+    """
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                _session = _create_session()
+    return _session
+
+
+def _create_session():
+    session = requests.Session()
+    # The session is shared by calls made on behalf of different users, so
+    # the engine must not be able to bind them together using cookies.
+    session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+    if not _keep_alive():
+        session.headers['Connection'] = 'close'
+    adapter = _EngineAdapter(
+        pool_maxsize=_pool_size(),
+        max_retries=Retry(
+            total=_retries(),
+            connect=_retries(),
+            read=False,
+            backoff_factor=_retry_backoff(),
+        ),
+    )
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
+
+
+class _EngineAdapter(HTTPAdapter):
+    """
+    Shares a TLS context between the connections to the engine verified the
+    same way. The context is built once, with the CA file passed as verify,
+    so opening a connection neither loads the CA file again nor changes a
+    context used by other connections.
+    """
+
+    def __init__(self, *args, **kwargs):
+        self._tls_contexts = {}
+        self._tls_contexts_lock = threading.Lock()
+        super(_EngineAdapter, self).__init__(*args, **kwargs)
+
+    def build_connection_pool_key_attributes(self, request, verify, cert=None):
+        host_params, pool_kwargs = super(
+            _EngineAdapter, self
+        ).build_connection_pool_key_attributes(request, verify, cert)
+        if host_params['scheme'] == 'https':
+            pool_kwargs.pop('ca_certs', None)
+            pool_kwargs.pop('ca_cert_dir', None)
+            pool_kwargs['ssl_context'] = self._tls_context(verify)
+        return host_params, pool_kwargs
+
+    def cert_verify(self, conn, url, verify, cert):
+        super(_EngineAdapter, self).cert_verify(conn, url, verify, cert)
+        # The CA is already loaded in the context of the pool
+        conn.ca_certs = None
+        conn.ca_cert_dir = None
+
+    def _tls_context(self, verify):
+        key = verify if isinstance(verify, str) else bool(verify)
+        with self._tls_contexts_lock:
+            if key not in self._tls_contexts:
+                self._tls_contexts[key] = _create_tls_context(key)
+            return self._tls_contexts[key]
+
+
+def _create_tls_context(verify):
+    context = ssl.SSLContext(ssl.PROTOCOL_TLS_CLIENT)
+    if not verify:
+        context.check_hostname = False
+        context.verify_mode = ssl.CERT_NONE
+    elif isinstance(verify, str) and os.path.isdir(verify):
+        context.load_verify_locations(capath=verify)
+    else:
+        context.load_verify_locations(
+            cafile=(
+                verify if isinstance(verify, str) else DEFAULT_CA_BUNDLE_PATH
+            )
+        )
+    return context
+
+
+def _pool_size():
+    return ovirt_provider_config.getint(
+        CONFIG_SECTION_OVIRT,
+        KEY_OVIRT_CONNECTION_POOL_SIZE,
+        DEFAULT_OVIRT_CONNECTION_POOL_SIZE,
+    )
+
+
+def _keep_alive():
+    return ovirt_provider_config.getboolean(
+        CONFIG_SECTION_OVIRT, KEY_OVIRT_KEEP_ALIVE, DEFAULT_OVIRT_KEEP_ALIVE
+    )
+
+
+def _retries():
+    return ovirt_provider_config.getint(
+        CONFIG_SECTION_OVIRT,
+        KEY_OVIRT_CONNECTION_RETRIES,
+        DEFAULT_OVIRT_CONNECTION_RETRIES,
+    )
+
+
+def _retry_backoff():
+    return ovirt_provider_config.getfloat(
+        CONFIG_SECTION_OVIRT,
+        KEY_OVIRT_CONNECTION_RETRY_BACKOFF,
+        DEFAULT_OVIRT_CONNECTION_RETRY_BACKOFF,
+    )
@@ -25,6 +25,8 @@ from auth import BadGateway
 from auth import Unauthorized
 from auth import Timeout
 
+from .session import get_session
+
 AUTH_PATH = '/sso/oauth'
 TOKEN_PATH = '/token'
 TOKEN_INFO_PATH = '/token-info'
@@ -67,7 +69,7 @@ def _post(url, *args, **kwargs):
     _get_logger().debug(
         'Connecting to oVirt engine\'s SSO module: {}'.format(url)
     )
-    return requests.post(url, *args, **kwargs)
+    return get_session().post(url, *args, **kwargs)
 
 
 def _get_logger():
@@ -155,6 +157,14 @@ def is_active(token_info):
     return token_info['active']
 
 
+def get_expiry(token_info):
+    """Seconds since the epoch at which the token expires, if reported"""
+    try:
+        return int(token_info['exp']) / 1000.0
+    except (KeyError, TypeError, ValueError):
+        return None
+
+
 def get_user_id(token_info):
     user_id = token_info['user_id'].split('@')
     return user_id[0], user_id[-1]
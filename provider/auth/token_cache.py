@@ -0,0 +1,91 @@
+# Copyright 2026 Red Hat, Inc.
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA
+#
+# Refer to the README and COPYING files for full details of the license
+#
+from __future__ import absolute_import
+
+from collections import OrderedDict
+import hashlib
+import threading
+import time
+
+from auth.errors import Unauthorized
+
+
+class TokenCache(object):
+    """
+    LRU cache of token validation results. Only sha256 digests of the
+    tokens are kept. Authorized tokens are kept for ttl seconds, but never
+    past the expiry reported for the token. Rejected tokens are kept for
+    negative_ttl seconds. A ttl of 0 disables the cache.
+    """
+
+    def __init__(self, ttl, negative_ttl, max_entries):
+        self._ttl = ttl
+        self._negative_ttl = negative_ttl
+        self._max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, token):
+        key = _key(token)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry.deadline <= time.time():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry
+
+    def put(self, token, authorized, expires_at=None):
+        ttl = self._ttl if authorized else self._negative_ttl
+        deadline = time.time() + ttl
+        if expires_at is not None:
+            deadline = min(deadline, expires_at)
+        self._store(token, _Entry(deadline, authorized=authorized))
+
+    def put_rejected(self, token, message):
+        deadline = time.time() + self._negative_ttl
+        self._store(token, _Entry(deadline, error=message))
+
+    def _store(self, token, entry):
+        if self._ttl <= 0 or entry.deadline <= time.time():
+            return
+        key = _key(token)
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+
+
+class _Entry(object):
+    def __init__(self, deadline, authorized=False, error=None):
+        self.deadline = deadline
+        self.authorized = authorized
+        self.error = error
+
+    def validate(self):
+        if self.error is not None:
+            raise Unauthorized(self.error)
+        return self.authorized
+
+
+def _key(token):
+    return hashlib.sha256(token.encode()).digest()
@@ -22,12 +22,14 @@ TABLE_LS = 'Logical_Switch'
 ROW_LS_NAME = 'name'
 ROW_LS_OTHER_CONFIG = 'other_config'
 ROW_LS_EXTERNAL_IDS = 'external_ids'
+ROW_LS_PORTS = 'ports'
 LS_OPTION_EXCLUDE_IPS = 'exclude_ips'
 LS_EXCLUDED_IP_DELIMITER = '..'
 
 TABLE_LSP = 'Logical_Switch_Port'
 ROW_LSP_NAME = 'name'
 ROW_LSP_ADDRESSES = 'addresses'
+ROW_LSP_DYNAMIC_ADDRESSES = 'dynamic_addresses'
 ROW_LSP_EXTERNAL_IDS = 'external_ids'
 ROW_LSP_ENABLED = 'enabled'
 ROW_LSP_DHCPV4_OPTIONS = 'dhcpv4_options'
@@ -56,6 +58,7 @@ ROW_LR_STATIC_ROUTES = 'static_routes'
 ROW_LR_EXTERNAL_IDS = 'external_ids'
 
 TABLE_LRP = 'Logical_Router_Port'
+ROW_LRP_MAC = 'mac'
 ROW_LRP_NETWORKS = 'networks'
 ROW_LRP_IPV6_RA_CONFIGS = 'ipv6_ra_configs'
 ROW_LRP_IPV6_ADDRESS_MODE = 'address_mode'
@@ -78,11 +81,24 @@ DEFAULT_ROUTE6 = '::/0'
 TABLE_PORT_GROUP = 'Port_Group'
 ROW_PG_NAME = 'name'
 ROW_PG_EXTERNAL_IDS = 'external_ids'
+ROW_PG_PORTS = 'ports'
 
 TABLE_ACL = 'ACL'
 
 TABLE_ADDRESS_SET = 'Address_Set'
 
+# The tables of the north db replicated by the provider
+NB_TABLES = (
+    TABLE_LS,
+    TABLE_LSP,
+    TABLE_DHCP_Options,
+    TABLE_LR,
+    TABLE_LRP,
+    TABLE_ROUTES,
+    TABLE_PORT_GROUP,
+    TABLE_ACL,
+)
+
 # Extensions
 EXTENSION_UPDATED = '2022-02-28T00:00:00-00:00'
 SUPPORTED_EXTENSIONS = [('Neutron Extra Route', 'extraroute')]
@@ -19,8 +19,10 @@
 from __future__ import absolute_import
 
 import abc
+import html
 import json as libjson
 import logging
+import zlib
 
 from http.server import BaseHTTPRequestHandler
 import http.client as http_client
@@ -30,12 +32,16 @@ from auth import BadGateway
 from auth import Forbidden
 from auth import Unauthorized
 from auth import Timeout
-from handlers.query_filter import filter_query_results
-from handlers.query_filter import should_be_filtered
+from handlers.query_filter import is_collection
+from handlers.query_filter import iter_query_results
 from handlers import GET
 from handlers import POST
 from handlers import PUT
 from handlers import DELETE
+from ovirt_provider_config_common import gzip_compression_level
+from ovirt_provider_config_common import gzip_min_size
+from ovirt_provider_config_common import keep_alive_max_requests
+from ovirt_provider_config_common import keep_alive_timeout
 
 JSON_SUFFIX = '.json'
 
@@ -51,6 +57,13 @@ ERROR_MESSAGE = """
 
 ERROR_CONTENT_TYPE = 'application/json'
 
+# Collections are encoded one item at a time, and written to the socket
+# whenever this many bytes are pending.
+STREAM_BUFFER_SIZE = 64 * 1024
+
+# zlib window bits producing a gzip header and trailer
+GZIP_WBITS = 16 + zlib.MAX_WBITS
+
 
 class Response(object):
     def __init__(self, json=None, code=None, headers=None):
@@ -59,6 +72,68 @@ class Response(object):
         self.headers = headers
 
 
+def accepts_gzip(accept_encoding):
+    qualities = {}
+    for coding in (accept_encoding or '').split(','):
+        name, _, parameters = coding.partition(';')
+        quality = 1.0
+        for parameter in parameters.split(';'):
+            key, _, value = parameter.partition('=')
+            if key.strip().lower() == 'q':
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        qualities[name.strip().lower()] = quality
+    return qualities.get('gzip', qualities.get('*', 0.0)) > 0
+
+
+def matches_entity_tag(if_none_match, entity_tag):
+    # weak comparison
+    return _opaque_tag(entity_tag) in map(
+        _opaque_tag, _entity_tags(if_none_match)
+    )
+
+
+def matches_any_entity(if_none_match):
+    return '*' in _entity_tags(if_none_match)
+
+
+def _entity_tags(if_none_match):
+    return [tag.strip() for tag in (if_none_match or '').split(',')]
+
+
+def _opaque_tag(entity_tag):
+    return entity_tag[2:] if entity_tag.startswith('W/') else entity_tag
+
+
+class _BodyStream(object):
+    def __init__(self, wfile, chunked, compressor):
+        self._wfile = wfile
+        self._chunked = chunked
+        self._compressor = compressor
+
+    def write(self, data):
+        if self._compressor:
+            data = self._compressor.compress(data)
+        self._write(data)
+
+    def close(self):
+        if self._compressor:
+            self._write(self._compressor.flush())
+        if self._chunked:
+            self._wfile.write(b'0\r\n\r\n')
+
+    def _write(self, data):
+        # An empty chunk would end the body
+        if not data:
+            return
+        if self._chunked:
+            self._wfile.write(b'%x\r\n' % len(data) + data + b'\r\n')
+        else:
+            self._wfile.write(data)
+
+
 class PathNotFoundError(AttributeError):
     pass
 
@@ -86,7 +161,18 @@ class BaseHandler(BaseHTTPRequestHandler):
     error_message_format = ERROR_MESSAGE
     error_content_type = ERROR_CONTENT_TYPE
 
-    # TODO: this is made configurable in a later patch
+    # Connections are kept open between requests, so every response carries
+    # its length or is chunked.
+    protocol_version = 'HTTP/1.1'
+    # The headers and the body are separate writes, and the client delays
+    # acknowledging the first one, which holds the body back on a connection
+    # kept open.
+    disable_nagle_algorithm = True
+
+    _served_requests = 0
+    _idle = False
+    _request_read = False
+    _response_started = False
 
     def __init__(self, request, client_address, server):
         self._run_server(request, client_address, server)
@@ -94,6 +180,47 @@ class BaseHandler(BaseHTTPRequestHandler):
     def _run_server(self, request, client_address, server):
         BaseHTTPRequestHandler.__init__(self, request, client_address, server)
 
+    def handle_one_request(self):
+        self._served_requests += 1
+        self._request_read = False
+        self._response_started = False
+        # Waiting for the next request times out on a connection idle for
+        # longer than keep-alive-timeout, which closes it.
+        self.connection.settimeout(keep_alive_timeout() or None)
+        self._set_idle(self._served_requests > 1)
+        try:
+            BaseHTTPRequestHandler.handle_one_request(self)
+        finally:
+            self._set_idle(False)
+
+    def _set_idle(self, idle):
+        # The server may close an idle connection to free its worker for a
+        # connection waiting in the queue.
+        if idle != self._idle and hasattr(self.server, 'connection_idle'):
+            self.server.connection_idle(self.connection, idle)
+            self._idle = idle
+
+    def parse_request(self):
+        self._set_idle(False)
+        parsed = BaseHTTPRequestHandler.parse_request(self)
+        # Once the request has arrived, reading its body and writing a large
+        # response to a slow client are not bound by keep-alive-timeout.
+        self.connection.settimeout(None)
+        return parsed
+
+    def end_headers(self):
+        if not self.close_connection and self._is_last_request():
+            self.send_header('Connection', 'close')
+        self._response_started = True
+        BaseHTTPRequestHandler.end_headers(self)
+
+    def _is_last_request(self):
+        max_requests = keep_alive_max_requests()
+        return (
+            not keep_alive_timeout()
+            or 0 < max_requests <= self._served_requests
+        )
+
     def do_GET(self):
         self._handle_request(GET, code=http_client.OK)
 
@@ -132,18 +259,23 @@ class BaseHandler(BaseHTTPRequestHandler):
             )
 
     def _handle_request(self, method, code=http_client.OK, content=None):
+        self._request_read = True
         self._log_request(method, self.path, content)
         try:
             path_parts, query = self._parse_request_path(self.path)
             self._validate_request(method, id)
-            response = self.handle_request(method, path_parts, content)
-            result = (
-                self._filter_results(query, response)
-                if should_be_filtered(response.body, query, path_parts, method)
-                else response.body
-            )
-            body = libjson.dumps(result) if result else None
-            self._process_response(body, response.code or code)
+            response = self.handle_request(method, path_parts, content, query)
+            if is_collection(response.body, path_parts, method):
+                self._process_collection_response(
+                    *self._filter_results(query, response),
+                    response_code=response.code or code,
+                    headers=response.headers,
+                )
+            else:
+                body = libjson.dumps(response.body) if response.body else None
+                self._process_response(
+                    body, response.code or code, response.headers
+                )
         except PathNotFoundError as e:
             message = 'Incorrect path: {}'.format(self.path)
             self._handle_response_exception(
@@ -236,7 +368,9 @@ class BaseHandler(BaseHTTPRequestHandler):
     @staticmethod
     def _filter_results(query, response):
         resource_name, resource_data = list(response.body.items())[0]
-        return {resource_name: filter_query_results(resource_data, query)}
+        if query:
+            resource_data = iter_query_results(resource_data, query)
+        return resource_name, resource_data
 
     def _validate_request(self, method, id):
         if method in [DELETE, PUT] and not id:
@@ -244,24 +378,122 @@ class BaseHandler(BaseHTTPRequestHandler):
                 '{method} request must specify an id'.format(method=method)
             )
 
-    def _process_response(self, response, response_code):
-        self._set_response_headers(response_code, response)
-        logging.debug('Response code: {}'.format(response_code))
+    def _process_response(self, response, response_code, headers=None):
         if response:
             logging.debug('Response body: {}'.format(response))
-            self.wfile.write(response.encode())
+        self._send_body(
+            response.encode() if response else b'', response_code, headers
+        )
+
+    def _send_body(self, body, response_code, headers=None):
+        compressor = self._response_compressor(len(body))
+        if compressor:
+            body = compressor.compress(body) + compressor.flush()
+        self._set_response_headers(
+            response_code,
+            body,
+            compressed=compressor is not None,
+            headers=headers,
+        )
+        logging.debug('Response code: {}'.format(response_code))
+        if body:
+            self.wfile.write(body)
+
+    def _process_collection_response(
+        self, resource_name, items, response_code, headers=None
+    ):
+        # A document fitting in the first buffered part is sent with its
+        # length, a larger one is streamed.
+        buffer = bytearray(
+            '{{{}: ['.format(libjson.dumps(resource_name)).encode()
+        )
+        stream = None
+        count = 0
+        for item in items:
+            if count:
+                buffer += b', '
+            buffer += libjson.dumps(item).encode()
+            count += 1
+            if len(buffer) >= STREAM_BUFFER_SIZE:
+                if not stream:
+                    stream = self._start_stream(response_code, headers)
+                stream.write(buffer)
+                buffer = bytearray()
+        buffer += b']}'
+        logging.debug(
+            'Response body: {} {} items'.format(count, resource_name)
+        )
+        if not stream:
+            self._send_body(bytes(buffer), response_code, headers)
+            return
+        stream.write(buffer)
+        stream.close()
+
+    def _start_stream(self, response_code, headers=None):
+        chunked = self._is_chunked_response()
+        compressor = self._response_compressor(None)
+        self.send_response(response_code)
+        self.send_header('Content-Type', 'application/json')
+        self._send_headers(headers)
+        self._send_compression_headers(compressor is not None)
+        if chunked:
+            self.send_header('Transfer-Encoding', 'chunked')
+        else:
+            self.close_connection = True
+        self.end_headers()
+        logging.debug('Response code: {}'.format(response_code))
+        return _BodyStream(self.wfile, chunked, compressor)
+
+    def _is_chunked_response(self):
+        return (
+            self.protocol_version != 'HTTP/1.0'
+            and self.request_version != 'HTTP/1.0'
+        )
+
+    def _response_compressor(self, size):
+        # The size of a streamed body is None, as it is not known yet
+        level = gzip_compression_level()
+        if not level:
+            return None
+        if size is not None and (not size or size < gzip_min_size()):
+            return None
+        if not accepts_gzip(self.headers.get('Accept-Encoding')):
+            return None
+        return zlib.compressobj(level, zlib.DEFLATED, GZIP_WBITS)
+
+    def _send_compression_headers(self, compressed):
+        if compressed:
+            self.send_header('Content-Encoding', 'gzip')
+        # With compression enabled, any response could have been compressed
+        # for another Accept-Encoding, so caches must not share it.
+        if gzip_compression_level():
+            self.send_header('Vary', 'Accept-Encoding')
 
     def _get_content(self):
         content_length = int(self.headers['Content-Length'])
         content = self.rfile.read(content_length)
         return content
 
-    def _set_response_headers(self, response_code, response):
+    def _set_response_headers(
+        self, response_code, body, compressed=False, headers=None
+    ):
         self.send_response(response_code)
-        if response:
+        if body:
             self.send_header('Content-Type', 'application/json')
+        self._send_headers(headers)
+        self._send_compression_headers(compressed)
+        # The responses without a body do not tell its length
+        if response_code not in (
+            http_client.NO_CONTENT,
+            http_client.NOT_MODIFIED,
+        ):
+            self.send_header('Content-Length', str(len(body)))
         self.end_headers()
 
+    def _send_headers(self, headers):
+        for keyword, value in (headers or {}).items():
+            self.send_header(keyword, value)
+
     def _handle_response_exception(
         self,
         e,
@@ -274,11 +506,46 @@ class BaseHandler(BaseHTTPRequestHandler):
         self._log_request(method, path, content, log_level=logging.ERROR)
         error_message = str(e) or message or ''
         logging.exception(error_message)
+        if self._response_started:
+            # The status line is sent already, the body is left unterminated
+            # so the client notices it is truncated when the connection
+            # closes.
+            logging.error(
+                'Response to {} {} cut off, closing the connection'.format(
+                    method, path
+                )
+            )
+            self.close_connection = True
+            return
         explain = libjson.dumps(error_message)
         self.send_error(
             response_code, explain=explain
         )  # pylint: disable=E1123
 
+    def send_error(self, code, message=None, explain=None):
+        # BaseHTTPRequestHandler closes the connection, which is kept open
+        # for the next request once the request was read completely.
+        if not self._request_read:
+            BaseHTTPRequestHandler.send_error(self, code, message, explain)
+            return
+        short_message, long_message = self.responses.get(code, ('???', '???'))
+        message = short_message if message is None else message
+        explain = long_message if explain is None else explain
+        self.log_error('code %d, message %s', code, message)
+        body = (
+            self.error_message_format
+            % {
+                'code': code,
+                'message': html.escape(message, quote=False),
+                'explain': html.escape(explain, quote=False),
+            }
+        ).encode('UTF-8', 'replace')
+        self.send_response(code, message)
+        self.send_header('Content-Type', self.error_content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
     @staticmethod
     def _parse_request_path(full_path):
         parsed_path = urllib_parse.urlparse(full_path)
@@ -296,7 +563,7 @@ class BaseHandler(BaseHTTPRequestHandler):
         return path
 
     @abc.abstractmethod
-    def handle_request(self, method, path_parts, content):
+    def handle_request(self, method, path_parts, content, query):
         """
         :return: An instance of Response
         """
@@ -18,21 +18,145 @@
 #
 from __future__ import absolute_import
 
+import contextlib
+import threading
+
+import http.client as http_client
+
 from auth import validate_token
 from auth import Forbidden
 from auth import TOKEN_HTTP_HEADER_FIELD_NAME
+from handlers import GET
+from handlers import POST
+from handlers.base_handler import Response
+from handlers.base_handler import matches_any_entity
+from handlers.base_handler import matches_entity_tag
 from handlers.selecting_handler import SelectingHandler
+from handlers.neutron_responses import PORTS
 from handlers.neutron_responses import responses
 from neutron.neutron_api import NeutronApi
+from ovirt_provider_config_common import group_commit_window
+
+
+class WriteLock(object):
+    """
+    Serializes the modifying requests. Requests that may safely run
+    together share the lock instead. A request waiting for the exclusive
+    lock keeps new requests from sharing it, so it is not starved.
+    """
+
+    def __init__(self):
+        self._condition = threading.Condition()
+        self._holders = 0
+        self._exclusive = False
+        self._exclusive_waiting = 0
+
+    @contextlib.contextmanager
+    def exclusive(self):
+        with self._condition:
+            self._exclusive_waiting += 1
+            self._condition.wait_for(lambda: not self._holders)
+            self._exclusive_waiting -= 1
+            self._holders = 1
+            self._exclusive = True
+        try:
+            yield
+        finally:
+            self._release()
+
+    @contextlib.contextmanager
+    def shared(self):
+        with self._condition:
+            self._condition.wait_for(
+                lambda: not self._exclusive and not self._exclusive_waiting
+            )
+            self._holders += 1
+        try:
+            yield
+        finally:
+            self._release()
+
+    def locked(self):
+        return self._holders > 0
+
+    def _release(self):
+        with self._condition:
+            self._holders -= 1
+            self._exclusive = False
+            self._condition.notify_all()
+
+
+_write_lock = WriteLock()
 
 
 class NeutronHandler(SelectingHandler):
+    _guard = contextlib.nullcontext()
+
+    def handle_request(self, method, path_parts, content, query):
+        # The guard is only entered around the response handler, once the
+        # request is authenticated.
+        self._guard = self._request_guard(method, path_parts)
+        return SelectingHandler.handle_request(
+            self, method, path_parts, content, query
+        )
+
+    def _request_guard(self, method, path_parts):
+        # Modifying requests read the NB db before writing to it, so they
+        # are serialized to keep concurrent read-modify-write sequences
+        # from interleaving. Reads are served concurrently, and so are port
+        # creations when their transactions are group committed.
+        if method == GET:
+            return contextlib.nullcontext()
+        if method == POST and path_parts == [PORTS] and group_commit_window():
+            return _write_lock.shared()
+        return _write_lock.exclusive()
+
     def call_response_handler(self, response_handler, content, parameters):
         if not validate_token(
             self.headers.get(TOKEN_HTTP_HEADER_FIELD_NAME, '')
         ):
             raise Forbidden()
-        return response_handler(NeutronApi(), content, parameters)
+        neutron_api = NeutronApi.instance()
+        entity_tag = self._entity_tag(neutron_api, response_handler)
+        if_none_match = self.headers.get('If-None-Match')
+        if entity_tag and matches_entity_tag(if_none_match, entity_tag):
+            return self._not_modified(entity_tag)
+        with self._guard:
+            response = response_handler(neutron_api, content, parameters)
+        # * matches any current representation, so only once the handler
+        # found the entity.
+        if (
+            entity_tag
+            and matches_any_entity(if_none_match)
+            and response.code in (None, http_client.OK)
+        ):
+            return self._not_modified(entity_tag)
+        if entity_tag:
+            response.headers = dict(response.headers or {}, ETag=entity_tag)
+        return response
+
+    @staticmethod
+    def _not_modified(entity_tag):
+        return Response(
+            code=http_client.NOT_MODIFIED, headers={'ETag': entity_tag}
+        )
+
+    @staticmethod
+    def _entity_tag(neutron_api, response_handler):
+        """
+        Returns the ETag of the response of response_handler, made of the
+        changes of the north db tables it reads. The tag is taken before the
+        tables are read, so a response built after a change carries an older
+        tag at worst, which is then refreshed on the next request.
+        """
+        tables = getattr(response_handler, 'tables', None)
+        if not tables:
+            return None
+        change_tag = neutron_api.change_tag(tables)
+        if change_tag is None:
+            return None
+        # Weak, as the bytes of the body depend on the content encoding
+        return 'W/"{}"'.format(change_tag)
 
     @staticmethod
     def get_responses():
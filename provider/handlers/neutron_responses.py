@@ -19,14 +19,21 @@ from __future__ import absolute_import
 
 import json
 
+import constants as ovnconst
 from handlers.base_handler import GET
 from handlers.base_handler import DELETE
 from handlers.base_handler import POST
 from handlers.base_handler import PUT
 from handlers.base_handler import Response
 
+from handlers.pagination import paginate
+from handlers.pagination import requested_page
+from handlers.pagination import sorted_from_marker
+from handlers.query_filter import query_filters
 from handlers.responses_utils import get_entity
+from handlers.selecting_handler import QUERY_PARAMETERS
 from handlers.selecting_handler import rest
+from http_server import tls_handshake_summaries
 from ovirt_provider_config_common import neutron_url_with_version
 
 NETWORK_ID = 'network_id'
@@ -56,21 +63,82 @@ EXTENSION_ENTITY = 'extensions/{alias}'
 
 FLOATINGIPS = 'floatingips'
 
+# The north db tables the entities are read from
+NETWORK_TABLES = (ovnconst.TABLE_LS, ovnconst.TABLE_LSP)
+PORT_TABLES = (
+    ovnconst.TABLE_LS,
+    ovnconst.TABLE_LSP,
+    ovnconst.TABLE_DHCP_Options,
+    ovnconst.TABLE_LRP,
+    ovnconst.TABLE_PORT_GROUP,
+)
+SUBNET_TABLES = (ovnconst.TABLE_DHCP_Options,)
+ROUTER_TABLES = (
+    ovnconst.TABLE_LR,
+    ovnconst.TABLE_LRP,
+    ovnconst.TABLE_ROUTES,
+    ovnconst.TABLE_LS,
+    ovnconst.TABLE_LSP,
+    ovnconst.TABLE_DHCP_Options,
+)
+SECURITY_GROUP_TABLES = (ovnconst.TABLE_PORT_GROUP, ovnconst.TABLE_ACL)
+
 
 _responses = {}
 
 
+def read_from(tables):
+    """
+    Declares the north db tables a GET response is built from. The response
+    is tagged with an ETag which changes with these tables, so a client
+    holding the current one gets 304 Not Modified instead.
+    """
+
+    def assign_tables(funct):
+        funct.tables = tables
+        return funct
+
+    return assign_tables
+
+
+def _collection(resource_name, path, parameters, list_all, iter_sorted=None):
+    """
+    Returns the response listing the collection resource_name, or the page
+    of it requested by the query, with the links to the pages around it.
+    iter_sorted(marker, reverse) iterates over the collection in the order
+    of the page, reading only the items iterated over, or returns None when
+    it cannot. The whole collection from list_all() is sorted then.
+    """
+    query = parameters.get(QUERY_PARAMETERS)
+    page = requested_page(query)
+    if page is None:
+        return Response({resource_name: list_all()})
+    items = iter_sorted(page.marker, page.reverse) if iter_sorted else None
+    if items is None:
+        items = sorted_from_marker(list_all(), page)
+    items, links = paginate(
+        items, page, query, neutron_url_with_version() + path
+    )
+    body = {resource_name: items}
+    if links:
+        body[resource_name + '_links'] = links
+    return Response(body)
+
+
 @rest(GET, NETWORK_ENTITY, _responses)
+@read_from(NETWORK_TABLES)
 def show_network(nb_db, content, parameters):
     return Response({'network': nb_db.get_network(parameters[NETWORK_ID])})
 
 
 @rest(GET, PORT_ENTITY, _responses)
+@read_from(PORT_TABLES)
 def show_port(nb_db, content, parameters):
     return Response({'port': nb_db.get_port(parameters[PORT_ID])})
 
 
 @rest(GET, SUBNET_ENTITY, _responses)
+@read_from(SUBNET_TABLES)
 def show_subnet(nb_db, content, parameters):
     return Response({'subnet': nb_db.get_subnet(parameters[SUBNET_ID])})
 
@@ -104,20 +172,38 @@ def show_extension(nb_db, content, parameters):
 
 
 @rest(GET, NETWORKS, _responses)
+@read_from(NETWORK_TABLES)
 def get_networks(nb_db, content, parameters):
-    networks = nb_db.list_networks()
-    return Response({'networks': networks})
+    return _collection(
+        'networks',
+        NETWORKS,
+        parameters,
+        nb_db.list_networks,
+        nb_db.iter_networks,
+    )
 
 
 @rest(GET, PORTS, _responses)
+@read_from(PORT_TABLES)
 def get_ports(nb_db, content, parameters):
-    ports = nb_db.list_ports()
-    return Response({'ports': ports})
+    filters = query_filters(parameters.get(QUERY_PARAMETERS))
+    return _collection(
+        'ports',
+        PORTS,
+        parameters,
+        lambda: nb_db.list_ports(filters=filters),
+        lambda marker, reverse: nb_db.iter_ports(
+            marker, reverse, filters=filters
+        ),
+    )
 
 
 @rest(GET, SUBNETS, _responses)
+@read_from(SUBNET_TABLES)
 def get_subnets(nb_db, content, parameters):
-    return Response({'subnets': nb_db.list_subnets()})
+    return _collection(
+        'subnets', SUBNETS, parameters, nb_db.list_subnets, nb_db.iter_subnets
+    )
 
 
 @rest(DELETE, NETWORK_ENTITY, _responses)
@@ -181,9 +267,10 @@ def put_subnets(nb_db, content, parameters):
 
 
 @rest(GET, 'tech', _responses)
+@read_from(NETWORK_TABLES + PORT_TABLES + ROUTER_TABLES)
 def get_debug(nb_db, content, parameters):
     networks = nb_db.list_networks()
-    ports = nb_db.list_ports()
+    ports = list(nb_db.list_ports())
     subnets = nb_db.list_subnets()
     routers = nb_db.list_routers()
     return Response(
@@ -196,9 +283,15 @@ def get_debug(nb_db, content, parameters):
     )
 
 
+@rest(GET, 'tech/tls', _responses)
+def get_tls_debug(nb_db, content, parameters):
+    return Response({'tls_handshakes': tls_handshake_summaries()})
+
+
 @rest(GET, ROUTERS, _responses)
+@read_from(ROUTER_TABLES)
 def get_routers(nb_db, content, parameters):
-    return Response({'routers': nb_db.list_routers()})
+    return _collection('routers', ROUTERS, parameters, nb_db.list_routers)
 
 
 @rest(POST, ROUTERS, _responses)
@@ -210,6 +303,7 @@ def post_routers(nb_db, content, parameters):
 
 
 @rest(GET, ROUTER_ENTITY, _responses)
+@read_from(ROUTER_TABLES)
 def get_router(nb_db, content, parameters):
     return Response({'router': nb_db.get_router(parameters[ROUTER_ID])})
 
@@ -250,11 +344,18 @@ def get_floating_ips(nb_db, content, parameters):
 
 
 @rest(GET, SECURITY_GROUPS, _responses)
+@read_from(SECURITY_GROUP_TABLES)
 def get_security_groups(nb_db, content, parameters):
-    return Response({'security_groups': nb_db.list_security_groups()})
+    return _collection(
+        'security_groups',
+        SECURITY_GROUPS,
+        parameters,
+        nb_db.list_security_groups,
+    )
 
 
 @rest(GET, SECURITY_GROUP_ENTITY, _responses)
+@read_from(SECURITY_GROUP_TABLES)
 def show_security_group(nb_db, content, parameters):
     return Response(
         {
@@ -288,13 +389,18 @@ def put_security_group(nb_db, content, parameters):
 
 
 @rest(GET, SECURITY_GROUP_RULES, _responses)
+@read_from(SECURITY_GROUP_TABLES)
 def get_security_group_rules(nb_db, content, parameters):
-    return Response(
-        {'security_group_rules': nb_db.list_security_group_rules()}
+    return _collection(
+        'security_group_rules',
+        SECURITY_GROUP_RULES,
+        parameters,
+        nb_db.list_security_group_rules,
     )
 
 
 @rest(GET, SECURITY_GROUP_RULE_ENTITY, _responses)
+@read_from(SECURITY_GROUP_TABLES)
 def show_security_group_rule(nb_db, content, parameters):
     return Response(
         {
@@ -0,0 +1,131 @@
+# Copyright 2026 Red Hat, Inc.
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA
+#
+# Refer to the README and COPYING files for full details of the license
+from __future__ import absolute_import
+
+import itertools
+import urllib.parse as urllib_parse
+
+from handlers.base_handler import BadRequestError
+from handlers.query_filter import LIMIT
+from handlers.query_filter import MARKER
+from handlers.query_filter import PAGE_REVERSE
+from handlers.query_filter import PAGINATION_PARAMETERS
+from handlers.query_filter import iter_query_results
+
+ID = 'id'
+
+
+class Page(object):
+    """
+    A page of a collection sorted by id: up to limit items following the
+    item with the id marker, or preceding it when reverse. Without a limit
+    the page holds all of them.
+    """
+
+    def __init__(self, limit=None, marker=None, reverse=False):
+        self.limit = limit
+        self.marker = marker
+        self.reverse = reverse
+
+
+def requested_page(query):
+    """
+    Returns the Page requested by the limit, marker and page_reverse
+    parameters of query, or None when the whole collection is requested.
+    """
+    query = query or {}
+    if not any(parameter in query for parameter in PAGINATION_PARAMETERS):
+        return None
+    limit = _parameter(query, LIMIT)
+    try:
+        limit = int(limit) if limit is not None else 0
+    except ValueError:
+        limit = -1
+    if limit < 0:
+        raise BadRequestError(
+            'Limit must be an integer 0 or greater, not {}'.format(
+                _parameter(query, LIMIT)
+            )
+        )
+    return Page(
+        limit=limit or None,
+        marker=_parameter(query, MARKER),
+        reverse=(_parameter(query, PAGE_REVERSE) or '').lower() == 'true',
+    )
+
+
+def sorted_from_marker(items, page):
+    """
+    Returns the items of a whole collection in the order of page, from its
+    marker on.
+    """
+    items = sorted(items, key=lambda item: item[ID], reverse=page.reverse)
+    if page.marker is None:
+        return items
+    if page.reverse:
+        return [item for item in items if item[ID] < page.marker]
+    return [item for item in items if item[ID] > page.marker]
+
+
+def paginate(items, page, query, url):
+    """
+    Returns the items of page, and the links to the next and the previous
+    pages of the collection at url. The items are given in the order of
+    page, from its marker on, and only the ones matching the filters of
+    query are taken, until the page is full.
+    """
+    items = iter_query_results(items, query)
+    has_more = False
+    if page.limit:
+        items = list(itertools.islice(items, page.limit + 1))
+        has_more = len(items) > page.limit
+        items = items[: page.limit]
+    else:
+        items = list(items)
+    if page.reverse:
+        items.reverse()
+    if not items:
+        return items, []
+    links = []
+    if page.marker is not None if page.reverse else has_more:
+        links.append(_link(url, query, 'next', items[-1][ID]))
+    if has_more if page.reverse else page.marker is not None:
+        links.append(_link(url, query, 'previous', items[0][ID], True))
+    return items, links
+
+
+def _link(url, query, rel, marker, reverse=False):
+    parameters = {
+        key: values
+        for key, values in query.items()
+        if key not in (MARKER, PAGE_REVERSE)
+    }
+    parameters[MARKER] = [marker]
+    if reverse:
+        parameters[PAGE_REVERSE] = ['True']
+    return {
+        'href': '{}?{}'.format(
+            url, urllib_parse.urlencode(parameters, doseq=True)
+        ),
+        'rel': rel,
+    }
+
+
+def _parameter(query, key):
+    values = query.get(key)
+    return values[0] if values else None
@@ -18,31 +18,43 @@
 #
 
 
+from collections.abc import Iterator
+
 from handlers import GET
 from ovirt_provider_config_common import url_filter_exception
 
+LIMIT = 'limit'
+MARKER = 'marker'
+PAGE_REVERSE = 'page_reverse'
+# The query parameters selecting a page of a collection are never filters
+PAGINATION_PARAMETERS = (LIMIT, MARKER, PAGE_REVERSE)
 
-def filter_query_results(items, query):
-    filter_exceptions = url_filter_exception().split(',')
-    valid_filters = [
-        (key, val)
-        for (key, val) in query.items()
-        if key not in filter_exceptions
-    ]
-    return list(
-        filter(
-            lambda item: all(_filter_query_result(item, valid_filters)), items
-        )
+
+def iter_query_results(items, query):
+    valid_filters = list(query_filters(query).items())
+    return filter(
+        lambda item: all(_filter_query_result(item, valid_filters)), items
     )
 
 
-def should_be_filtered(response, query, path_parts, method):
+def query_filters(query):
+    """
+    Returns the filters of query as a {field: value} dict.
+    """
+    filter_exceptions = url_filter_exception().split(',')
+    return {
+        key: val[0]
+        for (key, val) in (query or {}).items()
+        if key not in filter_exceptions and key not in PAGINATION_PARAMETERS
+    }
+
+
+def is_collection(response, path_parts, method):
     return (
-        query
-        and response
+        response
         and len(list(response.values())) == 1
         and len(path_parts) == 1
-        and isinstance(list(response.values())[0], list)
+        and isinstance(list(response.values())[0], (list, Iterator))
         and method == GET
     )
 
@@ -55,5 +67,5 @@ def _compare_query_values(entity_value, query_value):
 
 def _filter_query_result(result, valid_filters):
     return [
-        _compare_query_values(result.get(k), v[0]) for (k, v) in valid_filters
+        _compare_query_values(result.get(k), v) for (k, v) in valid_filters
     ]
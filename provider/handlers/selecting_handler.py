@@ -28,6 +28,9 @@ PATH_SEPARATOR = '/'
 RESPONSE_VALUE_KEY = '#VALUE'
 RESPONSE_VALUE_PARAMETER = '#PARAMETER'
 WILDCARD_KEY = '*'
+# The query of the request is passed to the response handlers with the
+# path parameters, under a key no path parameter can have.
+QUERY_PARAMETERS = '#QUERY'
 
 
 def rest(method, path, response_handlers):
@@ -167,10 +170,12 @@ def _get_parameter_name(part):
 
 
 class SelectingHandler(BaseHandler):
-    def handle_request(self, method, path_parts, content):
+    def handle_request(self, method, path_parts, content, query):
         handler, parameters = self.get_response_handler(
             self.get_responses(), method, path_parts
         )
+        if query:
+            parameters[QUERY_PARAMETERS] = query
         return self.call_response_handler(handler, content, parameters)
 
     @classmethod
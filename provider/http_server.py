@@ -0,0 +1,276 @@
+# Copyright 2026 Red Hat, Inc.
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA
+#
+# Refer to the README and COPYING files for full details of the license
+from __future__ import absolute_import
+
+from http.server import HTTPServer
+from threading import Lock
+from threading import Thread
+import logging
+import queue
+import socket
+import ssl
+import time
+
+# Seconds a client has to complete the TLS handshake of a new connection
+TLS_HANDSHAKE_TIMEOUT = 10
+
+_tls_stats = []
+
+
+def tls_handshake_summaries():
+    return {stats.name: stats.summary() for stats in _tls_stats}
+
+
+class HTTPServerIPv6(HTTPServer):
+    address_family = socket.AF_INET6
+
+
+class WorkerPoolMixIn(object):
+    """
+    Hands accepted connections over to a fixed number of worker threads.
+    Connections which find the queue full are answered with 503 instead of
+    piling up behind a slow request. A worker waiting for the next request
+    of a connection kept open is handed over to a queued connection.
+    """
+
+    SERVICE_UNAVAILABLE = (
+        b'HTTP/1.0 503 Service Unavailable\r\n'
+        b'Content-Length: 0\r\n'
+        b'Connection: close\r\n\r\n'
+    )
+
+    def start_workers(self, pool_size, queue_size):
+        self._requests = queue.Queue(maxsize=queue_size)
+        # Connections waiting for their next request, the oldest first
+        self._idle_connections = {}
+        self._released_connections = set()
+        self._free_workers = 0
+        self._idle_lock = Lock()
+        self._workers = [
+            Thread(target=self._process_queued_requests, daemon=True)
+            for _ in range(pool_size)
+        ]
+        for worker in self._workers:
+            worker.start()
+
+    def process_request(self, request, client_address):
+        try:
+            self._requests.put_nowait((request, client_address))
+        except queue.Full:
+            logging.warning(
+                'Request queue is full, rejecting connection from {}'.format(
+                    client_address[0]
+                )
+            )
+            self._reject_request(request)
+            return
+        self._release_idle_workers()
+
+    def connection_idle(self, connection, idle):
+        with self._idle_lock:
+            if idle:
+                self._idle_connections[connection] = None
+                self._release_idle_connections()
+            else:
+                self._idle_connections.pop(connection, None)
+                self._released_connections.discard(connection)
+
+    def _release_idle_workers(self):
+        with self._idle_lock:
+            self._release_idle_connections()
+
+    def _release_idle_connections(self):
+        waiting = (
+            self._requests.qsize()
+            - self._free_workers
+            - len(self._released_connections)
+        )
+        while waiting > 0 and self._idle_connections:
+            connection = next(iter(self._idle_connections))
+            del self._idle_connections[connection]
+            self._released_connections.add(connection)
+            waiting -= 1
+            # The worker reads the end of the connection, and closes it.
+            # The TLS layer is bypassed, as it is used by the worker, and it
+            # would answer the end with an alert.
+            try:
+                socket.socket.shutdown(connection, socket.SHUT_RDWR)
+            except OSError:
+                pass
+            logging.debug('Closed an idle connection for a queued one')
+
+    def _reject_request(self, request):
+        try:
+            request.sendall(self.SERVICE_UNAVAILABLE)
+        except OSError:
+            pass
+        self.shutdown_request(request)
+
+    def _process_queued_requests(self):
+        while True:
+            with self._idle_lock:
+                self._free_workers += 1
+            queued = self._requests.get()
+            with self._idle_lock:
+                self._free_workers -= 1
+            if queued is None:
+                return
+            request, client_address = queued
+            try:
+                self.finish_request(request, client_address)
+            except Exception:
+                self.handle_error(request, client_address)
+            finally:
+                self.shutdown_request(request)
+
+    def server_close(self):
+        super(WorkerPoolMixIn, self).server_close()
+        for _ in self._workers:
+            self._requests.put(None)
+
+
+def create_tls_context(cert_file, key_file, ciphers, ecdh_curve=None):
+    """
+    Returns the TLS context of the server side of the client connections.
+    Without an ecdh_curve, prime256v1, the cheapest of the FIPS curves, is
+    used when the ciphers are restricted to FIPS ones, as a client could
+    otherwise settle on a slower one. Any curve is accepted otherwise.
+    """
+    context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+    context.minimum_version = ssl.TLSVersion.TLSv1_2
+    context.load_cert_chain(certfile=cert_file, keyfile=key_file)
+    context.set_ciphers(ciphers)
+    # Clients reconnecting resume their session from a ticket, or from the
+    # session cache of the context, skipping the certificate exchange.
+    context.options &= ~ssl.OP_NO_TICKET
+    if not ecdh_curve and 'FIPS' in ciphers:
+        ecdh_curve = 'prime256v1'
+    if ecdh_curve:
+        context.set_ecdh_curve(ecdh_curve)
+    return context
+
+
+class TlsHandshakeStats(object):
+    """
+    Counts the TLS handshakes of the connections accepted by a server, how
+    many of them resumed an earlier session, and the time they took.
+    A summary is logged every LOG_INTERVAL handshakes, and is served by the
+    tech/tls request of the neutron API.
+    """
+
+    LOG_INTERVAL = 1000
+
+    def __init__(self, name, context):
+        self.name = name
+        self._context = context
+        self._lock = Lock()
+        self.handshakes = 0
+        self.resumed = 0
+        self.failed = 0
+        self.seconds = 0.0
+
+    def record(self, seconds, resumed):
+        with self._lock:
+            self.handshakes += 1
+            self.resumed += int(resumed)
+            self.seconds += seconds
+            log = self.handshakes % self.LOG_INTERVAL == 0
+        if log:
+            self.log()
+
+    def record_failure(self):
+        with self._lock:
+            self.failed += 1
+
+    def summary(self):
+        with self._lock:
+            summary = {
+                'handshakes': self.handshakes,
+                'resumed': self.resumed,
+                'failed': self.failed,
+                'average_ms': (
+                    1000 * self.seconds / self.handshakes
+                    if self.handshakes
+                    else 0.0
+                ),
+            }
+        summary['session_cache'] = self._context.session_stats()
+        return summary
+
+    def log(self):
+        logging.info(
+            'TLS handshakes of {}: {}'.format(self.name, self.summary())
+        )
+
+
+class TlsHandshakeMixIn(object):
+    """
+    Completes the TLS handshake of an accepted connection in the worker
+    serving it, rather than in the thread accepting connections, so a slow
+    handshake does not hold up the connections behind it.
+    """
+
+    tls_stats = None
+
+    def enable_tls(self, context):
+        self.socket = context.wrap_socket(
+            self.socket, server_side=True, do_handshake_on_connect=False
+        )
+        self.tls_stats = TlsHandshakeStats(
+            'port {}'.format(self.server_address[1]), context
+        )
+        _tls_stats.append(self.tls_stats)
+
+    def _reject_request(self, request):
+        if self.tls_stats:
+            # Writing the 503 would first complete the handshake, which a
+            # silent client holds up the thread accepting connections in.
+            self.shutdown_request(request)
+            return
+        super(TlsHandshakeMixIn, self)._reject_request(request)
+
+    def finish_request(self, request, client_address):
+        if self.tls_stats and not self._tls_handshake(request, client_address):
+            return
+        super(TlsHandshakeMixIn, self).finish_request(request, client_address)
+
+    def _tls_handshake(self, request, client_address):
+        start = time.monotonic()
+        # The handshake messages are written as they are ready, so they are
+        # not held back waiting for the acknowledgement of the previous one.
+        request.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, True)
+        request.settimeout(TLS_HANDSHAKE_TIMEOUT)
+        try:
+            request.do_handshake()
+        except OSError as e:
+            self.tls_stats.record_failure()
+            logging.debug(
+                'TLS handshake with {} failed: {}'.format(client_address[0], e)
+            )
+            return False
+        request.settimeout(None)
+        self.tls_stats.record(time.monotonic() - start, request.session_reused)
+        return True
+
+
+class WorkerPoolHTTPServerIPv6(
+    TlsHandshakeMixIn, WorkerPoolMixIn, HTTPServerIPv6
+):
+    def __init__(self, server_address, handler, pool_size, queue_size):
+        HTTPServerIPv6.__init__(self, server_address, handler)
+        self.start_workers(pool_size, queue_size)
@@ -19,6 +19,8 @@
 
 from __future__ import absolute_import
 
+import bisect
+import logging
 import random
 
 import constants as ovnconst
@@ -63,12 +65,16 @@ def _get_all_macs(ports, get_macs):
 def random_unique_mac(ls_ports, router_ports):
     all_macs = set().union(
         _get_all_macs(ls_ports, lambda p: get_port_mac(p)),
-        _get_all_macs(router_ports, lambda p: p['mac']),
+        _get_all_macs(router_ports, lambda p: p.mac),
     )
 
+    return random_unused_mac(lambda mac: mac in all_macs)
+
+
+def random_unused_mac(is_mac_used):
     for _ in range(99):
         mac = _random_mac()
-        if mac not in all_macs:
+        if not is_mac_used(mac):
             return mac
 
     raise Exception('Unable to allocate an unused mac after 100 retries')
@@ -113,20 +119,9 @@ def _is_valid_ip(candidate):
 
 
 def get_network_exclude_ips(network):
-    exclude_values = network.other_config.get(
-        ovnconst.LS_OPTION_EXCLUDE_IPS, ''
+    return IpRanges.parse(
+        network.other_config.get(ovnconst.LS_OPTION_EXCLUDE_IPS, '')
     )
-    # TODO: should we care about IP ranges? we do not use them, but
-    # what if someone else will?
-    # lets raise for now
-    result = []
-    for exclude_value in exclude_values.split():
-        if ovnconst.LS_EXCLUDED_IP_DELIMITER in exclude_value:
-            raise NotImplementedError(
-                'Handling of ip ranges not yet implemented'
-            )
-        result.append(exclude_value)
-    return result
 
 
 def is_ip_available_in_network(network, ip):
@@ -136,6 +131,136 @@ def is_ip_available_in_network(network, ip):
     return ip not in exclude_ips
 
 
+def next_free_ip_in_network(network, cidr, reserved=()):
+    used = {get_port_ip(port) for port in network.ports}
+    used.update(reserved)
+    return get_network_exclude_ips(network).first_free(
+        cidr, lambda ip: ip in used
+    )
+
+
+class IpRanges(object):
+    """
+    A set of ip addresses kept as sorted, disjoint and non adjacent ranges,
+    the way the exclude_ips option of a logical switch lists them:
+    '10.0.0.1 10.0.0.5..10.0.0.9'. Adjacent addresses are merged into a
+    single range, so the serialized value stays short.
+    Membership is checked in O(log n) of the number of ranges. Adding and
+    removing an address shifts the ranges after it, which is O(n): the
+    ranges are parsed from and serialized back to the option on each
+    change anyway, and a network only excludes a few addresses.
+    """
+
+    def __init__(self):
+        self._starts = []
+        self._ends = []
+
+    @classmethod
+    def parse(cls, exclude_ips):
+        """
+        Returns the ranges listed by exclude_ips. Invalid entries are
+        skipped, as ovn-northd does, so a bad value set outside of the
+        provider does not fail the requests reading it.
+        """
+        ranges = cls()
+        for value in exclude_ips.split():
+            start, _, end = value.partition(ovnconst.LS_EXCLUDED_IP_DELIMITER)
+            try:
+                ranges.add_range(start, end or start)
+            except (AddrFormatError, ValueError):
+                logging.warning('Ignoring invalid exclude_ips %s', value)
+        return ranges
+
+    def __str__(self):
+        return ' '.join(
+            (
+                str(IPAddress(start[1], start[0]))
+                if start == end
+                else '{}{}{}'.format(
+                    IPAddress(start[1], start[0]),
+                    ovnconst.LS_EXCLUDED_IP_DELIMITER,
+                    IPAddress(end[1], end[0]),
+                )
+            )
+            for start, end in zip(self._starts, self._ends)
+        )
+
+    def __bool__(self):
+        return bool(self._starts)
+
+    def __contains__(self, ip):
+        try:
+            key = _ip_key(ip)
+        except (AddrFormatError, TypeError, ValueError):
+            return False
+        i = bisect.bisect_right(self._starts, key) - 1
+        return i >= 0 and key <= self._ends[i]
+
+    def first_free(self, cidr, is_used):
+        """
+        Returns the lowest host address of cidr which is neither in the
+        ranges nor is_used, or None if there is none. A range is skipped
+        as a whole, so only the addresses outside of the ranges are
+        checked with is_used.
+        """
+        network = IPNetwork(cidr)
+        first, last = network.first, network.last
+        if network.version == 4 and network.prefixlen < 31:
+            first, last = first + 1, last - 1
+        elif network.version == 6 and network.prefixlen < 127:
+            first += 1
+        key = (network.version, first)
+        while key[1] <= last:
+            i = bisect.bisect_right(self._starts, key) - 1
+            if i >= 0 and key <= self._ends[i]:
+                key = (network.version, self._ends[i][1] + 1)
+                continue
+            ip = str(IPAddress(key[1], network.version))
+            if not is_used(ip):
+                return ip
+            key = (network.version, key[1] + 1)
+        return None
+
+    def add(self, ip):
+        self.add_range(ip, ip)
+
+    def add_range(self, start, end):
+        start, end = _ip_key(start), _ip_key(end)
+        if start[0] != end[0] or end < start:
+            raise ValueError(
+                'Invalid ip range {}..{}'.format(
+                    IPAddress(start[1], start[0]), IPAddress(end[1], end[0])
+                )
+            )
+        # Merge with the ranges overlapping or adjacent to start..end
+        first = bisect.bisect_left(self._ends, (start[0], start[1] - 1))
+        last = bisect.bisect_right(self._starts, (end[0], end[1] + 1))
+        if first < last:
+            start = min(start, self._starts[first])
+            end = max(end, self._ends[last - 1])
+        self._starts[first:last] = [start]
+        self._ends[first:last] = [end]
+
+    def remove(self, ip):
+        key = _ip_key(ip)
+        i = bisect.bisect_right(self._starts, key) - 1
+        if i < 0 or key > self._ends[i]:
+            return
+        start, end = self._starts[i], self._ends[i]
+        remaining = [
+            (start, (key[0], key[1] - 1)),
+            ((key[0], key[1] + 1), end),
+        ]
+        remaining = [(s, e) for s, e in remaining if s <= e]
+        self._starts[i : i + 1] = [s for s, _ in remaining]
+        self._ends[i : i + 1] = [e for _, e in remaining]
+
+
+def _ip_key(ip):
+    address = IPAddress(ip)
+    return address.version, int(address)
+
+
 def diff_routes(new_rest_routes, db_routes):
     if new_rest_routes is None:
         new_rest_routes = []
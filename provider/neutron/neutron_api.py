@@ -18,6 +18,9 @@
 
 from __future__ import absolute_import
 
+import contextlib
+import itertools
+import threading
 import uuid
 
 from functools import wraps
@@ -55,11 +58,15 @@ from ovirt_provider_config_common import dhcp_server_mac
 from ovirt_provider_config_common import dhcp_enable_mtu
 from ovirt_provider_config_common import dhcp_mtu
 from ovirt_provider_config_common import default_port_security_enabled
+from ovirt_provider_config_common import group_commit_window
 from ovirt_provider_config_common import ovs_version_29
 
 from ovndb.ovn_north import OvnNorth
 from ovndb.ovn_north import optionally_use_transactions
 
+# Number of the ports of a page read and joined under a single snapshot
+PORTS_BATCH = 50
+
 
 def assure_security_groups_support(f):
     @wraps(f)
@@ -94,20 +101,32 @@ def wrap_default_group_id(f):
 
 
 class NeutronApi(object):
+    _instance = None
+    _instance_lock = threading.Lock()
+
+    @classmethod
+    def instance(cls):
+        # Created on first use, so the provider starts even when the north
+        # db is not reachable yet.
+        if cls._instance is None:
+            with cls._instance_lock:
+                if cls._instance is None:
+                    cls._instance = cls()
+        return cls._instance
+
     def __init__(self, sec_group_support=None):
         self.idl = ovn_connection.connect()
-        self.ovn_north = OvnNorth(self.idl)
+        self.ovn_north = OvnNorth(self.idl, ovn_connection.nb_index())
         self.security_group_support = (
             sec_group_support or self.are_security_groups_supported()
         )
         self.tx_manager = ovn_connection.OvnTransactionManager(
-            self.idl.ovsdb_connection
+            self.idl.ovsdb_connection, group_commit_window()
         )
+        self._port_creation_lock = threading.Lock()
 
-    # TODO: could this be moved to ovsdbapp?
     def _get_port_network(self, port):
-        networks = self.ovn_north.list_ls()
-        return next(network for network in networks if port in network.ports)
+        return self.ovn_north.get_ls(lsp=port)
 
     def _is_port_ovirt_controlled(self, port_row):
         return PortMapper.OVN_NIC_NAME in port_row.external_ids
@@ -124,6 +143,23 @@ class NeutronApi(object):
     def get_network(self, network_id):
         return self._get_network(self.ovn_north.get_ls(ls_id=network_id))
 
+    def iter_networks(self, marker=None, reverse=False):
+        network_ids = self.ovn_north.sorted_ids(
+            ovnconst.TABLE_LS, marker, reverse
+        )
+        if network_ids is None:
+            return None
+        return self._iter_entities(network_ids, self.get_network)
+
+    @staticmethod
+    def _iter_entities(entity_ids, get_entity):
+        for entity_id in entity_ids:
+            try:
+                yield get_entity(entity_id)
+            except ElementNotFoundError:
+                # deleted since its id was read
+                continue
+
     @NetworkMapper.validate_add
     @NetworkMapper.map_from_rest
     @NetworkMapper.map_to_rest
@@ -319,7 +355,7 @@ class NeutronApi(object):
     def _update_ipv6_lrp_mtu(self, router_port, subnet, mtu):
         return (
             self.ovn_north.create_ovn_update_command(
-                ovnconst.TABLE_LRP, self.ovn_north.get_lrp_id(router_port)
+                ovnconst.TABLE_LRP, router_port.uuid
             )
             .add(
                 ovnconst.ROW_LRP_IPV6_RA_CONFIGS,
@@ -354,14 +390,117 @@ class NeutronApi(object):
         return None
 
     @PortMapper.map_to_rest
-    def list_ports(self):
+    def list_ports(self, filters=None):
+        # The ports are joined up front under the snapshot, only their
+        # serialization is done as they are iterated over.
+        filters = filters or {}
+        with self.ovn_north.snapshot():
+            network_ports = self._list_network_lsps(filters)
+            subnets = {}
+            network_subnets = {}
+            for dhcp in self.ovn_north.list_dhcp():
+                subnets[dhcp.uuid] = dhcp
+                network_subnets.setdefault(
+                    dhcp.external_ids[SubnetMapper.OVN_NETWORK_ID], dhcp
+                )
+            router_ports = {
+                lrp.name: lrp for lrp in self.ovn_north.list_lrp_rows()
+            }
+            return iter(
+                [
+                    self._join_network_port(
+                        lsp, ls, subnets, network_subnets, router_ports
+                    )
+                    for ls, lsp in network_ports
+                ]
+            )
+
+    def _list_network_lsps(self, filters):
+        port_id = filters.get(PortMapper.REST_PORT_ID)
+        network_id = filters.get(PortMapper.REST_PORT_NETWORK_ID)
+        try:
+            if port_id:
+                lsp = self.ovn_north.get_lsp(lsp_name=port_id)
+                ls = self._get_port_network(lsp)
+                candidates = [(ls, lsp)] if ls else []
+            elif network_id:
+                ls = self.ovn_north.get_ls(ls_id=network_id)
+                candidates = [(ls, lsp) for lsp in ls.ports]
+            else:
+                candidates = (
+                    (ls, lsp)
+                    for ls in self.ovn_north.list_ls()
+                    for lsp in ls.ports
+                )
+        except (ElementNotFoundError, BadRequestError):
+            return []
         return [
-            self._get_network_port(lsp, ls)
-            for ls in self.ovn_north.list_ls()
-            for lsp in ls.ports
+            (ls, lsp)
+            for ls, lsp in candidates
             if self._is_port_ovirt_controlled(lsp)
+            and PortMapper.matches_filters(lsp, ls, filters)
         ]
 
+    def _join_network_port(
+        self, lsp, ls, subnets, network_subnets, router_ports
+    ):
+        dhcp_id = self._get_dhcp_id(lsp)
+        if dhcp_id:
+            dhcp_options = subnets.get(dhcp_id) or self._get_dhcp(lsp, ls)
+        else:
+            dhcp_options = network_subnets.get(str(ls.uuid))
+        lrp = None
+        lrp_name = lsp.options.get(ovnconst.LSP_OPTION_ROUTER_PORT)
+        if lrp_name:
+            lrp = router_ports.get(lrp_name) or self.ovn_north.get_lrp(
+                lrp_name=lrp_name
+            )
+        return NetworkPort(lsp=lsp, ls=ls, dhcp_options=dhcp_options, lrp=lrp)
+
+    def iter_ports(self, marker=None, reverse=False, filters=None):
+        filters = filters or {}
+        if filters.get(PortMapper.REST_PORT_ID) or filters.get(
+            PortMapper.REST_PORT_NETWORK_ID
+        ):
+            with self.ovn_north.snapshot():
+                port_ids = sorted(
+                    (lsp.name for _, lsp in self._list_network_lsps(filters)),
+                    reverse=reverse,
+                )
+            if marker is not None:
+                port_ids = [
+                    port_id
+                    for port_id in port_ids
+                    if (port_id < marker if reverse else port_id > marker)
+                ]
+        else:
+            port_ids = self.ovn_north.sorted_ids(
+                ovnconst.TABLE_LSP, marker, reverse
+            )
+            if port_ids is None:
+                return None
+        return self._iter_ports(port_ids, filters)
+
+    def _iter_ports(self, port_ids, filters):
+        port_ids = iter(port_ids)
+        while True:
+            batch = list(itertools.islice(port_ids, PORTS_BATCH))
+            if not batch:
+                return
+            # each batch is read at a single version of the replica
+            with self.ovn_north.snapshot():
+                network_ports = []
+                for port_id in batch:
+                    try:
+                        lsp = self.ovn_north.get_lsp(lsp_name=port_id)
+                    except ElementNotFoundError:
+                        # deleted since its id was read
+                        continue
+                    ls = self._get_port_network(lsp)
+                    if ls and PortMapper.matches_filters(lsp, ls, filters):
+                        network_ports.append(self._get_network_port(lsp, ls))
+            yield from PortMapper.iter_rows2rest(iter(network_ports))
+
     @PortMapper.map_to_rest
     def get_port(self, port_id):
         return self._get_network_port(
@@ -381,16 +520,20 @@ class NeutronApi(object):
         return NetworkPort(lsp=lsp, ls=ls, dhcp_options=dhcp_options, lrp=lrp)
 
     def _get_dhcp(self, lsp, ls):
+        dhcp_id = self._get_dhcp_id(lsp)
+        if dhcp_id:
+            return self.ovn_north.get_dhcp(dhcp_id=dhcp_id)
+        else:
+            return self.ovn_north.get_dhcp(ls_id=ls.uuid)
+
+    @staticmethod
+    def _get_dhcp_id(lsp):
         dhcp_id = None
         if lsp.dhcpv4_options:
             dhcp_id = lsp.dhcpv4_options[0].uuid
         if lsp.dhcpv6_options:
             dhcp_id = lsp.dhcpv6_options[0].uuid
-
-        if dhcp_id:
-            return self.ovn_north.get_dhcp(dhcp_id=dhcp_id)
-        else:
-            return self.ovn_north.get_dhcp(ls_id=ls.uuid)
+        return dhcp_id
 
     @PortMapper.validate_add
     @PortMapper.map_from_rest
@@ -407,7 +550,52 @@ class NeutronApi(object):
         port_security=None,
         security_groups=None,
     ):
-        with self.tx_manager.transaction() as tx:
+        # Ports are created concurrently when their transactions are group
+        # committed. Ports that take a fixed ip, or that would create the
+        # default security groups, are created one at a time, so two of
+        # them do not take the same ip or create the same group. Generated
+        # macs are reserved until the port is committed.
+        with self._port_creation_guard(fixed_ips):
+            with self._new_port_mac(mac) as mac:
+                return self._add_port(
+                    network_id,
+                    name,
+                    mac,
+                    is_enabled,
+                    device_id,
+                    device_owner,
+                    fixed_ips,
+                    binding_host,
+                    port_security,
+                    security_groups,
+                )
+
+    def _new_port_mac(self, mac):
+        if mac:
+            return contextlib.nullcontext(mac)
+        return self.ovn_north.reserved_mac()
+
+    def _port_creation_guard(self, fixed_ips):
+        if self.tx_manager.group_commit and (
+            fixed_ips or not self.ovn_north.default_security_groups_exist()
+        ):
+            return self._port_creation_lock
+        return contextlib.nullcontext()
+
+    def _add_port(
+        self,
+        network_id,
+        name,
+        mac,
+        is_enabled,
+        device_id,
+        device_owner,
+        fixed_ips,
+        binding_host,
+        port_security,
+        security_groups,
+    ):
+        with self.tx_manager.transaction(group=True) as tx:
             port_id = self._create_port(name, network_id, transaction=tx)
             self._update_port_values(
                 port_id,
@@ -418,9 +606,6 @@ class NeutronApi(object):
                 binding_host,
                 transaction=tx,
             )
-            mac = mac or ip_utils.random_unique_mac(
-                self.ovn_north.list_lsp(), self.ovn_north.list_lrp()
-            )
             tx.add(
                 self.get_update_port_addr_command(
                     port_id,
@@ -627,7 +812,9 @@ class NeutronApi(object):
         if not ip:
             return ovnconst.LSP_ADDRESS_TYPE_DYNAMIC
         validate.ip_available_in_network(
-            self.ovn_north.get_ls(ls_id=network_id), ip
+            self.ovn_north.get_ls(ls_id=network_id),
+            ip,
+            self.ovn_north.is_ip_available_in_network,
         )
         return ip
 
@@ -760,6 +947,14 @@ class NeutronApi(object):
     def get_subnet(self, subnet_id):
         return self.ovn_north.get_dhcp(dhcp_id=subnet_id)
 
+    def iter_subnets(self, marker=None, reverse=False):
+        subnet_ids = self.ovn_north.sorted_ids(
+            ovnconst.TABLE_DHCP_Options, marker, reverse
+        )
+        if subnet_ids is None:
+            return None
+        return self._iter_entities(subnet_ids, self.get_subnet)
+
     @SubnetMapper.validate_add
     @SubnetMapper.map_from_rest
     def add_subnet(
@@ -799,23 +994,23 @@ class NeutronApi(object):
             cidr, gateway, network_mtu, dns, ipv6_address_mode
         )
 
-        self.ovn_north.db_set(
-            ovnconst.TABLE_LS,
-            network_id,
-            (ovnconst.ROW_LS_OTHER_CONFIG, self.get_ls_options(cidr)),
-        )
-
-        subnet = self.ovn_north.add_dhcp_options(cidr, external_ids)
-        self.ovn_north.set_dhcp_options_options_column(subnet.uuid, options)
-
-        for port in network.ports:
-            if self._is_port_address_value_static(port.type):
-                continue
-            self.get_update_port_addr_command(
-                port, network_id=network_id
-            ).execute()
+        with self.tx_manager.transaction() as tx:
+            self.ovn_north.db_set(
+                ovnconst.TABLE_LS,
+                network_id,
+                (ovnconst.ROW_LS_OTHER_CONFIG, self.get_ls_options(cidr)),
+                transaction=tx,
+            )
+            # The new subnet row is referred to through the command adding
+            # it, its uuid is only known once the transaction is committed.
+            subnet_command = self.ovn_north.add_dhcp_options(
+                cidr, external_ids, transaction=tx
+            )
+            self.ovn_north.set_dhcp_options_options_column(
+                subnet_command, options, transaction=tx
+            )
 
-        return self.get_subnet(subnet.uuid)
+        return self.get_subnet(subnet_command.result.uuid)
 
     @staticmethod
     def get_ls_options(cidr):
@@ -909,15 +1104,7 @@ class NeutronApi(object):
         validate.subnet_not_connected_to_router(
             self._get_subnet_gateway_router_id(subnet), subnet_id
         )
-        network_id = subnet.external_ids.get(SubnetMapper.OVN_NETWORK_ID)
-        network = self.ovn_north.get_ls(ls_id=network_id)
         self.ovn_north.remove_dhcp_options(subnet_id)
-        for port in network.ports:
-            if self._is_port_address_value_static(port.type):
-                continue
-            self.get_update_port_addr_command(
-                port, network_id=network_id
-            ).execute()
 
     @RouterMapper.map_to_rest
     def get_router(self, router_id):
@@ -949,9 +1136,12 @@ class NeutronApi(object):
 
     @RouterMapper.map_to_rest
     def list_routers(self):
-        return [
-            self._get_router_from_lr(lr) for lr in self.ovn_north.list_lr()
-        ]
+        # the routers are joined with their gateway ports, networks and
+        # subnets at the same version of the replica
+        with self.ovn_north.snapshot():
+            return [
+                self._get_router_from_lr(lr) for lr in self.ovn_north.list_lr()
+            ]
 
     def _add_router(
         self,
@@ -962,6 +1152,8 @@ class NeutronApi(object):
         gateway_ip=None,
         routes=None,
     ):
+        if network_id and not gateway_ip:
+            gateway_ip = self._free_gateway_ip(network_id, gateway_subnet_id)
         self._validate_external_gateway(
             gateway_ip, gateway_subnet_id, network_id
         )
@@ -1015,7 +1207,9 @@ class NeutronApi(object):
                 network_id, gateway_subnet_id, is_external_gateway=True
             )
             validate.ip_available_in_network(
-                self.ovn_north.get_ls(ls_id=network_id), gateway_ip
+                self.ovn_north.get_ls(ls_id=network_id),
+                gateway_ip,
+                self.ovn_north.is_ip_available_in_network,
             )
 
     @RouterMapper.validate_add
@@ -1196,9 +1390,7 @@ class NeutronApi(object):
         router_ports = (
             self.ovn_north.list_lrp(router_id=router.uuid) if router else []
         )
-        return sum(
-            [lrp[ovnconst.ROW_LRP_NETWORKS] for lrp in router_ports], []
-        )
+        return sum([lrp.networks for lrp in router_ports], [])
 
     def _create_routing_lsp_by_subnet(self, subnet_id, router_id):
         subnet = self.ovn_north.get_dhcp(dhcp_id=subnet_id)
@@ -1225,9 +1417,7 @@ class NeutronApi(object):
             lrp_name,
             lrp_ip,
             network_id,
-            ip_utils.random_unique_mac(
-                self.ovn_north.list_lsp(), self.ovn_north.list_lrp()
-            ),
+            self.ovn_north.unused_mac(),
         )
 
     def _validate_subnet_is_not_on_router(self, subnet_id, router_id):
@@ -1269,39 +1459,45 @@ class NeutronApi(object):
         )
         return ip_utils.get_ip_with_mask(ip=lsp_ip, cidr=ls_cidr)
 
+    def _free_gateway_ip(self, network_id, gateway_subnet_id):
+        subnet = self.ovn_north.get_dhcp(dhcp_id=gateway_subnet_id)
+        gateway_ip = self.ovn_north.next_free_ip_in_network(
+            self.ovn_north.get_ls(ls_id=network_id),
+            subnet.cidr,
+            reserved=(ip_utils.get_subnet_gateway(subnet),),
+        )
+        if gateway_ip is None:
+            raise RestDataError(
+                'No free ip address left on subnet {}'.format(
+                    gateway_subnet_id
+                )
+            )
+        return gateway_ip
+
     def _reserve_network_ip(self, network_id, gateway_ip):
         if not network_id:
             return
-        exclude_values = self.ovn_north.get_ls(
-            ls_id=network_id
-        ).other_config.get(ovnconst.LS_OPTION_EXCLUDE_IPS, {})
-        new_values = (
-            (exclude_values + ' ') if exclude_values else str()
-        ) + gateway_ip
-
-        self.ovn_north.db_set(
-            ovnconst.TABLE_LS,
-            network_id,
-            (
-                ovnconst.ROW_LS_OTHER_CONFIG,
-                {ovnconst.LS_OPTION_EXCLUDE_IPS: new_values},
-            ),
+        exclude_ips = ip_utils.get_network_exclude_ips(
+            self.ovn_north.get_ls(ls_id=network_id)
         )
+        exclude_ips.add(gateway_ip)
+        self._set_network_exclude_ips(network_id, exclude_ips)
 
     def _release_network_ip(self, network_id, ip):
-        exclude_values = self.ovn_north.get_ls(
-            ls_id=network_id
-        ).other_config.get(ovnconst.LS_OPTION_EXCLUDE_IPS, '')
-        values = exclude_values.split()
-        values.remove(ip)
+        exclude_ips = ip_utils.get_network_exclude_ips(
+            self.ovn_north.get_ls(ls_id=network_id)
+        )
+        exclude_ips.remove(ip)
+        self._set_network_exclude_ips(network_id, exclude_ips)
 
-        if values:
+    def _set_network_exclude_ips(self, network_id, exclude_ips):
+        if exclude_ips:
             self.ovn_north.db_set(
                 ovnconst.TABLE_LS,
                 network_id,
                 (
                     ovnconst.ROW_LS_OTHER_CONFIG,
-                    {ovnconst.LS_OPTION_EXCLUDE_IPS: ' '.join(values)},
+                    {ovnconst.LS_OPTION_EXCLUDE_IPS: str(exclude_ips)},
                 ),
             )
         else:
@@ -1327,9 +1523,7 @@ class NeutronApi(object):
             network_id,
         )
         lrp_name = self._create_router_port_name(lsp_id)
-        mac = ip_utils.random_unique_mac(
-            self.ovn_north.list_lsp(), self.ovn_north.list_lrp()
-        )
+        mac = self.ovn_north.unused_mac()
         self.ovn_north.add_lrp(router_id, lrp_name, mac=mac, lrp_ip=port_ip)
         self._connect_port_to_router(
             lsp_id,
@@ -1506,9 +1700,10 @@ class NeutronApi(object):
         lr_gw_port = lr.external_ids.get(RouterMapper.OVN_ROUTER_GATEWAY_PORT)
         deleted_lsp_id = None
         for lrp in lr.ports:
-            lsp_id = self.ovn_north.get_lsp(lrp=lrp).uuid
-            lsp = self.ovn_north.get_lsp(lsp_id=lsp_id)
-            if lsp in network.ports:
+            lsp = self.ovn_north.get_lsp(lrp=lrp)
+            lsp_id = lsp.uuid
+            port_network = self._get_port_network(lsp)
+            if port_network and port_network.uuid == network.uuid:
                 deleted_lsp_id = lsp_id
                 self._delete_router_interface(
                     router_id, lsp_id, lrp=lrp, lr=lr
@@ -1536,12 +1731,6 @@ class NeutronApi(object):
             dhcp_options_id=subnet_id,
         )
 
-    def _is_port_address_value_static(self, type):
-        return (
-            type == ovnconst.LSP_TYPE_ROUTER
-            or type == ovnconst.LSP_TYPE_LOCALNET
-        )
-
     def _get_port_security_from_network(self, network_id):
         network = self.ovn_north.get_ls(ls_id=network_id)
         return NetworkMapper._str2bool(
@@ -1559,14 +1748,16 @@ class NeutronApi(object):
         return self._list_security_groups(default_group_id)
 
     def _list_security_groups(self, default_group_id=None):
-        if not self.are_security_groups_supported():
+        if not self.security_group_support:
             return []
         security_groups = []
+        remote_groups = {}
         for group_data in self.ovn_north.list_security_groups():
             security_group_rules = self._process_acls(
                 default_group_id,
                 group_data,
                 self.ovn_north.list_security_group_rules(group_data),
+                remote_groups,
             )
             security_groups.append(
                 SecurityGroup(group_data, security_group_rules)
@@ -1586,25 +1777,31 @@ class NeutronApi(object):
             sec_group=security_group, sec_group_rules=security_group_rules
         )
 
-    def _process_acls(self, default_group_id, security_group, acls):
+    def _process_acls(
+        self, default_group_id, security_group, acls, remote_groups=None
+    ):
+        if remote_groups is None:
+            remote_groups = {}
         return [
             self._build_security_group_rule_wrapper(
-                default_group_id, acl, security_group
+                default_group_id, acl, security_group, remote_groups
             )
             for acl in acls
         ]
 
     def _build_security_group_rule_wrapper(
-        self, default_group_id, acl, security_group
+        self, default_group_id, acl, security_group, remote_groups
     ):
         remote_group_id = acl.external_ids.get(
             SecurityGroupRuleMapper.OVN_SEC_GROUP_RULE_REMOTE_GROUP_ID
         )
-        remote_group = (
-            self.ovn_north.get_security_group(remote_group_id)
-            if remote_group_id
-            else None
-        )
+        remote_group = None
+        if remote_group_id:
+            if remote_group_id not in remote_groups:
+                remote_groups[remote_group_id] = (
+                    self.ovn_north.get_security_group(remote_group_id)
+                )
+            remote_group = remote_groups[remote_group_id]
         return SecurityGroupRule(
             acl,
             security_group,
@@ -1642,20 +1839,17 @@ class NeutronApi(object):
     @wrap_default_group_id
     @assure_security_groups_support
     def list_security_group_rules(self, default_group_id=None):
-        security_groups = self._list_security_groups(default_group_id)
-        security_group_rules = []
-        for sec_group in security_groups:
-            security_group_rules.extend(
-                self._process_acls(
-                    default_group_id,
-                    sec_group.sec_group,
-                    [
-                        rule_wrapper.rule
-                        for rule_wrapper in sec_group.sec_group_rules
-                    ],
-                )
+        return self._iter_security_group_rules(default_group_id)
+
+    def _iter_security_group_rules(self, default_group_id):
+        remote_groups = {}
+        for group_data in self.ovn_north.list_security_groups():
+            yield from self._process_acls(
+                default_group_id,
+                group_data,
+                self.ovn_north.list_security_group_rules(group_data),
+                remote_groups,
             )
-        return security_group_rules
 
     @SecurityGroupRuleMapper.map_to_rest
     @wrap_default_group_id
@@ -1732,6 +1926,9 @@ class NeutronApi(object):
     def are_security_groups_supported(self):
         return ovnconst.TABLE_PORT_GROUP in self.idl.tables
 
+    def change_tag(self, tables):
+        return self.ovn_north.change_tag(tables)
+
     @staticmethod
     def list_extensions():
         extensions = []
@@ -20,6 +20,7 @@ from __future__ import absolute_import
 
 import abc
 from collections import namedtuple
+from collections.abc import Iterator
 from functools import wraps
 
 from netaddr import AddrFormatError
@@ -133,12 +134,23 @@ class Mapper(object, metaclass=abc.ABCMeta):
         def wrapper(wrapped_self, *args, **kwargs):
             data = f(wrapped_self, *args, **kwargs)
             if isinstance(data, list):
-                return [cls.row2rest(row) for row in data]
+                return cls.rows2rest(data)
+            elif isinstance(data, Iterator):
+                return cls.iter_rows2rest(data)
             else:
                 return cls.row2rest(data)
 
         return wrapper
 
+    @classmethod
+    def rows2rest(cls, rows):
+        return [cls.row2rest(row) for row in rows]
+
+    @classmethod
+    def iter_rows2rest(cls, rows):
+        for row in rows:
+            yield cls.row2rest(row)
+
     @staticmethod
     def rest2row(wrapped_self, func, rest_data, entity_id):
         raise NotImplementedError()
@@ -385,6 +397,18 @@ class PortMapper(Mapper):
     DEVICE_OWNER_ROUTER = 'network:router_interface'
     DEVICE_OWNER_ROUTER_GATEWAY = 'network:router_gateway'
 
+    # The values of the port fields which do not need the subnet or the
+    # router port of the port, as they are serialized by _row2rest
+    _FILTER_VALUES = {
+        REST_PORT_ID: lambda lsp, ls: lsp.name,
+        REST_PORT_NETWORK_ID: lambda lsp, ls: str(ls.uuid),
+        REST_PORT_NAME: lambda lsp, ls: lsp.external_ids.get(
+            PortMapper.OVN_NIC_NAME
+        ),
+        REST_PORT_DEVICE_ID: lambda lsp, ls: PortMapper._device_id(lsp),
+        REST_PORT_MAC_ADDRESS: lambda lsp, ls: PortMapper._mac_address(lsp),
+    }
+
     @staticmethod
     def rest2row(wrapped_self, func, rest_data, port_id):
         network_id = rest_data.get(PortMapper.REST_PORT_NETWORK_ID)
@@ -428,8 +452,37 @@ class PortMapper(Mapper):
                 security_groups=security_groups,
             )
 
+    @staticmethod
+    def rows2rest(rows):
+        port_tenant_id = tenant_id()
+        return [PortMapper._row2rest(row, port_tenant_id) for row in rows]
+
+    @staticmethod
+    def iter_rows2rest(rows):
+        port_tenant_id = tenant_id()
+        for row in rows:
+            yield PortMapper._row2rest(row, port_tenant_id)
+
     @staticmethod
     def row2rest(row):
+        return PortMapper._row2rest(row, tenant_id())
+
+    @staticmethod
+    def matches_filters(lsp, ls, filters):
+        """
+        Checks the filters on the fields of a port which are read straight
+        from its lsp and ls rows, so ports can be discarded before they are
+        joined with their subnet and router port. Filters on other fields
+        are ignored.
+        """
+        return all(
+            PortMapper._FILTER_VALUES[field](lsp, ls) == value
+            for field, value in filters.items()
+            if field in PortMapper._FILTER_VALUES
+        )
+
+    @staticmethod
+    def _row2rest(row, port_tenant_id):
         """
         Maps the db rows (lsp, ls) to a Json representation of a port.
         The 'admin_state_up' property of the lsp is the product of
@@ -456,7 +509,7 @@ class PortMapper(Mapper):
             PortMapper.REST_PORT_SECURITY_ENABLED: PortMapper.is_port_security_enabled(  # noqa: E501
                 lsp
             ),
-            PortMapper.REST_TENANT_ID: tenant_id(),
+            PortMapper.REST_TENANT_ID: port_tenant_id,
             PortMapper.REST_PORT_FIXED_IPS: PortMapper.get_fixed_ips(
                 lsp, dhcp_options, lrp
             ),
@@ -465,21 +518,31 @@ class PortMapper(Mapper):
             ),
         }
         if PortMapper.OVN_DEVICE_ID in lsp.external_ids:
-            rest_data[PortMapper.REST_PORT_DEVICE_ID] = str(
-                lsp.external_ids[PortMapper.OVN_DEVICE_ID]
+            rest_data[PortMapper.REST_PORT_DEVICE_ID] = PortMapper._device_id(
+                lsp
             )
         if PortMapper.OVN_DEVICE_OWNER in lsp.external_ids:
             rest_data[PortMapper.REST_PORT_DEVICE_OWNER] = lsp.external_ids[
                 PortMapper.OVN_DEVICE_OWNER
             ]
         if lsp.addresses:
-            mac = lsp.addresses[0].split(' ')[0]
-            rest_data[PortMapper.REST_PORT_MAC_ADDRESS] = mac
+            rest_data[PortMapper.REST_PORT_MAC_ADDRESS] = (
+                PortMapper._mac_address(lsp)
+            )
         if lsp.options and PortMapper.OVN_REQUESTED_CHASSIS in lsp.options:
             binding_host = lsp.options[PortMapper.OVN_REQUESTED_CHASSIS]
             rest_data[PortMapper.REST_PORT_BINDING_HOST] = binding_host
         return rest_data
 
+    @staticmethod
+    def _device_id(lsp):
+        device_id = lsp.external_ids.get(PortMapper.OVN_DEVICE_ID)
+        return None if device_id is None else str(device_id)
+
+    @staticmethod
+    def _mac_address(lsp):
+        return lsp.addresses[0].split(' ')[0] if lsp.addresses else None
+
     @staticmethod
     def is_port_security_enabled(lsp):
         return len(lsp.port_security) > 0 if lsp else False
@@ -945,14 +1008,17 @@ class RouterMapper(Mapper):
 
     @staticmethod
     def validate_add_rest_input(rest_data):
-        RouterMapper._validate_external_gateway_info(rest_data)
+        # a free ip of the subnet is taken when none is given
+        RouterMapper._validate_external_gateway_info(
+            rest_data, ip_required=False
+        )
 
     @staticmethod
     def validate_update_rest_input(rest_data):
         RouterMapper._validate_external_gateway_info(rest_data)
 
     @staticmethod
-    def _validate_external_gateway_info(rest_data):
+    def _validate_external_gateway_info(rest_data, ip_required=True):
         gateway_info = rest_data.get(
             RouterMapper.REST_ROUTER_EXTERNAL_GATEWAY_INFO, {}
         )
@@ -977,7 +1043,10 @@ class RouterMapper(Mapper):
                 raise RestDataError(
                     message.format(key=RouterMapper.REST_ROUTER_SUBNET_ID)
                 )
-            if RouterMapper.REST_ROUTER_IP_ADDRESS not in fixed_ips[0]:
+            if (
+                ip_required
+                and RouterMapper.REST_ROUTER_IP_ADDRESS not in fixed_ips[0]
+            ):
                 raise RestDataError(
                     message.format(key=RouterMapper.REST_ROUTER_IP_ADDRESS)
                 )
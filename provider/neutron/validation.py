@@ -84,8 +84,10 @@ def fixed_ips_require_stateful_dhcp(subnet, fixed_ips):
         )
 
 
-def ip_available_in_network(network, ip):
-    if not ip_utils.is_ip_available_in_network(network, ip):
+def ip_available_in_network(
+    network, ip, is_available=ip_utils.is_ip_available_in_network
+):
+    if not is_available(network, ip):
         raise RestDataError(
             f'The ip {ip} specified is already in use on '
             f'network {str(network.uuid)}'
@@ -29,6 +29,10 @@ CONFD_FILES = '*.conf'
 CONFIG_SECTION_OVN_REMOTE = 'OVN REMOTE'
 KEY_OVN_REMOTE = 'ovn-remote'
 DEFAULT_OVN_REMOTE_AT_LOCALHOST = 'tcp:127.0.0.1:6641'
+KEY_OVN_SNAPSHOT_FILE = 'ovn-snapshot-file'
+KEY_OVN_SNAPSHOT_INTERVAL = 'ovn-snapshot-interval'
+DEFAULT_OVN_SNAPSHOT_FILE = ''
+DEFAULT_OVN_SNAPSHOT_INTERVAL = 60
 
 CONFIG_SECTION_PROVIDER = 'PROVIDER'
 KEY_NOVA_PORT = 'nova-port'
@@ -43,6 +47,13 @@ KEY_OPENSTACK_TENANT_NAME = 'openstack-tenant-name'
 KEY_OPENSTACK_TENANT_DESCRIPTION = 'openstack-tenant-description'
 KEY_OVS_VERSION_29 = 'ovs-version-2.9'
 KEY_URL_FILTER_EXCEPTION = 'url_filter_exception'
+KEY_WORKER_POOL_SIZE = 'worker-pool-size'
+KEY_WORKER_QUEUE_SIZE = 'worker-queue-size'
+KEY_GROUP_COMMIT_WINDOW = 'group-commit-window'
+KEY_KEEP_ALIVE_TIMEOUT = 'keep-alive-timeout'
+KEY_KEEP_ALIVE_MAX_REQUESTS = 'keep-alive-max-requests'
+KEY_GZIP_MIN_SIZE = 'gzip-min-size'
+KEY_GZIP_COMPRESSION_LEVEL = 'gzip-compression-level'
 
 DEFAULT_NOVA_PORT = 9696
 DEFAULT_NEUTRON_PORT = 9696
@@ -56,6 +67,13 @@ DEFAULT_OPENSTACK_TENANT_NAME = 'tenant'
 DEFAULT_OPENSTACK_TENANT_DESCRIPTION = 'tenant'
 DEFAULT_OVS_VERSION_29 = False
 DEFAULT_URL_FILTER_EXCEPTION = ''
+DEFAULT_WORKER_POOL_SIZE = 8
+DEFAULT_WORKER_QUEUE_SIZE = 64
+DEFAULT_GROUP_COMMIT_WINDOW = 0
+DEFAULT_KEEP_ALIVE_TIMEOUT = 5
+DEFAULT_KEEP_ALIVE_MAX_REQUESTS = 100
+DEFAULT_GZIP_MIN_SIZE = 1024
+DEFAULT_GZIP_COMPRESSION_LEVEL = 0
 
 
 CONFIG_SECTION_SSL = 'SSL'
@@ -64,6 +82,7 @@ KEY_SSL_KEY_FILE = 'ssl-key-file'
 KEY_SSL_CERT_FILE = 'ssl-cert-file'
 KEY_SSL_CACERT_FILE = 'ssl-cacert-file'
 KEY_SSL_CIPHERS_STRING = 'ssl-ciphers-string'
+KEY_SSL_ECDH_CURVE = 'ssl-ecdh-curve'
 
 DEFAULT_SSL_KEY_FILE = '/etc/pki/ovirt-engine/keys/ovirt-provider-ovn.pem'
 DEFAULT_SSL_CERT_FILE = '/etc/pki/ovirt-engine/certs/ovirt-provider-ovn.cer'
@@ -72,6 +91,8 @@ DEFAULT_SSL_CIPHERS_STRING = (
     'kECDHE+FIPS:kDHE+FIPS:kRSA+FIPS:!eNULL:!aNULL:' '-3DES'
 )
 DEFAULT_SSL_ENABLED = False
+# The curve is chosen from the ciphers string when not configured
+DEFAULT_SSL_ECDH_CURVE = ''
 
 CONFIG_SECTION_DHCP = 'DHCP'
 KEY_DHCP_SERVER_MAC = 'dhcp-server-mac'
@@ -96,6 +117,12 @@ KEY_AUTH_PLUGIN = 'auth-plugin'
 DEFAULT_AUTH_PLUGIN = 'auth.plugins.static_token:MagicTokenPlugin'
 KEY_AUTH_TOKEN_TIMEOUT = 'auth-token-timeout'
 DEFAULT_AUTH_TOKEN_TIMEOUT = 360000
+KEY_AUTH_TOKEN_CACHE_TTL = 'auth-token-cache-ttl'
+DEFAULT_AUTH_TOKEN_CACHE_TTL = 60
+KEY_AUTH_TOKEN_CACHE_NEGATIVE_TTL = 'auth-token-cache-negative-ttl'
+DEFAULT_AUTH_TOKEN_CACHE_NEGATIVE_TTL = 10
+KEY_AUTH_TOKEN_CACHE_SIZE = 'auth-token-cache-size'
+DEFAULT_AUTH_TOKEN_CACHE_SIZE = 1024
 
 CONFIG_SECTION_NETWORK = 'NETWORK'
 KEY_NETWORK_PORT_SECURITY_ENABLED = 'port-security-enabled-default'
@@ -112,6 +139,10 @@ KEY_OVIRT_ADMIN_USER_NAME = 'ovirt-admin-user-name'
 KEY_OVIRT_ADMIN_ROLE_ID = 'ovirt-admin-role-id'
 KEY_OVIRT_ADMIN_GROUP_ATTRIBUTE_NAME = 'ovirt-admin-group-attribute-name'
 KEY_OVIRT_ADMIN_GROUP_ATTRIBUTE_VALUE = 'ovirt-admin-group-attribute-value'
+KEY_OVIRT_CONNECTION_POOL_SIZE = 'ovirt-connection-pool-size'
+KEY_OVIRT_KEEP_ALIVE = 'ovirt-keep-alive'
+KEY_OVIRT_CONNECTION_RETRIES = 'ovirt-connection-retries'
+KEY_OVIRT_CONNECTION_RETRY_BACKOFF = 'ovirt-connection-retry-backoff'
 
 DEFAULT_OVIRT_HOST = 'https://localhost'
 DEFAULT_OVIRT_BASE = '/ovirt-engine'
@@ -123,6 +154,10 @@ DEFAULT_ENGINE_NETWORK_ADMIN_USER_NAME = 'netadmin@internal'
 DEFAULT_ENGINE_NETWORK_ADMIN_ROLE_ID = 'def00005-0000-0000-0000-def000000005'
 DEFAULT_ENGINE_ADMIN_GROUP_ATTRIBUTE_NAME = 'AAA_AUTHZ_GROUP_NAME;java.lang.String;0eebe54f-b429-44f3-aa80-4704cbb16835'  # noqa: E501
 DEFAULT_ENGINE_ADMIN_GROUP_ATTRIBUTE_VALUE = 'NetAdmin'
+DEFAULT_OVIRT_CONNECTION_POOL_SIZE = 10
+DEFAULT_OVIRT_KEEP_ALIVE = True
+DEFAULT_OVIRT_CONNECTION_RETRIES = 2
+DEFAULT_OVIRT_CONNECTION_RETRY_BACKOFF = 0.2
 
 CONFIG_SECTION_VALIDATION = 'VALIDATION'
 KEY_VALIDATION_MAX_ALLOWED_MTU = 'validation-max-allowed-mtu'
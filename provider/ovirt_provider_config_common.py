@@ -26,12 +26,20 @@ from ovirt_provider_config import CONFIG_SECTION_PROVIDER
 from ovirt_provider_config import CONFIG_SECTION_SSL
 from ovirt_provider_config import CONFIG_SECTION_VALIDATION
 from ovirt_provider_config import DEFAULT_AUTH_PLUGIN
+from ovirt_provider_config import DEFAULT_AUTH_TOKEN_CACHE_NEGATIVE_TTL
+from ovirt_provider_config import DEFAULT_AUTH_TOKEN_CACHE_SIZE
+from ovirt_provider_config import DEFAULT_AUTH_TOKEN_CACHE_TTL
 from ovirt_provider_config import DEFAULT_AUTH_TOKEN_TIMEOUT
 from ovirt_provider_config import DEFAULT_DHCP_ENABLE_MTU
 from ovirt_provider_config import DEFAULT_DHCP_LEASE_TIME
 from ovirt_provider_config import DEFAULT_DHCP_MTU
 from ovirt_provider_config import DEFAULT_DHCP_DEFAULT_IPV6_ADDRESS_MODE
 from ovirt_provider_config import DEFAULT_DHCP_SERVER_MAC
+from ovirt_provider_config import DEFAULT_GROUP_COMMIT_WINDOW
+from ovirt_provider_config import DEFAULT_GZIP_COMPRESSION_LEVEL
+from ovirt_provider_config import DEFAULT_GZIP_MIN_SIZE
+from ovirt_provider_config import DEFAULT_KEEP_ALIVE_MAX_REQUESTS
+from ovirt_provider_config import DEFAULT_KEEP_ALIVE_TIMEOUT
 from ovirt_provider_config import DEFAULT_KEYSTONE_PORT
 from ovirt_provider_config import DEFAULT_NETWORK_PORT_SECURITY_ENABLED
 from ovirt_provider_config import DEFAULT_NEUTRON_PORT
@@ -43,15 +51,23 @@ from ovirt_provider_config import DEFAULT_OPENSTACK_TENANT_DESCRIPTION
 from ovirt_provider_config import DEFAULT_OPENSTACK_TENANT_ID
 from ovirt_provider_config import DEFAULT_OPENSTACK_TENANT_NAME
 from ovirt_provider_config import DEFAULT_OVN_REMOTE_AT_LOCALHOST
+from ovirt_provider_config import DEFAULT_OVN_SNAPSHOT_FILE
+from ovirt_provider_config import DEFAULT_OVN_SNAPSHOT_INTERVAL
 from ovirt_provider_config import DEFAULT_OVS_VERSION_29
 from ovirt_provider_config import DEFAULT_PROVIDER_HOST
 from ovirt_provider_config import DEFAULT_SSL_CERT_FILE
 from ovirt_provider_config import DEFAULT_SSL_CIPHERS_STRING
+from ovirt_provider_config import DEFAULT_SSL_ECDH_CURVE
 from ovirt_provider_config import DEFAULT_SSL_ENABLED
 from ovirt_provider_config import DEFAULT_SSL_KEY_FILE
 from ovirt_provider_config import DEFAULT_URL_FILTER_EXCEPTION
 from ovirt_provider_config import DEFAULT_VALIDATION_MAX_ALLOWED_MTU
+from ovirt_provider_config import DEFAULT_WORKER_POOL_SIZE
+from ovirt_provider_config import DEFAULT_WORKER_QUEUE_SIZE
 from ovirt_provider_config import KEY_AUTH_PLUGIN
+from ovirt_provider_config import KEY_AUTH_TOKEN_CACHE_NEGATIVE_TTL
+from ovirt_provider_config import KEY_AUTH_TOKEN_CACHE_SIZE
+from ovirt_provider_config import KEY_AUTH_TOKEN_CACHE_TTL
 from ovirt_provider_config import KEY_AUTH_TOKEN_TIMEOUT
 from ovirt_provider_config import KEY_DHCP_DEFAULT_IPV6_ADDRESS_MODE
 from ovirt_provider_config import KEY_DHCP_ENABLE_MTU
@@ -59,6 +75,11 @@ from ovirt_provider_config import KEY_DHCP_LEASE_TIME
 from ovirt_provider_config import KEY_DHCP_MTU
 from ovirt_provider_config import KEY_DHCP_SERVER_MAC
 from ovirt_provider_config import KEY_HTTPS_ENABLED
+from ovirt_provider_config import KEY_GROUP_COMMIT_WINDOW
+from ovirt_provider_config import KEY_GZIP_COMPRESSION_LEVEL
+from ovirt_provider_config import KEY_GZIP_MIN_SIZE
+from ovirt_provider_config import KEY_KEEP_ALIVE_MAX_REQUESTS
+from ovirt_provider_config import KEY_KEEP_ALIVE_TIMEOUT
 from ovirt_provider_config import KEY_KEYSTONE_PORT
 from ovirt_provider_config import KEY_NETWORK_PORT_SECURITY_ENABLED
 from ovirt_provider_config import KEY_NEUTRON_PORT
@@ -70,14 +91,19 @@ from ovirt_provider_config import KEY_OPENSTACK_TENANT_DESCRIPTION
 from ovirt_provider_config import KEY_OPENSTACK_TENANT_ID
 from ovirt_provider_config import KEY_OPENSTACK_TENANT_NAME
 from ovirt_provider_config import KEY_OVN_REMOTE
+from ovirt_provider_config import KEY_OVN_SNAPSHOT_FILE
+from ovirt_provider_config import KEY_OVN_SNAPSHOT_INTERVAL
 from ovirt_provider_config import KEY_OVS_VERSION_29
 from ovirt_provider_config import KEY_PROVIDER_HOST
 from ovirt_provider_config import KEY_SSL_CACERT_FILE
 from ovirt_provider_config import KEY_SSL_CERT_FILE
 from ovirt_provider_config import KEY_SSL_CIPHERS_STRING
+from ovirt_provider_config import KEY_SSL_ECDH_CURVE
 from ovirt_provider_config import KEY_SSL_KEY_FILE
 from ovirt_provider_config import KEY_URL_FILTER_EXCEPTION
 from ovirt_provider_config import KEY_VALIDATION_MAX_ALLOWED_MTU
+from ovirt_provider_config import KEY_WORKER_POOL_SIZE
+from ovirt_provider_config import KEY_WORKER_QUEUE_SIZE
 
 PROTOCOL_HTTP = 'http'
 PROTOCOL_HTTPS = 'https'
@@ -226,6 +252,12 @@ def ssl_ciphers_string():
     )
 
 
+def ssl_ecdh_curve():
+    return ovirt_provider_config.get(
+        CONFIG_SECTION_SSL, KEY_SSL_ECDH_CURVE, DEFAULT_SSL_ECDH_CURVE
+    )
+
+
 def ovn_remote():
     return ovirt_provider_config.get(
         CONFIG_SECTION_OVN_REMOTE,
@@ -234,6 +266,22 @@ def ovn_remote():
     )
 
 
+def ovn_snapshot_file():
+    return ovirt_provider_config.get(
+        CONFIG_SECTION_OVN_REMOTE,
+        KEY_OVN_SNAPSHOT_FILE,
+        DEFAULT_OVN_SNAPSHOT_FILE,
+    )
+
+
+def ovn_snapshot_interval():
+    return ovirt_provider_config.getint(
+        CONFIG_SECTION_OVN_REMOTE,
+        KEY_OVN_SNAPSHOT_INTERVAL,
+        DEFAULT_OVN_SNAPSHOT_INTERVAL,
+    )
+
+
 def dhcp_lease_time():
     return ovirt_provider_config.get(
         CONFIG_SECTION_DHCP, KEY_DHCP_LEASE_TIME, DEFAULT_DHCP_LEASE_TIME
@@ -278,6 +326,30 @@ def auth_token_timeout():
     )
 
 
+def auth_token_cache_ttl():
+    return ovirt_provider_config.getint(
+        CONFIG_SECTION_AUTH,
+        KEY_AUTH_TOKEN_CACHE_TTL,
+        DEFAULT_AUTH_TOKEN_CACHE_TTL,
+    )
+
+
+def auth_token_cache_negative_ttl():
+    return ovirt_provider_config.getint(
+        CONFIG_SECTION_AUTH,
+        KEY_AUTH_TOKEN_CACHE_NEGATIVE_TTL,
+        DEFAULT_AUTH_TOKEN_CACHE_NEGATIVE_TTL,
+    )
+
+
+def auth_token_cache_size():
+    return ovirt_provider_config.getint(
+        CONFIG_SECTION_AUTH,
+        KEY_AUTH_TOKEN_CACHE_SIZE,
+        DEFAULT_AUTH_TOKEN_CACHE_SIZE,
+    )
+
+
 def is_ovn_remote_ssl():
     protocol = ovn_remote().split(':')[0]
     return protocol == PROTOCOL_SSL
@@ -311,3 +383,60 @@ def url_filter_exception():
         KEY_URL_FILTER_EXCEPTION,
         DEFAULT_URL_FILTER_EXCEPTION,
     )
+
+
+def worker_pool_size():
+    return ovirt_provider_config.getint(
+        CONFIG_SECTION_PROVIDER, KEY_WORKER_POOL_SIZE, DEFAULT_WORKER_POOL_SIZE
+    )
+
+
+def worker_queue_size():
+    return ovirt_provider_config.getint(
+        CONFIG_SECTION_PROVIDER,
+        KEY_WORKER_QUEUE_SIZE,
+        DEFAULT_WORKER_QUEUE_SIZE,
+    )
+
+
+def group_commit_window():
+    return (
+        ovirt_provider_config.getint(
+            CONFIG_SECTION_PROVIDER,
+            KEY_GROUP_COMMIT_WINDOW,
+            DEFAULT_GROUP_COMMIT_WINDOW,
+        )
+        / 1000.0
+    )
+
+
+def keep_alive_timeout():
+    return ovirt_provider_config.getint(
+        CONFIG_SECTION_PROVIDER,
+        KEY_KEEP_ALIVE_TIMEOUT,
+        DEFAULT_KEEP_ALIVE_TIMEOUT,
+    )
+
+
+def keep_alive_max_requests():
+    return ovirt_provider_config.getint(
+        CONFIG_SECTION_PROVIDER,
+        KEY_KEEP_ALIVE_MAX_REQUESTS,
+        DEFAULT_KEEP_ALIVE_MAX_REQUESTS,
+    )
+
+
+def gzip_min_size():
+    return ovirt_provider_config.getint(
+        CONFIG_SECTION_PROVIDER,
+        KEY_GZIP_MIN_SIZE,
+        DEFAULT_GZIP_MIN_SIZE,
+    )
+
+
+def gzip_compression_level():
+    return ovirt_provider_config.getint(
+        CONFIG_SECTION_PROVIDER,
+        KEY_GZIP_COMPRESSION_LEVEL,
+        DEFAULT_GZIP_COMPRESSION_LEVEL,
+    )
@@ -23,11 +23,8 @@ import atexit
 import logging
 import logging.config
 import os
-import socket
-import ssl
 import sys
 import threading
-from http.server import HTTPServer
 
 from ovsdbapp.backend.ovs_idl import vlog
 
@@ -37,12 +34,17 @@ import version
 
 from handlers.keystone import TokenHandler
 from handlers.neutron import NeutronHandler
+from http_server import WorkerPoolHTTPServerIPv6
+from http_server import create_tls_context
 from ovirt_provider_config_common import ssl_ciphers_string
+from ovirt_provider_config_common import ssl_ecdh_curve
 from ovirt_provider_config_common import ssl_enabled
 from ovirt_provider_config_common import ssl_key_file
 from ovirt_provider_config_common import ssl_cert_file
 from ovirt_provider_config_common import neturon_port
 from ovirt_provider_config_common import keystone_port
+from ovirt_provider_config_common import worker_pool_size
+from ovirt_provider_config_common import worker_queue_size
 
 LOG_CONFIG_FILE = '/etc/ovirt-provider-ovn/logger.conf'
 
@@ -118,11 +120,11 @@ def main():
     ovirt_provider_config.load()
     auth.init()
 
-    server_keystone = HTTPServerIPv6(('', keystone_port()), TokenHandler)
+    server_keystone = _create_server(keystone_port(), TokenHandler)
     _ssl_wrap(server_keystone)
     Thread(target=server_keystone.serve_forever).start()
 
-    server_neutron = HTTPServerIPv6(('', neturon_port()), NeutronHandler)
+    server_neutron = _create_server(neturon_port(), NeutronHandler)
     _ssl_wrap(server_neutron)
     Thread(target=server_neutron.serve_forever).start()
 
@@ -130,27 +132,33 @@ def main():
         logging.info('Shutting down http ...')
         server_keystone.shutdown()
         server_neutron.shutdown()
+        for server in (server_keystone, server_neutron):
+            if server.tls_stats:
+                server.tls_stats.log()
         logging.info('Http shut down successfully, exiting. Bye.')
         logging.shutdown()
 
     atexit.register(kill_handler)
 
 
-class HTTPServerIPv6(HTTPServer):
-    address_family = socket.AF_INET6
+def _create_server(port, handler):
+    return WorkerPoolHTTPServerIPv6(
+        ('', port),
+        handler,
+        pool_size=worker_pool_size(),
+        queue_size=worker_queue_size(),
+    )
 
 
 def _ssl_wrap(server):
     if ssl_enabled():
-        context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
-        context.minimum_version = ssl.TLSVersion.TLSv1_2
-        context.load_cert_chain(
-            certfile=ssl_cert_file(), keyfile=ssl_key_file()
-        )
-        context.set_ciphers(ssl_ciphers_string())
-        server.socket = context.wrap_socket(
-            server.socket,
-            server_side=True,
+        server.enable_tls(
+            create_tls_context(
+                ssl_cert_file(),
+                ssl_key_file(),
+                ssl_ciphers_string(),
+                ssl_ecdh_curve(),
+            )
         )
 
 
@@ -19,7 +19,9 @@
 
 from __future__ import absolute_import
 
+import atexit
 import contextlib
+import threading
 
 import ovs.stream
 import ovsdbapp.backend.ovs_idl.connection
@@ -34,29 +36,99 @@ from handlers.base_handler import ElementNotFoundError
 
 from ovirt_provider_config_common import is_ovn_remote_ssl
 from ovirt_provider_config_common import ovn_remote
+from ovirt_provider_config_common import ovn_snapshot_file
+from ovirt_provider_config_common import ovn_snapshot_interval
 from ovirt_provider_config_common import ssl_key_file
 from ovirt_provider_config_common import ssl_cacert_file
 from ovirt_provider_config_common import ssl_cert_file
 
+from ovndb.group_commit import GroupCommitter
+from ovndb.nb_index import create_nb_index
+from ovndb.nb_snapshot import SnapshotWriter
+from ovndb.nb_snapshot import load_snapshot
+
 _api_impl = None
+_nb_index = None
+_api_impl_lock = threading.Lock()
 
 
 def connect():
-    global _api_impl
+    global _api_impl, _nb_index
     if _api_impl:
         return _api_impl
-    _api_impl = _create_new_connection()
+    with _api_impl_lock:
+        if not _api_impl:
+            api_impl = _create_new_connection()
+            _nb_index = create_nb_index(api_impl)
+            _api_impl = api_impl
     return _api_impl
 
 
+def nb_index():
+    """
+    Returns the secondary indexes of the north db replica, or None if they
+    are not available.
+    """
+    return _nb_index
+
+
 def _create_new_connection():
     configure_ssl_connection()
-    ovsidl = ovsdbapp.backend.ovs_idl.connection.OvsdbIdl.from_server(
+    idl_connection = ovsdbapp.backend.ovs_idl.connection
+    helper = idl_connection.idlutils.get_schema_helper(
         ovn_remote(), ovnconst.OVN_NORTHBOUND
     )
-    return OvnNbApiIdlImpl(
-        ovsdbapp.backend.ovs_idl.connection.Connection(idl=ovsidl, timeout=100)
-    )
+    register_nb_tables(helper)
+    ovsidl = idl_connection.OvsdbIdl(ovn_remote(), helper)
+    connection = idl_connection.Connection(idl=ovsidl, timeout=100)
+    # the snapshot is loaded once the indexes are created, before the
+    # connection starts updating the replica
+    api_impl = OvnNbApiIdlImpl(connection, start=False)
+    snapshot_file = ovn_snapshot_file()
+    if snapshot_file:
+        load_snapshot(ovsidl, snapshot_file)
+    api_impl.start_connection(connection)
+    if snapshot_file:
+        _start_snapshots(ovsidl, connection.lock, snapshot_file)
+    return api_impl
+
+
+def _start_snapshots(idl, lock, snapshot_file):
+    writer = SnapshotWriter(idl, lock, snapshot_file, ovn_snapshot_interval())
+    writer.start()
+    atexit.register(writer.stop)
+
+
+def register_nb_tables(helper):
+    """
+    Registers the tables of ovnconst.NB_TABLES which are in the schema of
+    the server, so the other tables of the north db are not replicated.
+    The columns referring to tables which are not replicated are left out,
+    as the IDL cannot resolve their values.
+    """
+    schema_tables = helper.schema_json['tables']
+    tables = [table for table in ovnconst.NB_TABLES if table in schema_tables]
+    for table in tables:
+        helper.register_columns(
+            table,
+            [
+                column
+                for column, column_schema in schema_tables[table][
+                    'columns'
+                ].items()
+                if _referenced_tables(column_schema['type']) <= set(tables)
+            ],
+        )
+
+
+def _referenced_tables(column_type):
+    if not isinstance(column_type, dict):
+        return set()
+    return {
+        base_type['refTable']
+        for base_type in (column_type['key'], column_type.get('value'))
+        if isinstance(base_type, dict) and 'refTable' in base_type
+    }
 
 
 def configure_ssl_connection():
@@ -76,9 +148,22 @@ def execute(command):
 
 
 class OvnTransactionManager(OvnNbApiIdlImpl):
-    def __init__(self, connection):
+    def __init__(self, connection, group_commit_window=0):
         super(OvnTransactionManager, self).__init__(connection)
-        self._tx = None
+        self._local = threading.local()
+        self._group_committer = (
+            GroupCommitter(self, group_commit_window)
+            if group_commit_window > 0
+            else None
+        )
+
+    @property
+    def _tx(self):
+        return getattr(self._local, 'tx', None)
+
+    @_tx.setter
+    def _tx(self, tx):
+        self._local.tx = tx
 
     def create_transaction(self, check_error=False, log_errors=True, **kwargs):
         tx = Transaction(
@@ -91,12 +176,26 @@ class OvnTransactionManager(OvnNbApiIdlImpl):
         self._tx = tx
         return tx
 
+    @property
+    def group_commit(self):
+        return self._group_committer is not None
+
     @contextlib.contextmanager
-    def transaction(self, check_error=True, log_errors=False, **kwargs):
+    def transaction(
+        self, check_error=True, log_errors=False, group=False, **kwargs
+    ):
+        """
+        With group set, the transaction may be committed together with the
+        grouped transactions of other threads, when group commit is enabled.
+        Only transactions that do not depend on each other may be grouped.
+        """
         if not self._tx:
             self._tx = self.create_transaction(check_error, log_errors)
         try:
             yield self._tx
         finally:
-            self._tx.commit()
-            self._tx = None
+            tx, self._tx = self._tx, None
+            if group and self.group_commit:
+                self._group_committer.commit(tx)
+            else:
+                tx.commit()
@@ -0,0 +1,152 @@
+# Copyright 2026 Red Hat, Inc.
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA
+#
+# Refer to the README and COPYING files for full details of the license
+
+from __future__ import absolute_import
+
+import logging
+import threading
+import time
+
+from ovsdbapp.backend.ovs_idl.transaction import Transaction
+from ovsdbapp.exceptions import TimeoutException
+
+
+class GroupCommitter(object):
+    """
+    Commits the transactions handed to it within window seconds of each
+    other as a single OVSDB transaction, saving a round-trip to the north
+    db for each of them.
+    The first transaction of a group waits for the window to pass and then
+    commits the commands of the whole group. If the group transaction is
+    rejected, because a command fails or the north db refuses the changes,
+    the transactions are committed one by one, so each caller gets the
+    result or the error of its own transaction.
+    """
+
+    def __init__(self, api, window):
+        self._api = api
+        self._window = window
+        self._lock = threading.Lock()
+        self._group = None
+
+    def commit(self, tx):
+        member = _Member(tx)
+        with self._lock:
+            group = self._group
+            is_leader = group is None
+            if is_leader:
+                group = self._group = []
+            group.append(member)
+        if is_leader:
+            self._lead(group)
+        timeout = self._window + self._api.ovsdb_connection.timeout
+        if not member.done.wait(timeout):
+            member.fail(
+                TimeoutException(
+                    commands=tx.commands,
+                    timeout=timeout,
+                    cause='group commit did not complete',
+                )
+            )
+        if member.error is not None:
+            raise member.error
+        return member.result
+
+    def _lead(self, group):
+        try:
+            time.sleep(self._window)
+            with self._lock:
+                self._group = None
+            self._commit_group(group)
+        except BaseException as e:
+            with self._lock:
+                if self._group is group:
+                    self._group = None
+            # The members still waiting get the error instead of their
+            # result, which is never coming.
+            for member in group:
+                member.fail(e)
+            raise
+
+    def _commit_group(self, group):
+        if len(group) > 1:
+            try:
+                self._commit_together(group)
+                return
+            except TimeoutException as e:
+                # The group transaction may still be applied, committing
+                # its members again could apply them twice.
+                for member in group:
+                    member.fail(e)
+                return
+            except Exception as e:
+                logging.info(
+                    'Committing {} grouped transactions one by one: {}'.format(
+                        len(group), e
+                    )
+                )
+        for member in group:
+            member.commit()
+
+    def _commit_together(self, group):
+        connection = self._api.ovsdb_connection
+        group_tx = Transaction(
+            self._api,
+            connection,
+            connection.timeout,
+            check_error=True,
+            log_errors=False,
+        )
+        for member in group:
+            group_tx.extend(member.tx.commands)
+        group_tx.commit()
+        for member in group:
+            member.succeed([command.result for command in member.tx.commands])
+
+
+class _Member(object):
+    def __init__(self, tx):
+        self.tx = tx
+        self.result = None
+        self.error = None
+        self.done = threading.Event()
+        self._lock = threading.Lock()
+
+    def commit(self):
+        if self.done.is_set():
+            return
+        try:
+            self.succeed(self.tx.commit())
+        except Exception as e:
+            self.fail(e)
+
+    def succeed(self, result):
+        self._finish(result, None)
+
+    def fail(self, error):
+        self._finish(None, error)
+
+    def _finish(self, result, error):
+        # Only the first outcome is kept, a caller which gave up waiting is
+        # not committed on its own anymore.
+        with self._lock:
+            if self.done.is_set():
+                return
+            self.result = result
+            self.error = error
+            self.done.set()
@@ -0,0 +1,622 @@
+# Copyright 2026 Red Hat, Inc.
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA
+#
+# Refer to the README and COPYING files for full details of the license
+
+from __future__ import absolute_import
+
+import bisect
+import contextlib
+import types
+import uuid
+
+from ovs.db.custom_index import IndexedRows
+from ovsdbapp.backend.ovs_idl.rowview import RowView
+
+import constants as ovnconst
+from neutron.ip import IpRanges
+from neutron.ip import get_port_ip
+from neutron.ip import random_unused_mac
+from neutron.neutron_api_mappers import PortMapper
+from neutron.neutron_api_mappers import SecurityGroupRuleMapper
+from neutron.neutron_api_mappers import SubnetMapper
+
+INDEX_NAME_PREFIX = 'ovirt-provider-ovn:'
+
+# Number of ids read from a SortedKeys index at a time
+SORTED_IDS_BATCH = 100
+# Number of keys added to a SortedKeys index from which they are sorted in
+# together rather than inserted one by one
+SORTED_KEYS_MERGE = 64
+
+
+def create_nb_index(api):
+    """
+    Returns the NbIndex of the north db replica of api, or None when the
+    replica does not support custom indexes.
+    """
+    tables = api.tables
+    if not all(
+        isinstance(tables[table].rows, IndexedRows) for table in NbIndex.TABLES
+    ):
+        return None
+    return NbIndex(tables, api.ovsdb_connection.lock)
+
+
+class RowIndex(object):
+    """
+    Maps keys derived from the committed content of the rows of a table to
+    the uuids of these rows.
+    It is registered as a custom index of the table rows, so the IDL keeps
+    it current: the old version of a row is removed before an update is
+    applied and the new version is added afterwards, and the index is
+    cleared when the replica is reloaded after a reconnect.
+    """
+
+    # Row.__setattr__ looks for the columns of the indexes of a table to
+    # refresh them on local writes. Only committed data is indexed here.
+    columns = ()
+
+    def __init__(self, keys):
+        self._keys = keys
+        self._rows = {}
+
+    def add(self, row):
+        if row._data is None:
+            return
+        for key in self._keys(row):
+            self._rows.setdefault(key, set()).add(row.uuid)
+
+    def remove(self, row):
+        if row._data is None:
+            return
+        for key in self._keys(row):
+            row_uuids = self._rows.get(key)
+            if row_uuids is None:
+                continue
+            row_uuids.discard(row.uuid)
+            if not row_uuids:
+                del self._rows[key]
+
+    def clear(self):
+        self._rows.clear()
+
+    def get(self, key):
+        return self._rows.get(key, ())
+
+
+class MemberIndex(object):
+    """
+    Maps the members of a set column of the rows of a table to the uuids
+    of the rows holding them, kept current by the IDL like a RowIndex.
+    The IDL removes the old version of an updated row right before adding
+    the new one, so the removal is held back until then, and only the
+    members which joined or left the row are indexed again.
+    """
+
+    columns = ()
+
+    def __init__(self, members):
+        self._members = members
+        self._rows = {}
+        self._row_members = {}
+        self._removed = None
+
+    def add(self, row):
+        if row._data is None:
+            return
+        members = frozenset(self._members(row))
+        if self._removed == row.uuid:
+            self._removed = None
+            old_members = self._row_members[row.uuid]
+        else:
+            self._flush()
+            old_members = frozenset()
+        for member in old_members - members:
+            self._discard(member, row.uuid)
+        for member in members - old_members:
+            self._rows.setdefault(member, set()).add(row.uuid)
+        self._row_members[row.uuid] = members
+
+    def remove(self, row):
+        if row._data is None:
+            return
+        self._flush()
+        if row.uuid in self._row_members:
+            self._removed = row.uuid
+
+    def clear(self):
+        self._rows.clear()
+        self._row_members.clear()
+        self._removed = None
+
+    def get(self, member):
+        self._flush()
+        return self._rows.get(member, ())
+
+    def _flush(self):
+        if self._removed is None:
+            return
+        for member in self._row_members.pop(self._removed):
+            self._discard(member, self._removed)
+        self._removed = None
+
+    def _discard(self, member, row_uuid):
+        row_uuids = self._rows[member]
+        row_uuids.discard(row_uuid)
+        if not row_uuids:
+            del self._rows[member]
+
+
+class RowValues(object):
+    """
+    Maps the uuid of each row of a table to a value derived from its
+    committed content, kept current by the IDL like a RowIndex.
+    """
+
+    columns = ()
+
+    def __init__(self, value):
+        self._value = value
+        self._values = {}
+
+    def add(self, row):
+        if row._data is None:
+            return
+        self._values[row.uuid] = self._value(row)
+
+    def remove(self, row):
+        if row._data is None:
+            return
+        self._values.pop(row.uuid, None)
+
+    def clear(self):
+        self._values.clear()
+
+    def get(self, row_uuid, default=None):
+        return self._values.get(row_uuid, default)
+
+
+class SortedKeys(object):
+    """
+    Keeps the keys derived from the committed content of the rows of a table
+    in ascending order, kept current by the IDL like a RowIndex. The keys
+    added are sorted in when the keys are next read or removed, so loading
+    a whole table sorts it once instead of inserting the keys one by one.
+    """
+
+    columns = ()
+
+    def __init__(self, keys):
+        self._keys = keys
+        self._sorted = []
+        self._added = []
+
+    def add(self, row):
+        if row._data is None:
+            return
+        self._added.extend(self._keys(row))
+
+    def remove(self, row):
+        if row._data is None:
+            return
+        self._merge()
+        for key in self._keys(row):
+            position = bisect.bisect_left(self._sorted, key)
+            if position < len(self._sorted) and self._sorted[position] == key:
+                del self._sorted[position]
+
+    def clear(self):
+        del self._sorted[:]
+        del self._added[:]
+
+    def _merge(self):
+        if len(self._added) < SORTED_KEYS_MERGE:
+            # Shifting the keys after an insertion point is cheaper than
+            # comparing all of them again.
+            for key in self._added:
+                bisect.insort(self._sorted, key)
+        else:
+            # Two sorted runs, which the sort merges in linear time
+            self._added.sort()
+            self._sorted += self._added
+            self._sorted.sort()
+        del self._added[:]
+
+    def after(self, marker, reverse, count):
+        """
+        Returns up to count keys following marker, in ascending order, or
+        preceding it in descending order when reverse. Without a marker,
+        the keys are taken from the start, or from the end when reverse.
+        marker needs not be a key itself.
+        """
+        self._merge()
+        if not reverse:
+            start = (
+                0
+                if marker is None
+                else bisect.bisect_right(self._sorted, marker)
+            )
+            return self._sorted[start : start + count]
+        end = (
+            len(self._sorted)
+            if marker is None
+            else bisect.bisect_left(self._sorted, marker)
+        )
+        return self._sorted[max(0, end - count) : end][::-1]
+
+
+class ChangeCounter(object):
+    """
+    Counts the changes the IDL applies to the rows of a table, the reload
+    of the table after a reconnect included, so the count differs whenever
+    the content of the table may differ.
+    """
+
+    columns = ()
+
+    def __init__(self):
+        self.count = 0
+
+    def add(self, row):
+        self.count += 1
+
+    def remove(self, row):
+        self.count += 1
+
+    def clear(self):
+        self.count += 1
+
+
+class NbIndex(object):
+    """
+    Secondary indexes over the north db replica. The indexes are updated
+    by the IDL under the connection lock, so they are read under it too.
+    """
+
+    TABLES = (
+        ovnconst.TABLE_LS,
+        ovnconst.TABLE_LSP,
+        ovnconst.TABLE_LRP,
+        ovnconst.TABLE_DHCP_Options,
+        ovnconst.TABLE_PORT_GROUP,
+        ovnconst.TABLE_ACL,
+    )
+
+    def __init__(self, tables, lock):
+        self._tables = tables
+        self._lock = lock
+        self._switch_by_port = RowIndex(
+            lambda ls: values(ls, ovnconst.ROW_LS_PORTS)
+        )
+        self._dhcp_by_network = RowIndex(_dhcp_network_id)
+        self._acls_by_security_group = RowIndex(_acl_security_group_id)
+        self._port_groups_by_port = MemberIndex(
+            lambda pg: values(pg, ovnconst.ROW_PG_PORTS)
+        )
+        self._lsps_by_mac = RowIndex(_lsp_macs)
+        self._lrps_by_mac = RowIndex(_lrp_macs)
+        self._lrps_by_network = RowIndex(
+            lambda lrp: values(lrp, ovnconst.ROW_LRP_NETWORKS)
+        )
+        self._reserved_macs = set()
+        self._lsps_by_ip = RowIndex(_lsp_ips)
+        self._exclude_ips_by_switch = RowValues(_exclude_ips)
+        self._sorted_ids = {
+            ovnconst.TABLE_LS: SortedKeys(_row_id),
+            ovnconst.TABLE_LSP: SortedKeys(_ovirt_port_id),
+            ovnconst.TABLE_DHCP_Options: SortedKeys(_subnet_id),
+        }
+        self._changes = {
+            table: ChangeCounter()
+            for table in ovnconst.NB_TABLES
+            if table in tables and isinstance(tables[table].rows, IndexedRows)
+        }
+        # The counters start over in a new provider process, so the tags of
+        # an earlier one must not match.
+        self._change_epoch = uuid.uuid4().hex[:8]
+        with self._lock:
+            self._register(
+                ovnconst.TABLE_LS, 'switch_by_port', self._switch_by_port
+            )
+            self._register(
+                ovnconst.TABLE_DHCP_Options,
+                'dhcp_by_network',
+                self._dhcp_by_network,
+            )
+            self._register(
+                ovnconst.TABLE_ACL,
+                'acls_by_security_group',
+                self._acls_by_security_group,
+            )
+            self._register(
+                ovnconst.TABLE_PORT_GROUP,
+                'port_groups_by_port',
+                self._port_groups_by_port,
+            )
+            self._register(
+                ovnconst.TABLE_LSP, 'lsps_by_mac', self._lsps_by_mac
+            )
+            self._register(
+                ovnconst.TABLE_LRP, 'lrps_by_mac', self._lrps_by_mac
+            )
+            self._register(
+                ovnconst.TABLE_LRP, 'lrps_by_network', self._lrps_by_network
+            )
+            self._register(ovnconst.TABLE_LSP, 'lsps_by_ip', self._lsps_by_ip)
+            self._register(
+                ovnconst.TABLE_LS,
+                'exclude_ips_by_switch',
+                self._exclude_ips_by_switch,
+            )
+            for table, sorted_ids in self._sorted_ids.items():
+                self._register(table, 'sorted_ids', sorted_ids)
+            for table, counter in self._changes.items():
+                self._register(table, 'changes', counter)
+
+    def _register(self, table, name, index):
+        rows = self._tables[table].rows
+        for row in rows.values():
+            index.add(row)
+        rows.indexes[INDEX_NAME_PREFIX + name] = index
+
+    def _rows(self, table, row_uuids):
+        rows = self._tables[table].rows
+        with self._lock:
+            return [
+                RowView(rows[row_uuid])
+                for row_uuid in row_uuids
+                if row_uuid in rows
+            ]
+
+    def sorted_ids(self, table, marker=None, reverse=False):
+        """
+        Yields the ids of the rows of table, which are the ids of their
+        REST entities, in ascending order after marker, or in descending
+        order before it when reverse. The ids are read a batch at a time,
+        each batch following the last id read, so the rows changed meanwhile
+        do not disturb the order.
+        """
+        sorted_ids = self._sorted_ids[table]
+        while True:
+            with self._lock:
+                batch = sorted_ids.after(marker, reverse, SORTED_IDS_BATCH)
+            for row_id in batch:
+                yield row_id
+            if len(batch) < SORTED_IDS_BATCH:
+                return
+            marker = batch[-1]
+
+    def change_tag(self, tables):
+        """
+        Returns a tag of the content of tables in the replica, which changes
+        whenever a row of one of them is inserted, updated or deleted.
+        """
+        with self._lock:
+            changes = sum(
+                self._changes[table].count
+                for table in set(tables)
+                if table in self._changes
+            )
+        return '{}-{}'.format(self._change_epoch, changes)
+
+    def get_port_switch(self, lsp_id):
+        """
+        Returns the logical switch owning the logical switch port lsp_id, or
+        None if there is no such port.
+        """
+        lsp_uuid = to_uuid(lsp_id)
+        with self._lock:
+            switches = self._rows(
+                ovnconst.TABLE_LS, self._switch_by_port.get(lsp_uuid)
+            )
+        return switches[0] if switches else None
+
+    def get_switch(self, ls_id):
+        """
+        Returns the logical switch ls_id, or None if there is no such switch.
+        """
+        switches = self._rows(ovnconst.TABLE_LS, [to_uuid(ls_id)])
+        return switches[0] if switches else None
+
+    def get_network_dhcps(self, ls_id):
+        """
+        Returns the DHCP_Options rows of the subnets of network ls_id.
+        """
+        with self._lock:
+            return self._rows(
+                ovnconst.TABLE_DHCP_Options,
+                sorted(self._dhcp_by_network.get(str(ls_id))),
+            )
+
+    def get_security_group_acls(self, sec_group):
+        """
+        Returns the ACLs of the rules of sec_group. Rules refer to their
+        group either by name or by uuid.
+        """
+        with self._lock:
+            acl_uuids = set(
+                self._acls_by_security_group.get(sec_group.name)
+            ) | set(self._acls_by_security_group.get(str(sec_group.uuid)))
+            return self._rows(ovnconst.TABLE_ACL, sorted(acl_uuids))
+
+    def get_port_groups(self, lsp_id):
+        """
+        Returns the port groups having the logical switch port lsp_id.
+        """
+        with self._lock:
+            return self._rows(
+                ovnconst.TABLE_PORT_GROUP,
+                sorted(self._port_groups_by_port.get(to_uuid(lsp_id))),
+            )
+
+    def get_network_lrps(self, cidr):
+        """
+        Returns the logical router ports having the network cidr, given as
+        the router ip and the prefix length: 10.0.0.1/24.
+        """
+        with self._lock:
+            return self._rows(
+                ovnconst.TABLE_LRP, sorted(self._lrps_by_network.get(cidr))
+            )
+
+    def is_mac_used(self, mac):
+        """
+        Returns True if a switch or router port has mac, or if it is
+        reserved for a port being created.
+        """
+        mac = mac.lower()
+        with self._lock:
+            return bool(
+                mac in self._reserved_macs
+                or self._lsps_by_mac.get(mac)
+                or self._lrps_by_mac.get(mac)
+            )
+
+    @contextlib.contextmanager
+    def reserved_mac(self):
+        """
+        Reserves a random unused mac until the guard exits, so that
+        concurrent port creations do not pick the same one. The port taking
+        it is committed under the guard, and then holds the mac itself.
+        """
+        with self._lock:
+            mac = random_unused_mac(self.is_mac_used)
+            self._reserved_macs.add(mac)
+        try:
+            yield mac
+        finally:
+            with self._lock:
+                self._reserved_macs.discard(mac)
+
+    def is_ip_available(self, ls_id, ip):
+        """
+        Returns True if no port of network ls_id has ip, and ip is not in
+        the exclude_ips of the network.
+        """
+        ls_uuid = to_uuid(ls_id)
+        with self._lock:
+            return self._is_ip_available(ls_uuid, ip)
+
+    def next_free_ip(self, ls_id, cidr, reserved=()):
+        """
+        Returns the lowest host address of cidr available in network ls_id
+        and not in reserved, or None if they are all taken.
+        """
+        ls_uuid = to_uuid(ls_id)
+        with self._lock:
+            exclude_ips = self._exclude_ips_by_switch.get(ls_uuid)
+            return (exclude_ips or IpRanges()).first_free(
+                cidr,
+                lambda ip: ip in reserved or self._is_ip_used(ls_uuid, ip),
+            )
+
+    def _is_ip_available(self, ls_uuid, ip):
+        exclude_ips = self._exclude_ips_by_switch.get(ls_uuid)
+        if exclude_ips is not None and ip in exclude_ips:
+            return False
+        return not self._is_ip_used(ls_uuid, ip)
+
+    def _is_ip_used(self, ls_uuid, ip):
+        return any(
+            ls_uuid in self._switch_by_port.get(lsp_uuid)
+            for lsp_uuid in self._lsps_by_ip.get(ip)
+        )
+
+
+def _lsp_ips(lsp):
+    ip = get_port_ip(
+        types.SimpleNamespace(
+            addresses=values(lsp, ovnconst.ROW_LSP_ADDRESSES),
+            dynamic_addresses=values(lsp, ovnconst.ROW_LSP_DYNAMIC_ADDRESSES),
+        )
+    )
+    return () if ip is None else (ip,)
+
+
+def _exclude_ips(ls):
+    exclude_ips = string_map(ls, ovnconst.ROW_LS_OTHER_CONFIG).get(
+        ovnconst.LS_OPTION_EXCLUDE_IPS, ''
+    )
+    return IpRanges.parse(exclude_ips)
+
+
+def _row_id(row):
+    return (str(row.uuid),)
+
+
+def _subnet_id(dhcp):
+    if SubnetMapper.OVN_NETWORK_ID not in string_map(dhcp, 'external_ids'):
+        return ()
+    return _row_id(dhcp)
+
+
+def _ovirt_port_id(lsp):
+    if PortMapper.OVN_NIC_NAME not in string_map(lsp, 'external_ids'):
+        return ()
+    return tuple(values(lsp, 'name'))
+
+
+def _lsp_macs(lsp):
+    return [
+        address.split()[0].lower()
+        for address in values(lsp, ovnconst.ROW_LSP_ADDRESSES)
+        if address.split()
+    ]
+
+
+def _lrp_macs(lrp):
+    return [mac.lower() for mac in values(lrp, ovnconst.ROW_LRP_MAC)]
+
+
+def _dhcp_network_id(dhcp):
+    return _external_id(dhcp, SubnetMapper.OVN_NETWORK_ID)
+
+
+def _acl_security_group_id(acl):
+    return _external_id(
+        acl, SecurityGroupRuleMapper.OVN_SEC_GROUP_RULE_SEC_GROUP_ID
+    )
+
+
+def _external_id(row, key):
+    value = string_map(row, 'external_ids').get(key)
+    return () if value is None else (value,)
+
+
+def values(row, column):
+    """
+    Returns the committed values of column of row. For a reference column,
+    unlike reading the attribute, this does not drop references to rows not
+    in the replica.
+    """
+    return [atom.value for atom in row._data[column].values]
+
+
+def string_map(row, column):
+    return {
+        key.value: value.value
+        for key, value in row._data[column].values.items()
+    }
+
+
+def to_uuid(row_id):
+    if isinstance(row_id, uuid.UUID):
+        return row_id
+    try:
+        return uuid.UUID(str(row_id))
+    except ValueError:
+        return None
@@ -0,0 +1,107 @@
+# Copyright 2026 Red Hat, Inc.
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA
+#
+# Refer to the README and COPYING files for full details of the license
+
+from __future__ import absolute_import
+
+from ovsdbapp.backend.ovs_idl.idlutils import RowNotFound
+from ovsdbapp.backend.ovs_idl.rowview import RowView
+
+import ovn_connection
+import constants as ovnconst
+
+from handlers.base_handler import BadRequestError
+from handlers.base_handler import ElementNotFoundError
+
+
+def create_nb_reader(api):
+    """
+    Returns the reader of the north db rows for api: an IdlReader when api
+    keeps a replica of the north db, a CommandReader otherwise.
+    """
+    if isinstance(api.tables, dict):
+        return IdlReader(api)
+    return CommandReader(api)
+
+
+class NbReader(object):
+    def __init__(self, api):
+        self._api = api
+
+    def snapshot(self):
+        """
+        Returns a guard keeping the replica from being updated, so rows read
+        under it are consistent with each other.
+        """
+        return self._api.ovsdb_connection.lock
+
+    def list_rows(self, table):
+        raise NotImplementedError()
+
+    def get_row(self, table, record):
+        raise NotImplementedError()
+
+
+class IdlReader(NbReader):
+    """
+    Reads the rows straight from the IDL replica in the calling thread,
+    without building an ovsdbapp command for each read.
+    Writes still go through commands and transactions.
+    """
+
+    def list_rows(self, table):
+        with self.snapshot():
+            return [
+                RowView(row) for row in self._api.tables[table].rows.values()
+            ]
+
+    def get_row(self, table, record):
+        try:
+            return self._api.lookup(table, record)
+        except (ValueError, TypeError) as e:
+            raise BadRequestError(e)
+        except RowNotFound as e:
+            raise ElementNotFoundError(e)
+
+
+class CommandReader(NbReader):
+    """
+    Reads the rows by executing the ovsdbapp read commands.
+    """
+
+    _LIST_COMMANDS = {
+        ovnconst.TABLE_LS: 'ls_list',
+        ovnconst.TABLE_LSP: 'lsp_list',
+        ovnconst.TABLE_LR: 'lr_list',
+        ovnconst.TABLE_DHCP_Options: 'dhcp_options_list',
+    }
+    _GET_COMMANDS = {
+        ovnconst.TABLE_LS: 'ls_get',
+        ovnconst.TABLE_LSP: 'lsp_get',
+        ovnconst.TABLE_DHCP_Options: 'dhcp_options_get',
+    }
+
+    def list_rows(self, table):
+        list_command = self._LIST_COMMANDS.get(table)
+        if list_command:
+            return ovn_connection.execute(getattr(self._api, list_command)())
+        return ovn_connection.execute(self._api.db_list_rows(table))
+
+    def get_row(self, table, record):
+        return ovn_connection.execute(
+            getattr(self._api, self._GET_COMMANDS[table])(record)
+        )
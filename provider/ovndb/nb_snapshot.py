@@ -0,0 +1,167 @@
+# Copyright 2026 Red Hat, Inc.
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA
+#
+# Refer to the README and COPYING files for full details of the license
+
+from __future__ import absolute_import
+
+import json
+import logging
+import os
+import threading
+import uuid
+
+from ovs.db.data import Datum
+from ovs.db.idl import ColumnDefaultDict
+from ovs.db.idl import Row
+
+SNAPSHOT_FORMAT = 1
+NO_TRANSACTION_ID = str(uuid.UUID(int=0))
+
+
+def take_snapshot(idl):
+    """
+    Returns the committed rows of the replica of idl with the id of the
+    last transaction they include, or None if the server does not report
+    transaction ids. The caller holds the connection lock, so the rows and
+    the transaction id match.
+    """
+    if idl.last_id == NO_TRANSACTION_ID:
+        return None
+    return {
+        'format': SNAPSHOT_FORMAT,
+        'schema': _schema(idl),
+        'last_id': idl.last_id,
+        'tables': {
+            table.name: {
+                str(row_uuid): {
+                    column: datum.to_json()
+                    for column, datum in row._data.items()
+                }
+                for row_uuid, row in table.rows.items()
+                if row._data is not None
+            }
+            for table in idl.tables.values()
+        },
+    }
+
+
+def write_snapshot(snapshot, path):
+    """
+    Replaces the snapshot at path. The file is only readable by the owner,
+    as the north db holds the whole network configuration.
+    """
+    tmp_path = path + '.tmp'
+    fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with os.fdopen(fd, 'w') as snapshot_file:
+        json.dump(snapshot, snapshot_file)
+    os.replace(tmp_path, path)
+
+
+def load_snapshot(idl, path):
+    """
+    Fills the empty replica of idl with the rows of the snapshot at path,
+    and sets the id of the last transaction they include, so the IDL asks
+    the server for the changes since that transaction only. If the server
+    no longer has it in its history, the IDL drops the rows and downloads
+    the whole db.
+    Returns True if the snapshot was loaded. A missing, unreadable or stale
+    snapshot, taken with another schema, is ignored.
+    """
+    try:
+        with open(path) as snapshot_file:
+            snapshot = json.load(snapshot_file)
+    except FileNotFoundError:
+        return False
+    except (OSError, ValueError) as e:
+        logging.warning('Ignoring north db snapshot {}: {}'.format(path, e))
+        return False
+    expected = {'format': SNAPSHOT_FORMAT, 'schema': _schema(idl)}
+    if any(snapshot.get(key) != value for key, value in expected.items()):
+        logging.info(
+            'Ignoring north db snapshot {} of another schema'.format(path)
+        )
+        return False
+    try:
+        rows = [
+            _row(idl, idl.tables[table_name], row_uuid, row_json)
+            for table_name, table_rows in snapshot['tables'].items()
+            for row_uuid, row_json in table_rows.items()
+        ]
+    except (KeyError, ValueError) as e:
+        logging.warning('Ignoring north db snapshot {}: {}'.format(path, e))
+        return False
+    for row in rows:
+        row._table.rows[row.uuid] = row
+    idl.last_id = snapshot['last_id']
+    logging.info(
+        'Loaded {} rows of the north db at transaction {}'.format(
+            len(rows), idl.last_id
+        )
+    )
+    return True
+
+
+def _row(idl, table, row_uuid, row_json):
+    data = ColumnDefaultDict(table)
+    for column, datum_json in row_json.items():
+        data[column] = Datum.from_json(table.columns[column].type, datum_json)
+    return Row(idl, table, uuid.UUID(row_uuid), data)
+
+
+def _schema(idl):
+    return {table.name: sorted(table.columns) for table in idl.tables.values()}
+
+
+class SnapshotWriter(object):
+    """
+    Saves a snapshot of the replica every interval seconds, when it changed
+    since the last one.
+    """
+
+    def __init__(self, idl, lock, path, interval):
+        self._idl = idl
+        self._lock = lock
+        self._path = path
+        self._interval = interval
+        self._saved_last_id = None
+        self._stopped = threading.Event()
+
+    def save(self):
+        with self._lock:
+            if self._idl.last_id == self._saved_last_id:
+                return
+            snapshot = take_snapshot(self._idl)
+        if snapshot is None:
+            return
+        write_snapshot(snapshot, self._path)
+        self._saved_last_id = snapshot['last_id']
+
+    def start(self):
+        thread = threading.Thread(target=self._run)
+        thread.daemon = True
+        thread.start()
+
+    def stop(self):
+        self._stopped.set()
+        self.save()
+
+    def _run(self):
+        while not self._stopped.wait(self._interval):
+            try:
+                self.save()
+            except Exception:
+                logging.exception('Unable to save the north db snapshot')
@@ -19,6 +19,8 @@
 
 from __future__ import absolute_import
 
+import contextlib
+
 from ovsdbapp.backend.ovs_idl.idlutils import RowNotFound
 
 import ovn_connection
@@ -29,12 +31,16 @@ from handlers.base_handler import ElementNotFoundError
 
 import neutron.validation as validate
 from neutron.ip import get_mask_from_subnet
+from neutron.ip import is_ip_available_in_network
+from neutron.ip import next_free_ip_in_network
+from neutron.ip import random_unique_mac
 from neutron.neutron_api_mappers import PortMapper
 from neutron.neutron_api_mappers import SecurityGroupMapper
 from neutron.neutron_api_mappers import SecurityGroupRuleMapper
 from neutron.neutron_api_mappers import SubnetMapper
 
 from ovndb.db_set_command import DbSetCommand
+from ovndb.nb_reader import create_nb_reader
 from ovndb.ovn_security_groups import OvnSecurityGroupApi
 from ovndb.ovn_security_groups import SecurityGroupException
 from ovndb.ovn_security_groups import only_rules_with_allowed_actions
@@ -63,8 +69,10 @@ def optionally_use_transactions(f):
 
 
 class OvnNorth(object):
-    def __init__(self, idl):
+    def __init__(self, idl, nb_index=None):
         self.idl = idl
+        self._nb_index = nb_index
+        self._reader = create_nb_reader(idl)
         self._ovn_sec_group_api = OvnSecurityGroupApi(self.idl)
 
     def create_ovn_update_command(self, table_name, entity_uuid):
@@ -103,26 +111,35 @@ class OvnNorth(object):
     def add_route(self, lrp_id, prefix, nexthop):
         ovn_connection.execute(self.idl.lr_route_add(lrp_id, prefix, nexthop))
 
-    def add_dhcp_options(self, cidr, external_ids):
-        return ovn_connection.execute(
-            self.idl.dhcp_options_add(cidr, **external_ids)
-        )
+    @optionally_use_transactions
+    def add_dhcp_options(self, cidr, external_ids, transaction=None):
+        return self.idl.dhcp_options_add(cidr, **external_ids)
 
     @accepts_single_arg
-    def get_ls(self, ls_id=None, dhcp=None):
+    def get_ls(self, ls_id=None, dhcp=None, lsp=None):
         if ls_id:
-            return ovn_connection.execute(self.idl.ls_get(ls_id))
+            return self._reader.get_row(ovnconst.TABLE_LS, ls_id)
         if dhcp:
             dhcp_ls_id = str(
                 dhcp.external_ids.get(SubnetMapper.OVN_NETWORK_ID)
             )
+            if self._nb_index:
+                return self._nb_index.get_switch(dhcp_ls_id)
             for ls in self.list_ls():
                 if dhcp_ls_id == str(ls.uuid):
                     return ls
+        if lsp:
+            if self._nb_index:
+                return self._nb_index.get_port_switch(lsp.uuid)
+            return next(ls for ls in self.list_ls() if lsp in ls.ports)
 
     @accepts_single_arg
     def get_dhcp(self, ls_id=None, dhcp_id=None, lsp_id=None):
         if ls_id:
+            if self._nb_index:
+                return next(
+                    iter(self._nb_index.get_network_dhcps(ls_id)), None
+                )
             return next(
                 (
                     subnet
@@ -133,7 +150,7 @@ class OvnNorth(object):
                 None,
             )
         if dhcp_id:
-            dhcp = ovn_connection.execute(self.idl.dhcp_options_get(dhcp_id))
+            dhcp = self._reader.get_row(ovnconst.TABLE_DHCP_Options, dhcp_id)
             # TODO: this: str(subnet.uuid) != str(subnet_id)
             # is a workaround for an ovsdbapp problem returning
             # random value for table with no indexing column specified when
@@ -147,6 +164,9 @@ class OvnNorth(object):
             return dhcp
 
         if lsp_id:
+            if self._nb_index:
+                ls = self._nb_index.get_port_switch(lsp_id)
+                return self.get_dhcp(ls_id=ls.uuid) if ls else None
             for dhcp in self.list_dhcp():
                 network_id = dhcp.external_ids[SubnetMapper.OVN_NETWORK_ID]
                 try:
@@ -160,15 +180,15 @@ class OvnNorth(object):
     @accepts_single_arg
     def get_lsp(self, lsp_id=None, ovirt_lsp_id=None, lrp=None, lsp_name=None):
         if lsp_id or lsp_name:
-            return ovn_connection.execute(self.idl.lsp_get(lsp_id or lsp_name))
+            return self._reader.get_row(ovnconst.TABLE_LSP, lsp_id or lsp_name)
         if ovirt_lsp_id:
-            lsp = ovn_connection.execute(self.idl.lsp_get(ovirt_lsp_id))
+            lsp = self._reader.get_row(ovnconst.TABLE_LSP, ovirt_lsp_id)
             if not self._is_port_ovirt_controlled(lsp):
                 raise ValueError('Not an ovirt controller port')
             return lsp
         if lrp:
             lsp_id = lrp.name[len(ovnconst.ROUTER_PORT_NAME_PREFIX) :]
-            return ovn_connection.execute(self.idl.lsp_get(lsp_id))
+            return self._reader.get_row(ovnconst.TABLE_LSP, lsp_id)
 
     @accepts_single_arg
     def get_lrp(self, lrp_name=None, lsp_id=None):
@@ -190,29 +210,34 @@ class OvnNorth(object):
                     'Router {router} does not exist'.format(router=lr_id)
                 )
 
+    def snapshot(self):
+        # The replica is not updated while the guard is held, so it is only
+        # held while rows are looked up.
+        return self._reader.snapshot()
+
+    def sorted_ids(self, table, marker=None, reverse=False):
+        if self._nb_index:
+            return self._nb_index.sorted_ids(table, marker, reverse)
+        return None
+
+    def change_tag(self, tables):
+        if self._nb_index:
+            return self._nb_index.change_tag(tables)
+        return None
+
     def list_ls(self):
-        return ovn_connection.execute(self.idl.ls_list())
+        return self._reader.list_rows(ovnconst.TABLE_LS)
 
     def list_lrp(self, router_id=None):
-        # TODO: ovsdbapp does not allow to retrieve all lrp's in one query,
-        # so we have to resort to using the generic query
-        # To be changed once lrp_list is modified
-        all_lrps = ovn_connection.execute(self.idl.db_list(ovnconst.TABLE_LRP))
-        if router_id and all_lrps:
-            logical_router_ports = self.get_lr(lr_id=router_id).ports
-            lrp_ids = [lrp.uuid for lrp in logical_router_ports]
-            return list(
-                filter(lambda lrp: self.get_lrp_id(lrp) in lrp_ids, all_lrps)
-            )
-        else:
-            return all_lrps
+        if router_id:
+            return self.get_lr(lr_id=router_id).ports
+        return self.list_lrp_rows()
 
-    @staticmethod
-    def get_lrp_id(lrp):
-        return lrp['_uuid']
+    def list_lrp_rows(self):
+        return self._reader.list_rows(ovnconst.TABLE_LRP)
 
     def list_dhcp(self):
-        dhcps = ovn_connection.execute(self.idl.dhcp_options_list())
+        dhcps = self._reader.list_rows(ovnconst.TABLE_DHCP_Options)
         return [
             dhcp
             for dhcp in dhcps
@@ -220,10 +245,31 @@ class OvnNorth(object):
         ]
 
     def list_lsp(self):
-        return ovn_connection.execute(self.idl.lsp_list())
+        return self._reader.list_rows(ovnconst.TABLE_LSP)
+
+    def is_ip_available_in_network(self, network, ip):
+        if self._nb_index:
+            return self._nb_index.is_ip_available(network.uuid, ip)
+        return is_ip_available_in_network(network, ip)
+
+    def next_free_ip_in_network(self, network, cidr, reserved=()):
+        if self._nb_index:
+            return self._nb_index.next_free_ip(network.uuid, cidr, reserved)
+        return next_free_ip_in_network(network, cidr, reserved)
+
+    def reserved_mac(self):
+        if self._nb_index:
+            return self._nb_index.reserved_mac()
+        return contextlib.nullcontext(
+            random_unique_mac(self.list_lsp(), self.list_lrp())
+        )
+
+    def unused_mac(self):
+        with self.reserved_mac() as mac:
+            return mac
 
     def list_lr(self):
-        return ovn_connection.execute(self.idl.lr_list())
+        return self._reader.list_rows(ovnconst.TABLE_LR)
 
     def remove_ls(self, ls_id):
         return self.idl.ls_del(ls_id)
@@ -254,8 +300,9 @@ class OvnNorth(object):
     def remove_lrp(self, lrp_id):
         ovn_connection.execute(self.idl.lrp_del(str(lrp_id)))
 
-    def db_set(self, table, id, values):
-        ovn_connection.execute(self.idl.db_set(table, id, values))
+    @optionally_use_transactions
+    def db_set(self, table, id, values, transaction=None):
+        return self.idl.db_set(table, id, values)
 
     def _is_port_ovirt_controlled(self, port_row):
         return PortMapper.OVN_NIC_NAME in port_row.external_ids
@@ -268,21 +315,29 @@ class OvnNorth(object):
             self.idl.db_remove(table, row_id, column_name, key)
         )
 
-    def set_dhcp_options_options_column(self, subnet_uuid, options):
-        ovn_connection.execute(
-            self.idl.dhcp_options_set_options(subnet_uuid, **options)
-        )
+    @optionally_use_transactions
+    def set_dhcp_options_options_column(
+        self, subnet_uuid, options, transaction=None
+    ):
+        return self.idl.dhcp_options_set_options(subnet_uuid, **options)
 
     def list_security_groups(self):
         return list(
             filter(
                 lambda pg: pg.name != SecurityGroupMapper.DROP_ALL_IP_PG_NAME,
-                ovn_connection.execute(
-                    self.idl.db_list_rows(ovnconst.TABLE_PORT_GROUP)
-                ),
+                self._reader.list_rows(ovnconst.TABLE_PORT_GROUP),
             )
         )
 
+    def default_security_groups_exist(self):
+        group_names = {
+            pg.name for pg in self._reader.list_rows(ovnconst.TABLE_PORT_GROUP)
+        }
+        return {
+            SecurityGroupMapper.DEFAULT_PG_NAME,
+            SecurityGroupMapper.DROP_ALL_IP_PG_NAME,
+        } <= group_names
+
     def get_security_group(self, security_group_id):
         try:
             return self.idl.lookup(
@@ -331,9 +386,9 @@ class OvnNorth(object):
 
     @only_rules_with_allowed_actions
     def list_security_group_rules(self, sec_group=None):
-        all_rules = ovn_connection.execute(
-            self.idl.db_list_rows(ovnconst.TABLE_ACL)
-        )
+        if sec_group is not None and self._nb_index:
+            return self._nb_index.get_security_group_acls(sec_group)
+        all_rules = self._reader.list_rows(ovnconst.TABLE_ACL)
 
         return (
             all_rules
@@ -499,6 +554,12 @@ class OvnNorth(object):
         ]
 
     def list_port_security_groups(self, port_uuid):
+        if self._nb_index:
+            return [
+                pg
+                for pg in self._nb_index.get_port_groups(port_uuid)
+                if pg.name != SecurityGroupMapper.DROP_ALL_IP_PG_NAME
+            ]
         return list(
             filter(
                 lambda pg: port_uuid in pg.ports, self.list_security_groups()
@@ -545,11 +606,10 @@ class OvnNorth(object):
         cidr = '{gateway}/{prefix_length}'.format(
             gateway=subnet_gateway, prefix_length=subnet_prefix_length
         )
-        return next(
-            (
-                lrp
-                for lrp in self.list_lrp(router_id=router_id)
-                if cidr in lrp[ovnconst.ROW_LRP_NETWORKS]
-            ),
-            None,
-        )
+        if router_id:
+            lrps = self.list_lrp(router_id=router_id)
+        elif self._nb_index:
+            lrps = self._nb_index.get_network_lrps(cidr)
+        else:
+            lrps = self.list_lrp()
+        return next((lrp for lrp in lrps if cidr in lrp.networks), None)
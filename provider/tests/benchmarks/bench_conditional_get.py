@@ -0,0 +1,62 @@
+# Copyright 2026 Red Hat, Inc.
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA
+#
+# Refer to the README and COPYING files for full details of the license
+"""
+Cost of polling GET /v2.0/ports when nothing changed: listing and encoding
+all the ports, versus taking the ETag of the port tables to answer
+304 Not Modified.
+Run from the provider directory:
+PYTHONPATH=.:tests:tests/benchmarks python tests/benchmarks/...
+"""
+from __future__ import absolute_import
+
+import json
+import time
+
+from handlers.neutron_responses import PORT_TABLES
+from ovndb.nb_index import create_nb_index
+
+from bench_list_ports import _populate
+from ovntestlib import NbReplica
+from ovntestlib import replica_neutron_api
+
+POLLS = 5
+
+
+def _timed(f):
+    start = time.perf_counter()
+    for _ in range(POLLS):
+        f()
+    return (time.perf_counter() - start) / POLLS
+
+
+def main():
+    for ports in (10000, 50000):
+        replica = NbReplica()
+        _populate(replica, ports)
+        neutron_api = replica_neutron_api(replica, create_nb_index(replica))
+        full = _timed(
+            lambda: json.dumps({'ports': list(neutron_api.list_ports())})
+        )
+        tagged = _timed(lambda: neutron_api.change_tag(PORT_TABLES))
+        print('ports: {}'.format(ports))
+        print('  full listing: {:.3f} s per poll'.format(full))
+        print('  not modified: {:.1f} us per poll'.format(tagged * 1e6))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,111 @@
+# Copyright 2026 Red Hat, Inc.
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA
+#
+# Refer to the README and COPYING files for full details of the license
+"""
+Size of a streamed GET /v2.0/ports response of --ports ports, and the time
+to compress and to transfer it over a --mbit link, for each gzip level.
+Run from the provider directory: PYTHONPATH=.:tests python tests/benchmarks/...
+"""
+from __future__ import absolute_import
+
+import argparse
+import io
+import time
+import unittest.mock as mock
+import uuid
+
+from handlers.base_handler import BaseHandler
+from handlers.base_handler import Response
+
+
+class PortsHandler(BaseHandler):
+    ports = []
+
+    def __init__(self, accept_encoding):
+        self.headers = {'Accept-Encoding': accept_encoding}
+        self.request_version = 'HTTP/1.1'
+        self.wfile = io.BytesIO()
+
+    def handle_request(self, method, path_parts, content, query):
+        return Response({'ports': self.ports})
+
+    def send_response(self, code, message=None):
+        pass
+
+    def send_header(self, keyword, value):
+        pass
+
+    def end_headers(self):
+        pass
+
+
+def _port(i):
+    network_id = str(uuid.uuid4())
+    return {
+        'id': str(uuid.uuid4()),
+        'name': 'nic{}'.format(i),
+        'network_id': network_id,
+        'device_id': str(uuid.uuid4()),
+        'device_owner': 'oVirt',
+        'security_groups': [str(uuid.uuid4())],
+        'port_security_enabled': True,
+        'admin_state_up': True,
+        'mac_address': '56:6f:00:00:{:02x}:{:02x}'.format(i // 256, i % 256),
+        'fixed_ips': [
+            {
+                'ip_address': '10.0.{}.{}'.format(i // 250, i % 250 + 1),
+                'subnet_id': network_id,
+            }
+        ],
+        'binding:host_id': 'host{}'.format(i % 50),
+        'tenant_id': '00000000000000000000000000000001',
+    }
+
+
+def _get_ports(accept_encoding):
+    handler = PortsHandler(accept_encoding)
+    start = time.perf_counter()
+    handler._process_collection_response(
+        'ports', iter(PortsHandler.ports), 200
+    )
+    return time.perf_counter() - start, len(handler.wfile.getvalue())
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--ports', type=int, default=20000)
+    parser.add_argument('--mbit', type=float, default=100.0)
+    args = parser.parse_args()
+    PortsHandler.ports = [_port(i) for i in range(args.ports)]
+    bytes_per_second = args.mbit * 1000 * 1000 / 8
+    cases = [('identity', 'identity', 0)] + [
+        ('gzip level {}'.format(level), 'gzip', level) for level in (1, 6, 9)
+    ]
+    for name, accept_encoding, level in cases:
+        with mock.patch(
+            'handlers.base_handler.gzip_compression_level', lambda: level
+        ):
+            elapsed, size = _get_ports(accept_encoding)
+        print(
+            '{}: {:.2f} MB, {:.2f} s to encode, {:.2f} s to transfer'.format(
+                name, size / 1e6, elapsed, size / bytes_per_second
+            )
+        )
+
+
+if __name__ == '__main__':
+    main()
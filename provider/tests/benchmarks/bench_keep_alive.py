@@ -0,0 +1,124 @@
+# Copyright 2026 Red Hat, Inc.
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA
+#
+# Refer to the README and COPYING files for full details of the license
+"""
+Request throughput of the provider http server over TLS, opening a new
+connection for each request versus keeping one connection open for all of
+them. The handler does no work, so the difference is the cost of the TCP
+connection and the TLS handshake.
+A self signed certificate is made with the openssl command unless --cert
+and --key are given.
+Run from the provider directory: PYTHONPATH=.:tests python tests/benchmarks/...
+"""
+from __future__ import absolute_import
+
+import argparse
+import http.client as http_client
+import ssl
+import tempfile
+import time
+from threading import Thread
+
+from handlers.base_handler import BaseHandler
+from handlers.base_handler import Response
+from http_server import WorkerPoolHTTPServerIPv6
+
+from ovntestlib import self_signed_certificate
+
+
+class EmptyHandler(BaseHandler):
+    def handle_request(self, method, path_parts, content, query):
+        return Response({'network': {'id': path_parts[-1]}})
+
+    def log_message(self, *args):
+        pass
+
+
+def _start_server(cert, key):
+    server = WorkerPoolHTTPServerIPv6(
+        ('::1', 0), EmptyHandler, pool_size=1, queue_size=1
+    )
+    context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+    context.minimum_version = ssl.TLSVersion.TLSv1_2
+    context.load_cert_chain(certfile=cert, keyfile=key)
+    server.enable_tls(context)
+    Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def _client_context():
+    context = ssl.SSLContext(ssl.PROTOCOL_TLS_CLIENT)
+    context.check_hostname = False
+    context.verify_mode = ssl.CERT_NONE
+    return context
+
+
+def _get(connection, headers=None):
+    connection.request('GET', '/v2.0/networks/1', headers=headers or {})
+    response = connection.getresponse()
+    response.read()
+    assert response.status == http_client.OK
+
+
+def _new_connection_per_request(port, requests):
+    context = _client_context()
+    for _ in range(requests):
+        connection = http_client.HTTPSConnection('::1', port, context=context)
+        _get(connection, {'Connection': 'close'})
+        connection.close()
+
+
+def _one_connection(port, requests):
+    connection = http_client.HTTPSConnection(
+        '::1', port, context=_client_context()
+    )
+    for _ in range(requests):
+        _get(connection)
+    connection.close()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--requests', type=int, default=500)
+    parser.add_argument('--cert')
+    parser.add_argument('--key')
+    args = parser.parse_args()
+    with tempfile.TemporaryDirectory() as directory:
+        if args.cert and args.key:
+            cert, key = args.cert, args.key
+        else:
+            cert, key = self_signed_certificate(directory)
+        server = _start_server(cert, key)
+    port = server.server_address[1]
+    for name, run in (
+        ('new connection per request', _new_connection_per_request),
+        ('keep-alive', _one_connection),
+    ):
+        start = time.perf_counter()
+        run(port, args.requests)
+        elapsed = time.perf_counter() - start
+        print(
+            '{}: {} requests, {:.2f} s, {:.0f} requests/s'.format(
+                name, args.requests, elapsed, args.requests / elapsed
+            )
+        )
+    server.shutdown()
+    server.server_close()
+
+
+if __name__ == '__main__':
+    main()
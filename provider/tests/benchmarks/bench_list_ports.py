@@ -0,0 +1,118 @@
+# Copyright 2026 Red Hat, Inc.
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA
+#
+# Refer to the README and COPYING files for full details of the license
+"""
+Cost of GET /v2.0/ports: serializing the ports one at a time, looking up
+the network, subnet and router port of each of them, versus the bulk
+listing joining prefetched rows.
+The per port path is only timed on the first SAMPLE ports, its cost per
+port grows with the number of networks.
+Run from the provider directory: PYTHONPATH=.:tests python tests/benchmarks/...
+"""
+from __future__ import absolute_import
+
+import time
+
+import constants as ovnconst
+from neutron.neutron_api_mappers import PortMapper
+from neutron.neutron_api_mappers import SubnetMapper
+from ovndb.nb_index import create_nb_index
+
+from ovntestlib import NbReplica
+from ovntestlib import replica_neutron_api
+
+PORTS_PER_NETWORK = 50
+SAMPLE = 200
+
+
+def _populate(replica, ports):
+    for network in range(ports // PORTS_PER_NETWORK):
+        ls = replica.insert(ovnconst.TABLE_LS, name='net{}'.format(network))
+        replica.insert(
+            ovnconst.TABLE_DHCP_Options,
+            cidr='10.{}.{}.0/24'.format(network // 256, network % 256),
+            external_ids={SubnetMapper.OVN_NETWORK_ID: str(ls.uuid)},
+        )
+        lsps = [
+            replica.insert(
+                ovnconst.TABLE_LSP,
+                name='port{}-{}'.format(network, port),
+                addresses=[
+                    '00:00:00:{:02x}:{:02x}:{:02x} 10.{}.{}.{}'.format(
+                        network // 256,
+                        network % 256,
+                        port,
+                        network // 256,
+                        network % 256,
+                        port + 2,
+                    )
+                ],
+                external_ids={PortMapper.OVN_NIC_NAME: 'nic{}'.format(port)},
+            )
+            for port in range(PORTS_PER_NETWORK)
+        ]
+        replica.update(ls, ports=lsps)
+
+
+def _neutron_api(replica, with_index):
+    nb_index = create_nb_index(replica) if with_index else None
+    return replica_neutron_api(replica, nb_index)
+
+
+def _per_port(neutron_api):
+    ports = []
+    for ls in neutron_api.ovn_north.list_ls():
+        for lsp in ls.ports:
+            if len(ports) == SAMPLE:
+                return ports
+            ports.append(
+                PortMapper.row2rest(neutron_api._get_network_port(lsp))
+            )
+    return ports
+
+
+def _timed(f):
+    start = time.perf_counter()
+    result = f()
+    return time.perf_counter() - start, len(result)
+
+
+def main():
+    for ports in (10000, 50000):
+        replica = NbReplica()
+        _populate(replica, ports)
+        per_port, sampled = _timed(
+            lambda: _per_port(_neutron_api(replica, with_index=False))
+        )
+        bulk, listed = _timed(
+            _neutron_api(replica, with_index=True).list_ports
+        )
+        print('ports: {}'.format(ports))
+        print(
+            '  per port lookups: {:.1f} us/port ({} ports sampled)'.format(
+                per_port / sampled * 1e6, sampled
+            )
+        )
+        print(
+            '  bulk listing: {:.1f} us/port, {:.2f} s total'.format(
+                bulk / listed * 1e6, bulk
+            )
+        )
+
+
+if __name__ == '__main__':
+    main()
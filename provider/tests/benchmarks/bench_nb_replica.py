@@ -0,0 +1,77 @@
+# Copyright 2026 Red Hat, Inc.
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA
+#
+# Refer to the README and COPYING files for full details of the license
+"""
+Initial sync time and memory of the north db replica, replicating the whole
+db versus only the tables registered by the provider.
+Needs a populated north db: PYTHONPATH=.:tests python
+tests/benchmarks/bench_nb_replica.py --remote tcp:127.0.0.1:6641
+"""
+from __future__ import absolute_import
+
+import argparse
+import time
+import tracemalloc
+
+from ovs import poller
+from ovs.db import idl as ovs_idl
+from ovsdbapp.backend.ovs_idl import idlutils
+
+import constants as ovnconst
+from ovn_connection import register_nb_tables
+
+
+def _sync(remote, register):
+    helper = idlutils.get_schema_helper(remote, ovnconst.OVN_NORTHBOUND)
+    register(helper)
+    tracemalloc.start()
+    start = time.perf_counter()
+    replica = ovs_idl.Idl(remote, helper)
+    while not replica.has_ever_connected() or replica.change_seqno < 1:
+        replica.run()
+        wait = poller.Poller()
+        replica.wait(wait)
+        wait.block()
+    replica.run()
+    elapsed = time.perf_counter() - start
+    memory, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    rows = sum(len(table.rows) for table in replica.tables.values())
+    replica.close()
+    return elapsed, memory, len(replica.tables), rows
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--remote', help='the north db, e.g. tcp:ip:6641')
+    args = parser.parse_args()
+    if not args.remote:
+        print('skipped, no --remote north db given')
+        return
+    for name, register in (
+        ('whole db', ovs_idl.SchemaHelper.register_all),
+        ('provider tables', register_nb_tables),
+    ):
+        elapsed, memory, tables, rows = _sync(args.remote, register)
+        print(
+            '{}: {} tables, {} rows, initial sync {:.2f} s, '
+            '{:.1f} MiB'.format(name, tables, rows, elapsed, memory / 2**20)
+        )
+
+
+if __name__ == '__main__':
+    main()
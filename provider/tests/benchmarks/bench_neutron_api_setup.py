@@ -0,0 +1,56 @@
+# Copyright 2026 Red Hat, Inc.
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA
+#
+# Refer to the README and COPYING files for full details of the license
+"""
+Per-request cost of obtaining a NeutronApi: a new object for every request
+versus the instance shared by the process.
+Run from the provider directory: PYTHONPATH=. python tests/benchmarks/...
+"""
+from __future__ import absolute_import
+
+import timeit
+import unittest.mock as mock
+
+import constants as ovnconst
+from neutron.neutron_api import NeutronApi
+
+REQUESTS = 20000
+
+
+def _idl():
+    idl = mock.MagicMock()
+    idl.tables = {ovnconst.TABLE_PORT_GROUP: mock.MagicMock()}
+    return idl
+
+
+def main():
+    with mock.patch('ovn_connection.connect', return_value=_idl()):
+        per_request = timeit.timeit(NeutronApi, number=REQUESTS)
+        shared = timeit.timeit(NeutronApi.instance, number=REQUESTS)
+    print('requests: {}'.format(REQUESTS))
+    print(
+        'new NeutronApi per request: {:.2f} us/request'.format(
+            per_request / REQUESTS * 1e6
+        )
+    )
+    print(
+        'shared NeutronApi: {:.2f} us/request'.format(shared / REQUESTS * 1e6)
+    )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,67 @@
+# Copyright 2026 Red Hat, Inc.
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA
+#
+# Refer to the README and COPYING files for full details of the license
+"""
+Cost of a page of --limit ports from the middle of GET /v2.0/ports: read
+over the sorted port ids of the north db index, versus listing and sorting
+all the ports to cut the page out of them.
+Run from the provider directory:
+PYTHONPATH=.:tests:tests/benchmarks python tests/benchmarks/...
+"""
+from __future__ import absolute_import
+
+import argparse
+import time
+
+from handlers.neutron_responses import get_ports
+from handlers.selecting_handler import QUERY_PARAMETERS
+from ovndb.nb_index import create_nb_index
+
+from bench_list_ports import _populate
+from ovntestlib import NbReplica
+from ovntestlib import replica_neutron_api
+
+
+def _page(neutron_api, query):
+    start = time.perf_counter()
+    body = get_ports(neutron_api, None, {QUERY_PARAMETERS: query}).body
+    return time.perf_counter() - start, len(body['ports'])
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--limit', type=int, default=100)
+    args = parser.parse_args()
+    for ports in (10000, 50000):
+        replica = NbReplica()
+        neutron_api = replica_neutron_api(replica, create_nb_index(replica))
+        _populate(replica, ports)
+        port_ids = sorted(lsp.name for lsp in neutron_api.ovn_north.list_lsp())
+        query = {
+            'limit': [str(args.limit)],
+            'marker': [port_ids[len(port_ids) // 2]],
+        }
+        indexed, listed = _page(neutron_api, query)
+        neutron_api.iter_ports = lambda marker, reverse, filters: None
+        sorted_all, _ = _page(neutron_api, query)
+        print('ports: {}, page of {}'.format(ports, listed))
+        print('  over the index: {:.4f} s'.format(indexed))
+        print('  sorting all the ports: {:.4f} s'.format(sorted_all))
+
+
+if __name__ == '__main__':
+    main()
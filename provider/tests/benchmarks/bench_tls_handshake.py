@@ -0,0 +1,105 @@
+# Copyright 2026 Red Hat, Inc.
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA
+#
+# Refer to the README and COPYING files for full details of the license
+"""
+Latency of a request sent over a new TLS connection to the provider http
+server, with a full handshake versus resuming the session of the previous
+connection, for TLS 1.2 and TLS 1.3. The server uses the TLS context of the
+provider with the default ciphers, and a self signed certificate made with
+the openssl command.
+Run from the provider directory:
+PYTHONPATH=.:tests:tests/benchmarks python tests/benchmarks/...
+"""
+from __future__ import absolute_import
+
+import argparse
+import socket
+import ssl
+import tempfile
+import time
+from threading import Thread
+
+from http_server import WorkerPoolHTTPServerIPv6
+from http_server import create_tls_context
+from ovirt_provider_config import DEFAULT_SSL_CIPHERS_STRING
+
+from bench_keep_alive import EmptyHandler
+from ovntestlib import self_signed_certificate
+
+REQUEST = b'GET /v2.0/networks/1 HTTP/1.1\r\nHost: localhost\r\n\r\n'
+
+
+def _start_server(cert, key):
+    server = WorkerPoolHTTPServerIPv6(
+        ('::1', 0), EmptyHandler, pool_size=1, queue_size=1
+    )
+    server.enable_tls(
+        create_tls_context(cert, key, DEFAULT_SSL_CIPHERS_STRING)
+    )
+    Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def _client_context(version):
+    context = ssl.SSLContext(ssl.PROTOCOL_TLS_CLIENT)
+    context.check_hostname = False
+    context.verify_mode = ssl.CERT_NONE
+    context.maximum_version = version
+    return context
+
+
+def _requests(port, context, requests, resume):
+    session = None
+    for _ in range(requests):
+        client = socket.create_connection(('::1', port))
+        # The client would otherwise hold the request back until the server
+        # acknowledges its last handshake message.
+        client.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, True)
+        client = context.wrap_socket(
+            client, session=session if resume else None
+        )
+        client.sendall(REQUEST)
+        client.recv(4096)
+        session = client.session
+        client.close()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--requests', type=int, default=300)
+    args = parser.parse_args()
+    with tempfile.TemporaryDirectory() as directory:
+        server = _start_server(*self_signed_certificate(directory))
+    port = server.server_address[1]
+    for version in (ssl.TLSVersion.TLSv1_2, ssl.TLSVersion.TLSv1_3):
+        context = _client_context(version)
+        for name, resume in (('full handshake', False), ('resumed', True)):
+            start = time.perf_counter()
+            _requests(port, context, args.requests, resume)
+            elapsed = time.perf_counter() - start
+            print(
+                '{} {}: {:.2f} ms per request'.format(
+                    version.name, name, 1000 * elapsed / args.requests
+                )
+            )
+    print(server.tls_stats.summary())
+    server.shutdown()
+    server.server_close()
+
+
+if __name__ == '__main__':
+    main()
@@ -17,12 +17,28 @@
 # Refer to the README and COPYING files for full details of the license
 from __future__ import absolute_import
 
+import json
+import os
+import socket
+import subprocess
+import threading
+import unittest.mock as mock
+import uuid as uuid_lib
+
+from ovs.db.custom_index import IndexedRows
+from ovs.db.data import Datum
+from ovs.db.idl import ColumnDefaultDict
+from ovs.db.idl import Row
+from ovs.db.schema import DbSchema
+from ovsdbapp.schema.ovn_northbound.impl_idl import OvnNbApiIdlImpl
+
 from ovirt_provider_config_common import tenant_id
 from ovirt_provider_config_common import dhcp_mtu
 
 import constants as ovnconst
 import neutron.constants as neutron_constants
 import neutron.ip as ip_utils
+from neutron.neutron_api import NeutronApi
 
 from neutron.neutron_api_mappers import NetworkMapper
 from neutron.neutron_api_mappers import PortMapper
@@ -518,3 +534,365 @@ class SecurityGroupRuleApiInputMaker(ApiInputMaker):
             SecurityGroupRuleMapper.REST_SEC_GROUP_RULE_IP_PREFIX,
             ip_prefix,
         )
+
+
+def _ref_set(table, max='unlimited', ref_type='strong'):
+    return {
+        'type': {
+            'key': {'type': 'uuid', 'refTable': table, 'refType': ref_type},
+            'min': 0,
+            'max': max,
+        }
+    }
+
+
+def _string_set(max='unlimited'):
+    return {'type': {'key': 'string', 'min': 0, 'max': max}}
+
+
+_STRING = {'type': 'string'}
+_STRING_MAP = {
+    'type': {'key': 'string', 'value': 'string', 'min': 0, 'max': 'unlimited'}
+}
+
+_BOOLEAN_OPTIONAL = {'type': {'key': 'boolean', 'min': 0, 'max': 1}}
+_INTEGER_OPTIONAL = {'type': {'key': 'integer', 'min': 0, 'max': 1}}
+
+NB_SCHEMA = {
+    'name': 'OVN_Northbound',
+    'version': '5.0.0',
+    'tables': {
+        'Logical_Switch': {
+            'columns': {
+                'name': _STRING,
+                'ports': _ref_set('Logical_Switch_Port'),
+                'other_config': _STRING_MAP,
+                'external_ids': _STRING_MAP,
+            },
+            'isRoot': True,
+        },
+        'Logical_Switch_Port': {
+            'columns': {
+                'name': _STRING,
+                'type': _STRING,
+                'options': _STRING_MAP,
+                'addresses': _string_set(),
+                'dynamic_addresses': _string_set(max=1),
+                'port_security': _string_set(),
+                'up': _BOOLEAN_OPTIONAL,
+                'enabled': _BOOLEAN_OPTIONAL,
+                'tag': _INTEGER_OPTIONAL,
+                'dhcpv4_options': _ref_set('DHCP_Options', 1, 'weak'),
+                'dhcpv6_options': _ref_set('DHCP_Options', 1, 'weak'),
+                'external_ids': _STRING_MAP,
+            },
+            'indexes': [['name']],
+        },
+        'DHCP_Options': {
+            'columns': {
+                'cidr': _STRING,
+                'options': _STRING_MAP,
+                'external_ids': _STRING_MAP,
+            },
+            'isRoot': True,
+        },
+        'Logical_Router': {
+            'columns': {
+                'name': _STRING,
+                'ports': _ref_set('Logical_Router_Port'),
+                'static_routes': _ref_set('Logical_Router_Static_Route'),
+                'enabled': _BOOLEAN_OPTIONAL,
+                'options': _STRING_MAP,
+                'external_ids': _STRING_MAP,
+            },
+            'isRoot': True,
+        },
+        'Logical_Router_Port': {
+            'columns': {
+                'name': _STRING,
+                'mac': _STRING,
+                'networks': _string_set(),
+                'enabled': _BOOLEAN_OPTIONAL,
+                'ipv6_ra_configs': _STRING_MAP,
+                'options': _STRING_MAP,
+                'external_ids': _STRING_MAP,
+            },
+            'indexes': [['name']],
+        },
+        'Logical_Router_Static_Route': {
+            'columns': {
+                'ip_prefix': _STRING,
+                'nexthop': _STRING,
+                'external_ids': _STRING_MAP,
+            },
+        },
+        'Port_Group': {
+            'columns': {
+                'name': _STRING,
+                'ports': _ref_set('Logical_Switch_Port', ref_type='weak'),
+                'acls': _ref_set('ACL'),
+                'external_ids': _STRING_MAP,
+            },
+            'isRoot': True,
+            'indexes': [['name']],
+        },
+        'ACL': {
+            'columns': {
+                'name': _string_set(max=1),
+                'priority': {'type': 'integer'},
+                'direction': _STRING,
+                'match': _STRING,
+                'action': _STRING,
+                'external_ids': _STRING_MAP,
+            },
+        },
+    },
+}
+
+
+class NbReplica(object):
+    """
+    Keeps rows of a north db subset the way the IDL does, including the
+    custom indexes bookkeeping, without an ovsdb server.
+    """
+
+    is_running = True
+    timeout = 1
+
+    def __init__(self):
+        self._schema = DbSchema.from_json(NB_SCHEMA)
+        self.tables = self._schema.tables
+        for table in self.tables.values():
+            table.rows = IndexedRows(table)
+        self.lock = threading.RLock()
+
+    @property
+    def idl(self):
+        return self
+
+    @property
+    def ovsdb_connection(self):
+        return self
+
+    def insert(self, table_name, **columns):
+        table = self.tables[table_name]
+        row = Row(self, table, uuid_lib.uuid4(), ColumnDefaultDict(table))
+        self._set(row, columns)
+        table.rows[row.uuid] = row
+        return row
+
+    def update(self, row, **columns):
+        del row._table.rows[row.uuid]
+        self._set(row, columns)
+        row._table.rows[row.uuid] = row
+
+    def delete(self, row):
+        del row._table.rows[row.uuid]
+
+    def clear(self):
+        for table in self.tables.values():
+            table.rows.clear()
+
+    @staticmethod
+    def _set(row, columns):
+        for name, value in columns.items():
+            column = row._table.columns[name]
+            row._data[name] = Datum.from_python(
+                column.type, value, lambda r: getattr(r, 'uuid', r)
+            )
+
+
+class NbReplicaApi(OvnNbApiIdlImpl):
+    """
+    The ovsdbapp north db API over an NbReplica. Only read only commands
+    can be executed.
+    """
+
+    def __init__(self, replica):
+        self._replica = replica
+        self.autocreate_indices()
+
+    @property
+    def ovsdb_connection(self):
+        return self._replica
+
+
+def replica_neutron_api(replica, nb_index=None):
+    api = NbReplicaApi(replica)
+    with mock.patch('ovn_connection.connect', return_value=api), mock.patch(
+        'ovn_connection.nb_index', return_value=nb_index
+    ), mock.patch('ovn_connection.OvnTransactionManager'):
+        return NeutronApi(sec_group_support=True)
+
+
+SERVER_SCHEMA = {
+    'name': '_Server',
+    'version': '1.1.0',
+    'tables': {
+        'Database': {
+            'columns': {
+                'name': _STRING,
+                'model': _STRING,
+                'connected': {'type': 'boolean'},
+                'leader': {'type': 'boolean'},
+                'schema': _string_set(max=1),
+                'cid': {'type': {'key': 'uuid', 'min': 0, 'max': 1}},
+                'index': _INTEGER_OPTIONAL,
+            },
+            'isRoot': True,
+        },
+    },
+}
+
+
+class OvsdbServerStandIn(object):
+    """
+    Serves NB_SCHEMA over a unix socket, answering the requests an IDL
+    sends to monitor a standalone db. Each insert is a transaction kept in
+    the history, so a monitor_cond_since request for a transaction of the
+    history only gets the rows inserted after it.
+    """
+
+    def __init__(self, path):
+        self.remote = 'unix:' + path
+        self.rows = {table: {} for table in NB_SCHEMA['tables']}
+        self.history = []
+        self.last_id = str(uuid_lib.uuid4())
+        self.requested_last_ids = []
+        self._socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self._socket.bind(path)
+        self._socket.listen(1)
+        self._thread = threading.Thread(target=self._serve)
+        self._thread.daemon = True
+        self._thread.start()
+
+    def insert(self, table, **columns):
+        row_uuid = str(uuid_lib.uuid4())
+        self.rows[table][row_uuid] = columns
+        self.last_id = str(uuid_lib.uuid4())
+        self.history.append((self.last_id, table, row_uuid))
+        return row_uuid
+
+    def delete(self, table, row_uuid):
+        del self.rows[table][row_uuid]
+        self.last_id = str(uuid_lib.uuid4())
+        self.history.append((self.last_id, table, row_uuid))
+
+    def forget_history(self):
+        self.history = []
+
+    def close(self):
+        self._socket.close()
+
+    def _serve(self):
+        while True:
+            try:
+                connection, _ = self._socket.accept()
+            except OSError:
+                return
+            with connection:
+                try:
+                    self._serve_connection(connection)
+                except ConnectionError:
+                    # A closed IDL may reset the connection
+                    pass
+
+    def _serve_connection(self, connection):
+        decoder = json.JSONDecoder()
+        buffer = ''
+        while True:
+            data = connection.recv(65536)
+            if not data:
+                return
+            buffer += data.decode()
+            while buffer:
+                try:
+                    message, end = decoder.raw_decode(buffer)
+                except ValueError:
+                    break
+                buffer = buffer[end:].lstrip()
+                if message.get('method') is None:
+                    continue
+                reply = {
+                    'id': message['id'],
+                    'result': self._result(message),
+                    'error': None,
+                }
+                connection.sendall(json.dumps(reply).encode())
+
+    def _result(self, message):
+        method, params = message['method'], message['params']
+        if method == 'get_schema':
+            return SERVER_SCHEMA if params[0] == '_Server' else NB_SCHEMA
+        if method == 'monitor_cond':
+            return {
+                'Database': {
+                    str(uuid_lib.uuid4()): {
+                        'initial': {
+                            'name': NB_SCHEMA['name'],
+                            'model': 'standalone',
+                            'connected': True,
+                            'leader': True,
+                        }
+                    }
+                }
+            }
+        if method == 'monitor_cond_since':
+            return self._monitor_since(params[3])
+        if method == 'echo':
+            return params
+        return {}
+
+    def _monitor_since(self, last_id):
+        self.requested_last_ids.append(last_id)
+        txn_ids = [txn_id for txn_id, _, _ in self.history]
+        if last_id not in txn_ids:
+            return [False, self.last_id, self._updates(self.rows, 'initial')]
+        changes = {table: {} for table in self.rows}
+        for _, table, row_uuid in self.history[txn_ids.index(last_id) + 1 :]:
+            row = self.rows[table].get(row_uuid)
+            changes[table][row_uuid] = (
+                {'delete': None} if row is None else {'insert': row}
+            )
+        return [True, self.last_id, changes]
+
+    @staticmethod
+    def _updates(rows, kind):
+        return {
+            table: {
+                row_uuid: {kind: row} for row_uuid, row in table_rows.items()
+            }
+            for table, table_rows in rows.items()
+        }
+
+
+def self_signed_certificate(directory):
+    """
+    Makes a self signed certificate and its key in directory with the
+    openssl command, and returns their paths.
+    """
+    cert = os.path.join(directory, 'cert.pem')
+    key = os.path.join(directory, 'key.pem')
+    subprocess.run(
+        [
+            'openssl',
+            'req',
+            '-x509',
+            '-newkey',
+            'rsa:2048',
+            '-nodes',
+            '-subj',
+            '/CN=localhost',
+            '-addext',
+            'subjectAltName=DNS:localhost',
+            '-days',
+            '1',
+            '-keyout',
+            key,
+            '-out',
+            cert,
+        ],
+        check=True,
+        capture_output=True,
+    )
+    return cert, key
@@ -20,6 +20,9 @@ from __future__ import absolute_import
 import unittest.mock as mock
 from unittest.mock import ANY
 
+import pytest
+
+from auth import Unauthorized
 
 from auth.plugins.ovirt import AuthorizationByUserName
 
@@ -30,6 +33,8 @@ INFO_VALID = {'user_id': 'netadmin@internal', 'active': True}
 
 INFO_INVALID = {'user_id': 'user@internal', 'active': True}
 
+INFO_INACTIVE = {'user_id': 'netadmin@internal', 'active': False}
+
 
 @mock.patch(
     'auth.plugins.ovirt.authorization_by_username.get_token_info',
@@ -65,3 +70,28 @@ def test_validate_token_fail(mock_get_token_info):
         token=TOKEN,
         timeout=ANY,
     )
+
+
+@mock.patch(
+    'auth.plugins.ovirt.authorization_by_username.get_token_info',
+    return_value=INFO_VALID,
+    autospec=True,
+)
+def test_validate_token_cached(mock_get_token_info):
+    authorizationByUserName = AuthorizationByUserName()
+    assert authorizationByUserName.validate_token(TOKEN)
+    assert authorizationByUserName.validate_token(TOKEN)
+    assert mock_get_token_info.call_count == 1
+
+
+@mock.patch(
+    'auth.plugins.ovirt.authorization_by_username.get_token_info',
+    return_value=INFO_INACTIVE,
+    autospec=True,
+)
+def test_inactive_token_cached(mock_get_token_info):
+    authorizationByUserName = AuthorizationByUserName()
+    for _ in range(2):
+        with pytest.raises(Unauthorized):
+            authorizationByUserName.validate_token(TOKEN)
+    assert mock_get_token_info.call_count == 1
@@ -0,0 +1,114 @@
+# Copyright 2026 Red Hat, Inc.
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA
+#
+# Refer to the README and COPYING files for full details of the license
+#
+from __future__ import absolute_import
+
+from http.server import BaseHTTPRequestHandler
+from http.server import HTTPServer
+from threading import Thread
+import shutil
+import ssl
+import unittest.mock as mock
+
+import pytest
+
+from auth.plugins.ovirt import session
+
+from ovntestlib import self_signed_certificate
+
+ENGINE_URL = 'https://test.com/ovirt-engine'
+
+
+def provider_config_keep_alive_disabled(section, key, default):
+    return False if key == 'ovirt-keep-alive' else default
+
+
+@mock.patch('auth.plugins.ovirt.session._session', None)
+class TestOvirtSession(object):
+    def test_session_is_shared(self):
+        assert session.get_session() is session.get_session()
+
+    def test_connections_pooled_with_retries(self):
+        adapter = session.get_session().get_adapter(ENGINE_URL)
+        assert adapter._pool_maxsize == 10
+        assert adapter.max_retries.connect == 2
+        assert adapter.max_retries.read is False
+        assert session.get_session().headers['Connection'] == 'keep-alive'
+
+    @mock.patch(
+        'auth.plugins.ovirt.session.ovirt_provider_config.getboolean',
+        side_effect=provider_config_keep_alive_disabled,
+    )
+    def test_keep_alive_disabled(self, mock_getboolean):
+        assert session.get_session().headers['Connection'] == 'close'
+
+    def test_cookies_not_shared_between_calls(self, requests_mock):
+        requests_mock.register_uri(
+            'GET', ENGINE_URL, headers={'Set-Cookie': 'JSESSIONID=user1'}
+        )
+        session.get_session().get(ENGINE_URL)
+        assert not session.get_session().cookies
+
+
+class EngineHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header('Content-Length', '0')
+        self.end_headers()
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def engine(tmp_path):
+    if not shutil.which('openssl'):
+        pytest.skip('openssl command not available')
+    cert, key = self_signed_certificate(str(tmp_path))
+    server = HTTPServer(('127.0.0.1', 0), EngineHandler)
+    context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+    context.load_cert_chain(cert, key)
+    server.socket = context.wrap_socket(server.socket, server_side=True)
+    Thread(target=server.serve_forever, daemon=True).start()
+    yield 'https://localhost:{}/'.format(server.server_address[1]), cert
+    server.shutdown()
+    server.server_close()
+
+
+@mock.patch('auth.plugins.ovirt.session._session', None)
+@mock.patch(
+    'auth.plugins.ovirt.session.ovirt_provider_config.getboolean',
+    side_effect=provider_config_keep_alive_disabled,
+)
+class TestEngineTlsContext(object):
+    def test_context_is_built_once(self, mock_getboolean, engine):
+        url, cert = engine
+        with mock.patch(
+            'auth.plugins.ovirt.session._create_tls_context',
+            wraps=session._create_tls_context,
+        ) as mock_create_tls_context:
+            for _ in range(2):
+                assert session.get_session().get(url, verify=cert).ok
+
+        mock_create_tls_context.assert_called_once_with(cert)
+
+    @pytest.mark.filterwarnings('ignore::urllib3.exceptions.HTTPWarning')
+    def test_unverified_connection(self, mock_getboolean, engine):
+        url, cert = engine
+        assert session.get_session().get(url, verify=cert).ok
+        assert session.get_session().get(url, verify=False).ok
@@ -0,0 +1,94 @@
+# Copyright 2026 Red Hat, Inc.
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA
+#
+# Refer to the README and COPYING files for full details of the license
+#
+from __future__ import absolute_import
+
+import unittest.mock as mock
+
+import pytest
+
+from auth import Unauthorized
+from auth.token_cache import TokenCache
+
+TOKEN = 'the_secret_token'
+OTHER_TOKEN = 'the_other_token'
+NOW = 1000.0
+
+
+@mock.patch('auth.token_cache.time.time', return_value=NOW)
+class TestTokenCache(object):
+    def test_authorized_token_cached_for_ttl(self, mock_time):
+        cache = TokenCache(ttl=60, negative_ttl=10, max_entries=10)
+        assert cache.get(TOKEN) is None
+
+        cache.put(TOKEN, True)
+        assert cache.get(TOKEN).validate()
+
+        mock_time.return_value = NOW + 60
+        assert cache.get(TOKEN) is None
+
+    def test_token_not_cached_past_expiry(self, mock_time):
+        cache = TokenCache(ttl=60, negative_ttl=10, max_entries=10)
+        cache.put(TOKEN, True, expires_at=NOW + 5)
+
+        mock_time.return_value = NOW + 4
+        assert cache.get(TOKEN).validate()
+        mock_time.return_value = NOW + 5
+        assert cache.get(TOKEN) is None
+
+    def test_expired_token_not_cached(self, mock_time):
+        cache = TokenCache(ttl=60, negative_ttl=10, max_entries=10)
+        cache.put(TOKEN, True, expires_at=NOW - 1)
+        assert cache.get(TOKEN) is None
+
+    def test_forbidden_token_cached_for_negative_ttl(self, mock_time):
+        cache = TokenCache(ttl=60, negative_ttl=10, max_entries=10)
+        cache.put(TOKEN, False)
+        assert not cache.get(TOKEN).validate()
+
+        mock_time.return_value = NOW + 10
+        assert cache.get(TOKEN) is None
+
+    def test_rejected_token_raises_from_cache(self, mock_time):
+        cache = TokenCache(ttl=60, negative_ttl=10, max_entries=10)
+        cache.put_rejected(TOKEN, 'Token is not active.')
+        with pytest.raises(Unauthorized, match='Token is not active.'):
+            cache.get(TOKEN).validate()
+
+    def test_least_recently_used_token_evicted(self, mock_time):
+        cache = TokenCache(ttl=60, negative_ttl=10, max_entries=2)
+        cache.put(TOKEN, True)
+        cache.put(OTHER_TOKEN, True)
+        cache.get(TOKEN)
+        cache.put('third_token', True)
+
+        assert cache.get(TOKEN)
+        assert cache.get(OTHER_TOKEN) is None
+
+    def test_zero_ttl_disables_cache(self, mock_time):
+        cache = TokenCache(ttl=0, negative_ttl=10, max_entries=10)
+        cache.put(TOKEN, True)
+        cache.put_rejected(OTHER_TOKEN, 'Token is not active.')
+        assert cache.get(TOKEN) is None
+        assert cache.get(OTHER_TOKEN) is None
+
+    def test_token_not_stored_in_clear(self, mock_time):
+        cache = TokenCache(ttl=60, negative_ttl=10, max_entries=10)
+        cache.put(TOKEN, True)
+        assert TOKEN.encode() not in cache._entries
+        assert TOKEN not in cache._entries
@@ -0,0 +1,485 @@
+# Copyright 2026 Red Hat, Inc.
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA
+#
+# Refer to the README and COPYING files for full details of the license
+from __future__ import absolute_import
+
+from http.server import BaseHTTPRequestHandler
+from http.server import HTTPServer
+from threading import Event
+from threading import Thread
+import gzip
+import json
+import http.client as http_client
+import shutil
+import socket
+import ssl
+import time
+import unittest.mock as mock
+
+import pytest
+
+from handlers.base_handler import BaseHandler
+from handlers.base_handler import ElementNotFoundError
+from handlers.base_handler import Response
+from handlers.base_handler import accepts_gzip
+from http_server import TlsHandshakeMixIn
+from http_server import WorkerPoolMixIn
+from http_server import create_tls_context
+from http_server import tls_handshake_summaries
+from ovirt_provider_config import DEFAULT_SSL_CIPHERS_STRING
+
+from ovntestlib import self_signed_certificate
+
+RELEASE_TIMEOUT = 10
+ITEMS = [{'id': str(i)} for i in range(10000)]
+HUGE_DATA = 'x' * 16 * 1024 * 1024
+
+
+class WorkerPoolHTTPServer(WorkerPoolMixIn, HTTPServer):
+    def __init__(self, handler, pool_size, queue_size):
+        HTTPServer.__init__(self, ('127.0.0.1', 0), handler)
+        self.start_workers(pool_size, queue_size)
+
+
+class TlsWorkerPoolHTTPServer(TlsHandshakeMixIn, WorkerPoolHTTPServer):
+    pass
+
+
+class BlockingHandler(BaseHTTPRequestHandler):
+    release = Event()
+
+    def do_GET(self):
+        self.server.started.append(self.path)
+        BlockingHandler.release.wait(RELEASE_TIMEOUT)
+        self.send_response(http_client.OK)
+        self.send_header('Content-Length', '0')
+        self.end_headers()
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    BlockingHandler.release.clear()
+    server = WorkerPoolHTTPServer(BlockingHandler, pool_size=2, queue_size=1)
+    server.started = []
+    Thread(target=server.serve_forever, daemon=True).start()
+    yield server
+    BlockingHandler.release.set()
+    server.shutdown()
+    server.server_close()
+
+
+def _get(server, path, results):
+    connection = http_client.HTTPConnection(*server.server_address)
+    connection.request('GET', path)
+    results[path] = connection.getresponse().status
+    connection.close()
+
+
+def _start_client(server, path, results):
+    client = Thread(target=_get, args=(server, path, results))
+    client.start()
+    return client
+
+
+def _wait_for(condition):
+    event = Event()
+    for _ in range(100):
+        if condition():
+            return
+        event.wait(0.05)
+    raise AssertionError('condition not met')
+
+
+class TestWorkerPoolServer(object):
+    def test_requests_served_concurrently(self, server):
+        results = {}
+        clients = []
+        for path in ('/a', '/b'):
+            clients.append(_start_client(server, path, results))
+            _wait_for(lambda: path in server.started)
+
+        assert not results
+        BlockingHandler.release.set()
+        for client in clients:
+            client.join()
+
+        assert results == {'/a': http_client.OK, '/b': http_client.OK}
+
+    def test_full_queue_rejects_request(self, server):
+        results = {}
+        busy = []
+        for path in ('/a', '/b'):
+            busy.append(_start_client(server, path, results))
+            _wait_for(lambda: path in server.started)
+
+        queued = _start_client(server, '/queued', results)
+        _wait_for(lambda: server._requests.full())
+
+        _get(server, '/rejected', results)
+        assert results['/rejected'] == http_client.SERVICE_UNAVAILABLE
+
+        BlockingHandler.release.set()
+        for client in busy + [queued]:
+            client.join()
+        assert results['/queued'] == http_client.OK
+
+
+def _broken_items():
+    yield from ITEMS
+    raise RuntimeError('item not readable')
+
+
+class EchoHandler(BaseHandler):
+    def handle_request(self, method, path_parts, content, query):
+        if path_parts == ['missing']:
+            raise ElementNotFoundError()
+        if path_parts == ['large']:
+            return Response({'data': 'x' * 4096})
+        if path_parts == ['items']:
+            return Response({'items': ITEMS})
+        if path_parts == ['huge']:
+            return Response({'data': HUGE_DATA})
+        if path_parts == ['broken']:
+            return Response({'items': _broken_items()})
+        if path_parts == ['unchanged']:
+            return Response(
+                code=http_client.NOT_MODIFIED, headers={'ETag': 'W/"1"'}
+            )
+        return Response({'path': path_parts})
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def echo_server():
+    server = WorkerPoolHTTPServer(EchoHandler, pool_size=1, queue_size=1)
+    Thread(target=server.serve_forever, daemon=True).start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@mock.patch('handlers.base_handler.logging', mock.Mock())
+class TestKeepAlive(object):
+    def test_requests_share_a_connection(self, echo_server):
+        connection = http_client.HTTPConnection(*echo_server.server_address)
+        statuses = []
+        for path in ('/v2.0/a', '/v2.0/missing', '/v2.0/b'):
+            connection.request('GET', path)
+            response = connection.getresponse()
+            response.read()
+            statuses.append(response.status)
+            assert not response.will_close
+        connection.close()
+
+        assert statuses == [
+            http_client.OK,
+            http_client.NOT_FOUND,
+            http_client.OK,
+        ]
+
+    def test_not_modified_response_keeps_connection(self, echo_server):
+        connection = http_client.HTTPConnection(*echo_server.server_address)
+        connection.request('GET', '/v2.0/unchanged')
+        unchanged = connection.getresponse()
+        unchanged_body = unchanged.read()
+        connection.request('GET', '/v2.0/a')
+        response = connection.getresponse()
+        body = response.read()
+        connection.close()
+
+        assert unchanged.status == http_client.NOT_MODIFIED
+        assert unchanged.getheader('ETag') == 'W/"1"'
+        assert unchanged.getheader('Content-Length') is None
+        assert unchanged_body == b''
+        assert body == b'{"path": ["a"]}'
+
+    @mock.patch('handlers.base_handler.keep_alive_max_requests', lambda: 2)
+    def test_connection_closed_after_max_requests(self, echo_server):
+        connection = http_client.HTTPConnection(*echo_server.server_address)
+        connection.request('GET', '/v2.0/a')
+        first = connection.getresponse()
+        first.read()
+        connection.request('GET', '/v2.0/b')
+        second = connection.getresponse()
+        second.read()
+        connection.close()
+
+        assert not first.will_close
+        assert second.will_close
+        assert second.getheader('Connection') == 'close'
+
+    @mock.patch('handlers.base_handler.keep_alive_timeout', lambda: 0.2)
+    def test_idle_connection_is_closed(self, echo_server):
+        client = socket.create_connection(echo_server.server_address)
+        client.settimeout(RELEASE_TIMEOUT)
+        client.sendall(b'GET /v2.0/things/a HTTP/1.1\r\nHost: test\r\n\r\n')
+        response = b''
+        while not response.endswith(b'{"path": ["things", "a"]}'):
+            response += client.recv(4096)
+        started = time.monotonic()
+        assert client.recv(4096) == b''
+        assert time.monotonic() - started < RELEASE_TIMEOUT
+        client.close()
+        assert b'Content-Length: 25\r\n' in response
+
+    @mock.patch(
+        'handlers.base_handler.keep_alive_timeout', lambda: RELEASE_TIMEOUT
+    )
+    def test_idle_connections_do_not_hold_the_workers(self, echo_server):
+        connections = []
+        for path in ('/v2.0/a', '/v2.0/b', '/v2.0/c'):
+            connection = http_client.HTTPConnection(
+                *echo_server.server_address, timeout=RELEASE_TIMEOUT / 2
+            )
+            connection.request('GET', path)
+            response = connection.getresponse()
+            response.read()
+            assert response.status == http_client.OK
+            assert not response.will_close
+            connections.append(connection)
+
+        for released in connections[:-1]:
+            assert released.sock.recv(1) == b''
+        for connection in connections:
+            connection.close()
+
+    def test_failed_stream_is_not_terminated(self, echo_server):
+        client = socket.create_connection(echo_server.server_address)
+        client.settimeout(RELEASE_TIMEOUT)
+        response = b''
+        with mock.patch('handlers.base_handler.logging') as mock_logging:
+            client.sendall(b'GET /v2.0/broken HTTP/1.1\r\nHost: test\r\n\r\n')
+            while True:
+                data = client.recv(65536)
+                if not data:
+                    break
+                response += data
+        client.close()
+
+        assert response.startswith(b'HTTP/1.1 200')
+        assert b'Transfer-Encoding: chunked\r\n' in response
+        assert not response.endswith(b'0\r\n\r\n')
+        mock_logging.exception.assert_called_once_with('item not readable')
+        mock_logging.error.assert_called_once_with(
+            'Response to GET /v2.0/broken cut off, closing the connection'
+        )
+
+    @mock.patch('handlers.base_handler.keep_alive_timeout', lambda: 0.2)
+    def test_slow_client_gets_the_whole_response(self, echo_server):
+        client = socket.socket()
+        client.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 4096)
+        client.settimeout(RELEASE_TIMEOUT)
+        client.connect(echo_server.server_address)
+        client.sendall(b'GET /v2.0/huge HTTP/1.1\r\nHost: test\r\n\r\n')
+        Event().wait(0.5)
+        response = http_client.HTTPResponse(client)
+        response.begin()
+        body = response.read()
+        client.close()
+
+        assert response.status == http_client.OK
+        assert json.loads(body) == {'data': HUGE_DATA}
+
+
+@mock.patch('handlers.base_handler.logging', mock.Mock())
+@mock.patch('handlers.base_handler.gzip_compression_level', lambda: 1)
+class TestCompression(object):
+    def _get(self, connection, path, accept_encoding='gzip'):
+        connection.request(
+            'GET', path, headers={'Accept-Encoding': accept_encoding}
+        )
+        response = connection.getresponse()
+        return response, response.read()
+
+    def test_large_response_is_compressed(self, echo_server):
+        connection = http_client.HTTPConnection(*echo_server.server_address)
+        large, large_body = self._get(connection, '/v2.0/large')
+        small, small_body = self._get(connection, '/v2.0/a')
+        connection.close()
+
+        assert large.getheader('Content-Encoding') == 'gzip'
+        assert large.getheader('Vary') == 'Accept-Encoding'
+        assert int(large.getheader('Content-Length')) == len(large_body)
+        assert gzip.decompress(large_body) == (
+            b'{"data": "' + b'x' * 4096 + b'"}'
+        )
+        assert small.getheader('Content-Encoding') is None
+        assert small.getheader('Vary') == 'Accept-Encoding'
+        assert small_body == b'{"path": ["a"]}'
+
+    def test_collection_is_compressed(self, echo_server):
+        connection = http_client.HTTPConnection(*echo_server.server_address)
+        response, body = self._get(connection, '/v2.0/items')
+        connection.close()
+
+        assert response.getheader('Content-Encoding') == 'gzip'
+        assert response.getheader('Transfer-Encoding') == 'chunked'
+        assert json.loads(gzip.decompress(body)) == {'items': ITEMS}
+
+    @mock.patch('handlers.base_handler.gzip_min_size', lambda: 0)
+    def test_not_compressed_unless_accepted(self, echo_server):
+        connection = http_client.HTTPConnection(*echo_server.server_address)
+        response, body = self._get(connection, '/v2.0/large', 'gzip;q=0')
+        connection.close()
+
+        assert response.getheader('Content-Encoding') is None
+        assert response.getheader('Vary') == 'Accept-Encoding'
+        assert body == b'{"data": "' + b'x' * 4096 + b'"}'
+
+    def test_not_compressed_when_disabled(self, echo_server):
+        connection = http_client.HTTPConnection(*echo_server.server_address)
+        with mock.patch(
+            'handlers.base_handler.gzip_compression_level', lambda: 0
+        ):
+            response, body = self._get(connection, '/v2.0/large')
+        connection.close()
+
+        assert response.getheader('Content-Encoding') is None
+        assert response.getheader('Vary') is None
+        assert body == b'{"data": "' + b'x' * 4096 + b'"}'
+
+    @pytest.mark.parametrize(
+        'accept_encoding,accepted',
+        [
+            (None, False),
+            ('', False),
+            ('gzip', True),
+            ('deflate, GZIP;q=0.5', True),
+            ('gzip;q=0', False),
+            ('*', True),
+            ('*, gzip;q=0', False),
+            ('identity', False),
+        ],
+    )
+    def test_accepts_gzip(self, accept_encoding, accepted):
+        assert accepts_gzip(accept_encoding) == accepted
+
+
+@pytest.fixture
+def tls_server(tmp_path):
+    if not shutil.which('openssl'):
+        pytest.skip('openssl command not available')
+    server = TlsWorkerPoolHTTPServer(EchoHandler, pool_size=1, queue_size=1)
+    server.enable_tls(
+        create_tls_context(
+            *self_signed_certificate(str(tmp_path)), DEFAULT_SSL_CIPHERS_STRING
+        )
+    )
+    Thread(target=server.serve_forever, daemon=True).start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def _tls_get(server, context, session=None):
+    client = context.wrap_socket(
+        socket.create_connection(server.server_address), session=session
+    )
+    client.settimeout(RELEASE_TIMEOUT)
+    client.sendall(
+        b'GET /v2.0/a HTTP/1.1\r\nHost: test\r\nConnection: close\r\n\r\n'
+    )
+    response = b''
+    while True:
+        data = client.recv(4096)
+        if not data:
+            break
+        response += data
+    session = client.session
+    client.close()
+    return response, session
+
+
+@mock.patch('handlers.base_handler.logging', mock.Mock())
+class TestTlsHandshake(object):
+    def _client_context(self):
+        context = ssl.SSLContext(ssl.PROTOCOL_TLS_CLIENT)
+        context.check_hostname = False
+        context.verify_mode = ssl.CERT_NONE
+        context.maximum_version = ssl.TLSVersion.TLSv1_2
+        return context
+
+    def test_session_is_resumed(self, tls_server):
+        context = self._client_context()
+        first, session = _tls_get(tls_server, context)
+        second, _ = _tls_get(tls_server, context, session)
+
+        assert first.startswith(b'HTTP/1.1 200')
+        assert second.startswith(b'HTTP/1.1 200')
+        summary = tls_server.tls_stats.summary()
+        assert summary['handshakes'] == 2
+        assert summary['resumed'] == 1
+        assert summary['failed'] == 0
+        name = 'port {}'.format(tls_server.server_address[1])
+        assert tls_handshake_summaries()[name]['handshakes'] == 2
+
+    def test_failed_handshake_is_counted(self, tls_server):
+        client = socket.create_connection(tls_server.server_address)
+        client.settimeout(RELEASE_TIMEOUT)
+        client.sendall(b'GET /v2.0/a HTTP/1.1\r\nHost: test\r\n\r\n')
+        client.recv(4096)
+        client.close()
+        _wait_for(lambda: tls_server.tls_stats.failed == 1)
+
+        response, _ = _tls_get(tls_server, self._client_context())
+        assert response.startswith(b'HTTP/1.1 200')
+        assert tls_server.tls_stats.handshakes == 1
+
+    def test_full_queue_closes_connection_without_handshake(self, tls_server):
+        silent = [socket.create_connection(tls_server.server_address)]
+        _wait_for(
+            lambda: tls_server._requests.unfinished_tasks == 1
+            and tls_server._requests.empty()
+        )
+        silent.append(socket.create_connection(tls_server.server_address))
+        _wait_for(lambda: tls_server._requests.full())
+
+        try:
+            for _ in range(2):
+                rejected = socket.create_connection(tls_server.server_address)
+                rejected.settimeout(RELEASE_TIMEOUT)
+                assert rejected.recv(4096) == b''
+                rejected.close()
+        finally:
+            for client in silent:
+                client.close()
+
+    @mock.patch(
+        'handlers.base_handler.keep_alive_timeout', lambda: RELEASE_TIMEOUT
+    )
+    def test_idle_connection_is_released(self, tls_server):
+        connections = []
+        for path in ('/v2.0/a', '/v2.0/b'):
+            connection = http_client.HTTPSConnection(
+                *tls_server.server_address,
+                timeout=RELEASE_TIMEOUT / 2,
+                context=self._client_context()
+            )
+            connection.request('GET', path)
+            response = connection.getresponse()
+            response.read()
+            assert response.status == http_client.OK
+            connections.append(connection)
+
+        assert connections[0].sock.recv(1) == b''
+        for connection in connections:
+            connection.close()
@@ -22,6 +22,7 @@ import neutron.ip as ip_utils
 
 Lsp = namedtuple('Lsp', ['addresses', 'dynamic_addresses'])
 Lrp = namedtuple('Lrp', ['networks'])
+Network = namedtuple('Network', ['ports', 'other_config'])
 
 ADDRESS_DATA = [
     (None, 'unknown', None),
@@ -132,3 +133,69 @@ def test_diff_routes_ipv6():
     assert len(deleted) == 1
     assert rest_routes[0]['destination'] in added
     assert db_routes[0].ip_prefix in deleted
+
+
+def test_ip_ranges_parse_and_serialize():
+    exclude_ips = ip_utils.IpRanges.parse(
+        '10.0.0.9 10.0.0.1..10.0.0.3 10.0.0.4'
+    )
+    assert str(exclude_ips) == '10.0.0.1..10.0.0.4 10.0.0.9'
+    assert '10.0.0.2' in exclude_ips
+    assert '10.0.0.9' in exclude_ips
+    assert '10.0.0.5' not in exclude_ips
+    assert 'fd00::1' not in exclude_ips
+    assert not ip_utils.IpRanges.parse('')
+
+
+def test_ip_ranges_parse_skips_invalid_entries():
+    exclude_ips = ip_utils.IpRanges.parse(
+        '10.0.0.1 10.0.0.x 10.0.0.9..10.0.0.5 10.0.0.7..fd00::1 10.0.0.3'
+    )
+    assert str(exclude_ips) == '10.0.0.1 10.0.0.3'
+
+
+def test_ip_available_in_network_with_invalid_exclude_ips():
+    network = Network(
+        ports=[], other_config={'exclude_ips': '10.0.0.1 not-an-ip'}
+    )
+    assert not ip_utils.is_ip_available_in_network(network, '10.0.0.1')
+    assert ip_utils.is_ip_available_in_network(network, '10.0.0.2')
+
+
+def test_ip_ranges_first_free():
+    exclude_ips = ip_utils.IpRanges.parse('10.0.0.1..10.0.0.5 10.0.0.7')
+    used = {'10.0.0.6', '10.0.0.8'}
+    assert exclude_ips.first_free('10.0.0.0/24', used.__contains__) == (
+        '10.0.0.9'
+    )
+    assert exclude_ips.first_free('10.0.0.0/29', used.__contains__) is None
+    assert ip_utils.IpRanges().first_free('fd00::/64', used.__contains__) == (
+        'fd00::1'
+    )
+
+
+def test_next_free_ip_in_network():
+    network = Network(
+        ports=[Lsp(['00:00:00:00:00:01 10.0.0.2'], [])],
+        other_config={'exclude_ips': '10.0.0.1 10.0.0.4'},
+    )
+    assert (
+        ip_utils.next_free_ip_in_network(
+            network, '10.0.0.0/24', reserved=('10.0.0.3',)
+        )
+        == '10.0.0.5'
+    )
+
+
+def test_ip_ranges_add_merges_neighbours():
+    exclude_ips = ip_utils.IpRanges.parse('10.0.0.1 10.0.0.3')
+    exclude_ips.add('10.0.0.2')
+    assert str(exclude_ips) == '10.0.0.1..10.0.0.3'
+
+
+def test_ip_ranges_remove_splits_range():
+    exclude_ips = ip_utils.IpRanges.parse('10.0.0.1..10.0.0.5')
+    exclude_ips.remove('10.0.0.3')
+    exclude_ips.remove('10.0.0.1')
+    exclude_ips.remove('10.0.0.8')
+    assert str(exclude_ips) == '10.0.0.2 10.0.0.4..10.0.0.5'
@@ -19,11 +19,15 @@ from __future__ import absolute_import
 
 from unittest.mock import MagicMock
 import json
+import threading
 import unittest.mock as mock
 
 import http.client as http_client
+from handlers.base_handler import ElementNotFoundError
 from handlers.base_handler import Response
 from handlers.neutron import NeutronHandler
+from handlers.neutron_responses import read_from
+import handlers.neutron
 
 from handlers.selecting_handler import rest
 
@@ -31,6 +35,9 @@ REST_RESPONSE_GET = 'REST_RESPONSE_GET'
 REST_RESPONSE_SHOW = 'REST_RESPONSE_SHOW'
 REST_RESPONSE_POST = 'REST_RESPONSE_POST'
 CLIENT_ADDRESS = ('127.0.0.1', 41736)
+COLLECTION = [
+    {'id': str(i), 'name': 'item{}'.format(i % 3)} for i in range(5000)
+]
 
 response_handlers = {}
 
@@ -63,6 +70,32 @@ def response_code_201(nb_db, content, path_parts):
     )
 
 
+@rest('GET', 'write_lock', response_handlers)
+def get_write_lock_state(nb_db, content, path_parts):
+    return Response({'locked': handlers.neutron._write_lock.locked()})
+
+
+@rest('POST', 'write_lock', response_handlers)
+def post_write_lock_state(nb_db, content, path_parts):
+    return Response({'locked': handlers.neutron._write_lock.locked()})
+
+
+@rest('GET', 'collection', response_handlers)
+def get_collection(nb_db, content, path_parts):
+    return Response({'items': COLLECTION})
+
+
+@rest('GET', 'iterated', response_handlers)
+def get_iterated(nb_db, content, path_parts):
+    return Response({'items': iter(COLLECTION)})
+
+
+@rest('GET', 'tagged', response_handlers)
+@read_from(('Logical_Switch',))
+def get_tagged(nb_db, content, path_parts):
+    return Response({'tagged': nb_db.list_networks()})
+
+
 @mock.patch('handlers.neutron.NeutronHandler._run_server', lambda *args: None)
 @mock.patch('handlers.neutron_responses._responses', response_handlers)
 class TestNeutronHandler(object):
@@ -258,3 +291,346 @@ class TestNeutronHandler(object):
         assert handler.wfile.write.call_args[0][0] == expected_response
         assert mock_send_response.call_count == 1
         assert mock_validate_token.call_count == 1
+
+    @mock.patch('handlers.neutron.NeutronApi', autospec=True)
+    @mock.patch('handlers.neutron.NeutronHandler.end_headers')
+    @mock.patch('handlers.neutron.NeutronHandler.send_header')
+    @mock.patch('handlers.neutron.NeutronHandler.send_response', autospec=True)
+    @mock.patch('handlers.neutron.validate_token', return_value=True)
+    def test_only_modifying_requests_are_serialized(
+        self,
+        mock_validate_token,
+        mock_send_response,
+        mock_send_header,
+        mock_end_headers,
+        mock_ovn_north,
+    ):
+        handler = NeutronHandler(None, None, None)
+        handler.wfile = MagicMock()
+        handler.rfile = MagicMock()
+        handler.rfile.read.return_value = 'content'
+        handler.client_address = CLIENT_ADDRESS
+        handler.headers = {'Content-Length': 7}
+        handler.path = '/v2.0/write_lock'
+
+        handler.do_GET()
+        assert handler.wfile.write.call_args[0][0] == b'{"locked": false}'
+
+        handler.do_POST()
+        assert handler.wfile.write.call_args[0][0] == b'{"locked": true}'
+        assert not handlers.neutron._write_lock.locked()
+
+    @mock.patch('handlers.neutron.NeutronApi', autospec=True)
+    @mock.patch('handlers.neutron.NeutronHandler.end_headers')
+    @mock.patch('handlers.neutron.NeutronHandler.send_header')
+    @mock.patch('handlers.neutron.NeutronHandler.send_response', autospec=True)
+    @mock.patch('handlers.neutron.validate_token')
+    def test_token_is_validated_before_serializing(
+        self,
+        mock_validate_token,
+        mock_send_response,
+        mock_send_header,
+        mock_end_headers,
+        mock_ovn_north,
+    ):
+        locked_on_validation = []
+
+        def validate_token(token):
+            locked_on_validation.append(handlers.neutron._write_lock.locked())
+            return True
+
+        mock_validate_token.side_effect = validate_token
+        handler = NeutronHandler(None, None, None)
+        handler.wfile = MagicMock()
+        handler.rfile = MagicMock()
+        handler.rfile.read.return_value = 'content'
+        handler.client_address = CLIENT_ADDRESS
+        handler.headers = {'Content-Length': 7}
+        handler.path = '/v2.0/write_lock'
+
+        handler.do_POST()
+
+        assert handler.wfile.write.call_args[0][0] == b'{"locked": true}'
+        assert locked_on_validation == [False]
+        assert not handlers.neutron._write_lock.locked()
+
+    def _get_collection(self, path, request_version, protocol_version):
+        handler = NeutronHandler(None, None, None)
+        handler.wfile = MagicMock()
+        handler.headers = {}
+        handler.client_address = CLIENT_ADDRESS
+        handler.path = path
+        handler.request_version = request_version
+        handler.protocol_version = protocol_version
+        handler.do_GET()
+        return handler, b''.join(
+            call[0][0] for call in handler.wfile.write.call_args_list
+        )
+
+    @mock.patch('handlers.neutron.NeutronApi', autospec=True)
+    @mock.patch('handlers.neutron.NeutronHandler.end_headers')
+    @mock.patch('handlers.neutron.NeutronHandler.send_header')
+    @mock.patch('handlers.neutron.NeutronHandler.send_response', autospec=True)
+    @mock.patch('handlers.neutron.validate_token', return_value=True)
+    def test_collection_is_streamed(
+        self,
+        mock_validate_token,
+        mock_send_response,
+        mock_send_header,
+        mock_end_headers,
+        mock_ovn_north,
+    ):
+        handler, body = self._get_collection(
+            '/v2.0/collection', 'HTTP/1.0', 'HTTP/1.0'
+        )
+
+        assert mock_send_response.call_args[0][1] == http_client.OK
+        assert body == json.dumps({'items': COLLECTION}).encode()
+        assert handler.wfile.write.call_count > 1
+        assert handler.close_connection
+        mock_send_header.assert_called_once_with(
+            'Content-Type', 'application/json'
+        )
+
+    @mock.patch('handlers.neutron.NeutronApi', autospec=True)
+    @mock.patch('handlers.neutron.NeutronHandler.end_headers')
+    @mock.patch('handlers.neutron.NeutronHandler.send_header')
+    @mock.patch('handlers.neutron.NeutronHandler.send_response', autospec=True)
+    @mock.patch('handlers.neutron.validate_token', return_value=True)
+    def test_iterated_collection_is_streamed(
+        self,
+        mock_validate_token,
+        mock_send_response,
+        mock_send_header,
+        mock_end_headers,
+        mock_ovn_north,
+    ):
+        handler, body = self._get_collection(
+            '/v2.0/iterated', 'HTTP/1.0', 'HTTP/1.0'
+        )
+
+        assert mock_send_response.call_args[0][1] == http_client.OK
+        assert body == json.dumps({'items': COLLECTION}).encode()
+        assert handler.wfile.write.call_count > 1
+
+    @mock.patch('handlers.neutron.NeutronApi', autospec=True)
+    @mock.patch('handlers.neutron.NeutronHandler.end_headers')
+    @mock.patch('handlers.neutron.NeutronHandler.send_header')
+    @mock.patch('handlers.neutron.NeutronHandler.send_response', autospec=True)
+    @mock.patch('handlers.neutron.validate_token', return_value=True)
+    def test_collection_is_chunked_for_http_1_1(
+        self,
+        mock_validate_token,
+        mock_send_response,
+        mock_send_header,
+        mock_end_headers,
+        mock_ovn_north,
+    ):
+        handler, body = self._get_collection(
+            '/v2.0/collection', 'HTTP/1.1', 'HTTP/1.1'
+        )
+
+        mock_send_header.assert_any_call('Transfer-Encoding', 'chunked')
+        decoded = b''
+        while True:
+            size_line, body = body.split(b'\r\n', 1)
+            size = int(size_line, 16)
+            decoded += body[:size]
+            assert body[size : size + 2] == b'\r\n'
+            body = body[size + 2 :]
+            if not size:
+                break
+        assert body == b''
+        assert decoded == json.dumps({'items': COLLECTION}).encode()
+
+    @mock.patch('handlers.neutron.NeutronApi', autospec=True)
+    @mock.patch('handlers.neutron.NeutronHandler.end_headers')
+    @mock.patch('handlers.neutron.NeutronHandler.send_header')
+    @mock.patch('handlers.neutron.NeutronHandler.send_response', autospec=True)
+    @mock.patch('handlers.neutron.validate_token', return_value=True)
+    def test_small_collection_is_sent_with_its_length(
+        self,
+        mock_validate_token,
+        mock_send_response,
+        mock_send_header,
+        mock_end_headers,
+        mock_ovn_north,
+    ):
+        handler, body = self._get_collection(
+            '/v2.0/collection?id=7', 'HTTP/1.1', 'HTTP/1.1'
+        )
+
+        assert body == json.dumps({'items': [COLLECTION[7]]}).encode()
+        mock_send_header.assert_any_call('Content-Length', str(len(body)))
+        assert 'Transfer-Encoding' not in [
+            call[0][0] for call in mock_send_header.call_args_list
+        ]
+        assert handler.wfile.write.call_count == 1
+
+    def _get_tagged(self, if_none_match=None):
+        handler = NeutronHandler(None, None, None)
+        handler.wfile = MagicMock()
+        handler.headers = {}
+        if if_none_match:
+            handler.headers['If-None-Match'] = if_none_match
+        handler.client_address = CLIENT_ADDRESS
+        handler.path = '/v2.0/tagged'
+        handler.do_GET()
+        return handler
+
+    @mock.patch('handlers.neutron.NeutronApi', autospec=True)
+    @mock.patch('handlers.neutron.NeutronHandler.end_headers')
+    @mock.patch('handlers.neutron.NeutronHandler.send_header')
+    @mock.patch('handlers.neutron.NeutronHandler.send_response', autospec=True)
+    @mock.patch('handlers.neutron.validate_token', return_value=True)
+    def test_response_is_tagged(
+        self,
+        mock_validate_token,
+        mock_send_response,
+        mock_send_header,
+        mock_end_headers,
+        mock_neutron_api,
+    ):
+        neutron_api = mock_neutron_api.instance.return_value
+        neutron_api.change_tag.return_value = 'a1-7'
+        neutron_api.list_networks.return_value = {'id': '1'}
+
+        handler = self._get_tagged(if_none_match='W/"a1-6"')
+
+        neutron_api.change_tag.assert_called_once_with(('Logical_Switch',))
+        assert mock_send_response.call_args[0][1] == http_client.OK
+        mock_send_header.assert_any_call('ETag', 'W/"a1-7"')
+        assert (
+            handler.wfile.write.call_args[0][0] == b'{"tagged": {"id": "1"}}'
+        )
+
+    @mock.patch('handlers.neutron.NeutronApi', autospec=True)
+    @mock.patch('handlers.neutron.NeutronHandler.end_headers')
+    @mock.patch('handlers.neutron.NeutronHandler.send_header')
+    @mock.patch('handlers.neutron.NeutronHandler.send_response', autospec=True)
+    @mock.patch('handlers.neutron.validate_token', return_value=True)
+    def test_matching_tag_is_not_modified(
+        self,
+        mock_validate_token,
+        mock_send_response,
+        mock_send_header,
+        mock_end_headers,
+        mock_neutron_api,
+    ):
+        neutron_api = mock_neutron_api.instance.return_value
+        neutron_api.change_tag.return_value = 'a1-7'
+
+        handler = self._get_tagged(if_none_match='"a1-6", W/"a1-7"')
+
+        assert mock_validate_token.call_count == 1
+        assert mock_send_response.call_args[0][1] == http_client.NOT_MODIFIED
+        mock_send_header.assert_called_once_with('ETag', 'W/"a1-7"')
+        neutron_api.list_networks.assert_not_called()
+        handler.wfile.write.assert_not_called()
+
+    @mock.patch('handlers.neutron.NeutronApi', autospec=True)
+    @mock.patch('handlers.neutron.NeutronHandler.end_headers')
+    @mock.patch('handlers.neutron.NeutronHandler.send_header')
+    @mock.patch('handlers.neutron.NeutronHandler.send_response', autospec=True)
+    @mock.patch('handlers.neutron.validate_token', return_value=True)
+    def test_any_tag_matches_existing_entity(
+        self,
+        mock_validate_token,
+        mock_send_response,
+        mock_send_header,
+        mock_end_headers,
+        mock_neutron_api,
+    ):
+        neutron_api = mock_neutron_api.instance.return_value
+        neutron_api.change_tag.return_value = 'a1-7'
+        neutron_api.list_networks.return_value = {'id': '1'}
+
+        handler = self._get_tagged(if_none_match='*')
+
+        assert mock_send_response.call_args[0][1] == http_client.NOT_MODIFIED
+        mock_send_header.assert_called_once_with('ETag', 'W/"a1-7"')
+        handler.wfile.write.assert_not_called()
+
+    @mock.patch('handlers.neutron.NeutronApi', autospec=True)
+    @mock.patch('handlers.neutron.NeutronHandler.end_headers')
+    @mock.patch('handlers.neutron.NeutronHandler.send_header')
+    @mock.patch('handlers.neutron.NeutronHandler.send_response', autospec=True)
+    @mock.patch('handlers.neutron.validate_token', return_value=True)
+    def test_any_tag_does_not_match_missing_entity(
+        self,
+        mock_validate_token,
+        mock_send_response,
+        mock_send_header,
+        mock_end_headers,
+        mock_neutron_api,
+    ):
+        neutron_api = mock_neutron_api.instance.return_value
+        neutron_api.change_tag.return_value = 'a1-7'
+        neutron_api.list_networks.side_effect = ElementNotFoundError()
+
+        self._get_tagged(if_none_match='*')
+
+        assert mock_send_response.call_args[0][1] == http_client.NOT_FOUND
+
+    @mock.patch('handlers.neutron.NeutronApi', autospec=True)
+    @mock.patch('handlers.neutron.NeutronHandler.end_headers')
+    @mock.patch('handlers.neutron.NeutronHandler.send_header')
+    @mock.patch('handlers.neutron.NeutronHandler.send_response', autospec=True)
+    @mock.patch('handlers.neutron.validate_token', return_value=True)
+    def test_untracked_changes_are_not_tagged(
+        self,
+        mock_validate_token,
+        mock_send_response,
+        mock_send_header,
+        mock_end_headers,
+        mock_neutron_api,
+    ):
+        neutron_api = mock_neutron_api.instance.return_value
+        neutron_api.change_tag.return_value = None
+        neutron_api.list_networks.return_value = {'id': '1'}
+
+        self._get_tagged(if_none_match='*')
+
+        assert mock_send_response.call_args[0][1] == http_client.OK
+        assert 'ETag' not in [
+            call[0][0] for call in mock_send_header.call_args_list
+        ]
+
+
+def _can_acquire(guard):
+    acquired = threading.Event()
+
+    def acquire():
+        with guard:
+            acquired.set()
+
+    thread = threading.Thread(target=acquire)
+    thread.daemon = True
+    thread.start()
+    return acquired.wait(0.2)
+
+
+@mock.patch('handlers.neutron.NeutronHandler._run_server', lambda *args: None)
+@mock.patch('handlers.neutron._write_lock', handlers.neutron.WriteLock())
+class TestRequestGuard(object):
+    def _guard(self, method, path):
+        handler = NeutronHandler(None, None, None)
+        return handler._request_guard(method, path.split('/'))
+
+    @mock.patch('handlers.neutron.group_commit_window', lambda: 0.01)
+    def test_port_creations_run_together_with_group_commit(self):
+        with self._guard('POST', 'ports'):
+            assert _can_acquire(self._guard('POST', 'ports'))
+            assert not _can_acquire(self._guard('PUT', 'ports/1'))
+
+    @mock.patch('handlers.neutron.group_commit_window', lambda: 0)
+    def test_port_creations_are_serialized_without_group_commit(self):
+        with self._guard('POST', 'ports'):
+            assert not _can_acquire(self._guard('POST', 'ports'))
+            assert _can_acquire(self._guard('GET', 'ports'))
+
+    @mock.patch('handlers.neutron.group_commit_window', lambda: 0.01)
+    def test_waiting_modification_holds_off_port_creations(self):
+        with self._guard('POST', 'ports'):
+            assert not _can_acquire(self._guard('DELETE', 'networks/1'))
+            assert not _can_acquire(self._guard('POST', 'ports'))
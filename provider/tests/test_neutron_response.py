@@ -51,6 +51,7 @@ from handlers.neutron_responses import SUBNETS
 from handlers.neutron_responses import EXTENSIONS
 from handlers.neutron_responses import EXTENSION_ENTITY
 
+from handlers.selecting_handler import QUERY_PARAMETERS
 from handlers.selecting_handler import SelectingHandler
 
 from neutron.neutron_api_mappers import NetworkMapper
@@ -214,7 +215,7 @@ class TestNeutronResponse(object):
         handler, params = SelectingHandler.get_response_handler(
             responses(), GET, NETWORKS.split('/')
         )
-        response = handler(nb_db, NOT_RELEVANT, NOT_RELEVANT)
+        response = handler(nb_db, NOT_RELEVANT, params)
 
         response_json = response.body
         assert response_json['networks'][0]['id'] == str(NETWORK_ID01)
@@ -233,13 +234,29 @@ class TestNeutronResponse(object):
             responses(), GET, PORTS.split('/')
         )
 
-        response = handler(nb_db, NOT_RELEVANT, NOT_RELEVANT)
+        response = handler(nb_db, NOT_RELEVANT, params)
 
         response_json = response.body
         assert response_json['ports'][0]['id'] == str(PORT_ID07)
         assert response_json['ports'][0]['name'] == 'port_name'
         assert response_json['ports'][0]['security_groups'] == []
 
+    def test_get_ports_passes_the_query_filters(self):
+        nb_db = Mock()
+        nb_db.list_ports.return_value = []
+        handler, params = SelectingHandler.get_response_handler(
+            responses(), GET, PORTS.split('/')
+        )
+        params[QUERY_PARAMETERS] = {
+            'network_id': [str(NETWORK_ID01)],
+        }
+
+        handler(nb_db, NOT_RELEVANT, params)
+
+        nb_db.list_ports.assert_called_once_with(
+            filters={'network_id': str(NETWORK_ID01)}
+        )
+
     def test_delete_network(self):
         nb_db = Mock()
 
@@ -405,6 +422,20 @@ class TestNeutronResponse(object):
         )
         assert response_json['extensions'][0]['links'] == []
 
+    @mock.patch(
+        'handlers.neutron_responses.tls_handshake_summaries',
+        lambda: {'port 9696': {'handshakes': 1}},
+    )
+    def test_get_tls_handshakes(self):
+        handler, params = SelectingHandler.get_response_handler(
+            responses(), GET, ['tech', 'tls']
+        )
+        response = handler(NOT_RELEVANT, NOT_RELEVANT, NOT_RELEVANT)
+
+        assert response.body == {
+            'tls_handshakes': {'port 9696': {'handshakes': 1}}
+        }
+
     @mock.patch('ovsdbapp.backend.ovs_idl.connection', autospec=False)
     def test_get_valid_extension(self, mock_connection):
         nb_db = NeutronApi()
@@ -430,3 +461,102 @@ class TestNeutronResponse(object):
         )
         with pytest.raises(ElementNotFoundError):
             handler(nb_db, NOT_RELEVANT, {ALIAS: 'invalid'})
+
+
+@mock.patch(
+    'handlers.neutron_responses.neutron_url_with_version',
+    lambda: 'http://provider:9696/v2.0/',
+)
+class TestPagination(object):
+    NETWORKS = [
+        {'id': network_id, 'name': 'net' + network_id}
+        for network_id in ('d', 'b', 'e', 'a', 'c')
+    ]
+
+    def _get_networks(self, query, iter_networks=None):
+        nb_db = Mock()
+        nb_db.list_networks.return_value = self.NETWORKS
+        nb_db.iter_networks.side_effect = iter_networks or (
+            lambda marker, reverse: None
+        )
+        handler, params = SelectingHandler.get_response_handler(
+            responses(), GET, NETWORKS.split('/')
+        )
+        params[QUERY_PARAMETERS] = {
+            key: [value] for key, value in query.items()
+        }
+        return handler(nb_db, NOT_RELEVANT, params).body
+
+    @staticmethod
+    def _ids(body):
+        return [network['id'] for network in body['networks']]
+
+    @staticmethod
+    def _links(body):
+        return {
+            link['rel']: link['href']
+            for link in body.get('networks_links', [])
+        }
+
+    def test_first_page(self):
+        body = self._get_networks({'limit': '2'})
+        assert self._ids(body) == ['a', 'b']
+        assert self._links(body) == {
+            'next': 'http://provider:9696/v2.0/networks?limit=2&marker=b'
+        }
+
+    def test_middle_page(self):
+        body = self._get_networks({'limit': '2', 'marker': 'b'})
+        assert self._ids(body) == ['c', 'd']
+        assert self._links(body) == {
+            'next': 'http://provider:9696/v2.0/networks?limit=2&marker=d',
+            'previous': (
+                'http://provider:9696/v2.0/networks'
+                '?limit=2&marker=c&page_reverse=True'
+            ),
+        }
+
+    def test_last_page(self):
+        body = self._get_networks({'limit': '2', 'marker': 'd'})
+        assert self._ids(body) == ['e']
+        assert list(self._links(body)) == ['previous']
+
+    def test_reverse_page(self):
+        body = self._get_networks(
+            {'limit': '2', 'marker': 'd', 'page_reverse': 'True'}
+        )
+        assert self._ids(body) == ['b', 'c']
+        assert self._links(body) == {
+            'next': 'http://provider:9696/v2.0/networks?limit=2&marker=c',
+            'previous': (
+                'http://provider:9696/v2.0/networks'
+                '?limit=2&marker=b&page_reverse=True'
+            ),
+        }
+
+    def test_filters_apply_before_the_limit(self):
+        body = self._get_networks({'limit': '1', 'name': 'netc'})
+        assert self._ids(body) == ['c']
+        assert self._links(body) == {}
+
+    def test_whole_collection_without_pagination(self):
+        body = self._get_networks({'name': 'netc'})
+        assert body == {'networks': self.NETWORKS}
+
+    def test_indexed_collection_is_read_up_to_the_page(self):
+        read = []
+
+        def iter_networks(marker, reverse):
+            for network in sorted(self.NETWORKS, key=lambda n: n['id']):
+                if network['id'] > marker:
+                    read.append(network['id'])
+                    yield network
+
+        body = self._get_networks({'limit': '1', 'marker': 'a'}, iter_networks)
+        assert self._ids(body) == ['b']
+        assert read == ['b', 'c']
+
+    @pytest.mark.parametrize('limit', ['-1', 'ten'])
+    def test_invalid_limit(self, limit):
+        with pytest.raises(BadRequestError):
+            self._get_networks({'limit': limit})
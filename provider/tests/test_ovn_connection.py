@@ -0,0 +1,74 @@
+# Copyright 2026 Red Hat, Inc.
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA
+#
+# Refer to the README and COPYING files for full details of the license
+from __future__ import absolute_import
+
+import copy
+
+from ovs.db.idl import SchemaHelper
+
+import constants as ovnconst
+from ovn_connection import register_nb_tables
+
+from ovntestlib import NB_SCHEMA
+
+
+def _server_schema():
+    schema = copy.deepcopy(NB_SCHEMA)
+    schema['tables']['Load_Balancer'] = {
+        'columns': {'name': {'type': 'string'}},
+        'isRoot': True,
+    }
+    schema['tables'][ovnconst.TABLE_LS]['columns']['load_balancer'] = {
+        'type': {
+            'key': {
+                'type': 'uuid',
+                'refTable': 'Load_Balancer',
+                'refType': 'weak',
+            },
+            'min': 0,
+            'max': 'unlimited',
+        }
+    }
+    return schema
+
+
+def _registered_schema(server_schema):
+    helper = SchemaHelper(schema_json=server_schema)
+    register_nb_tables(helper)
+    return helper.get_idl_schema()
+
+
+class TestRegisterNbTables(object):
+    def test_only_provider_tables_are_registered(self):
+        schema = _registered_schema(_server_schema())
+        assert set(schema.tables) == set(NB_SCHEMA['tables'])
+
+    def test_references_to_other_tables_are_left_out(self):
+        schema = _registered_schema(_server_schema())
+        ls_columns = schema.tables[ovnconst.TABLE_LS].columns
+        assert 'load_balancer' not in ls_columns
+        assert {'name', 'ports', 'other_config', 'external_ids'} <= set(
+            ls_columns
+        )
+
+    def test_tables_missing_from_the_server_schema(self):
+        server_schema = _server_schema()
+        del server_schema['tables'][ovnconst.TABLE_PORT_GROUP]
+        schema = _registered_schema(server_schema)
+        assert ovnconst.TABLE_PORT_GROUP not in schema.tables
+        assert ovnconst.TABLE_ACL in schema.tables
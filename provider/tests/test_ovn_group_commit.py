@@ -0,0 +1,212 @@
+# Copyright 2026 Red Hat, Inc.
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA
+#
+# Refer to the README and COPYING files for full details of the license
+from __future__ import absolute_import
+
+import threading
+import time
+
+from ovsdbapp.backend.ovs_idl.idlutils import ExceptionResult
+from ovsdbapp.backend.ovs_idl.transaction import Transaction
+from ovsdbapp.exceptions import TimeoutException
+import pytest
+
+from ovndb.group_commit import GroupCommitter
+
+WINDOW = 0.05
+
+
+class FakeCommand(object):
+    def __init__(self, value, fails=False):
+        self.value = value
+        self.fails = fails
+        self.result = None
+
+
+class FakeConnection(object):
+    """
+    Commits the queued transactions right away: a transaction with a
+    failing command is rejected as a whole.
+    """
+
+    timeout = 5
+
+    def __init__(self, error=None):
+        self.committed = []
+        self.error = error
+
+    def queue_txn(self, txn):
+        self.committed.append([command.value for command in txn.commands])
+        error = self.error or next(
+            (
+                RuntimeError('{} failed'.format(command.value))
+                for command in txn.commands
+                if command.fails
+            ),
+            None,
+        )
+        if error:
+            txn.results.put(ExceptionResult(error, None))
+            return
+        for command in txn.commands:
+            command.result = command.value
+        txn.results.put([command.result for command in txn.commands])
+
+
+class FakeApi(object):
+    def __init__(self, connection):
+        self.ovsdb_connection = connection
+
+
+def _transaction(api, *commands):
+    tx = Transaction(
+        api, api.ovsdb_connection, check_error=True, log_errors=False
+    )
+    tx.extend(commands)
+    return tx
+
+
+def _commit_concurrently(committer, transactions):
+    results = [None] * len(transactions)
+
+    def commit(i, tx):
+        try:
+            results[i] = committer.commit(tx)
+        except Exception as e:
+            results[i] = e
+
+    threads = [
+        threading.Thread(target=commit, args=(i, tx))
+        for i, tx in enumerate(transactions)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+
+def test_concurrent_transactions_are_committed_together():
+    api = FakeApi(FakeConnection())
+    committer = GroupCommitter(api, WINDOW)
+    transactions = [
+        _transaction(api, FakeCommand('a1'), FakeCommand('a2')),
+        _transaction(api, FakeCommand('b1')),
+        _transaction(api, FakeCommand('c1')),
+    ]
+
+    results = _commit_concurrently(committer, transactions)
+
+    assert results == [['a1', 'a2'], ['b1'], ['c1']]
+    assert len(api.ovsdb_connection.committed) == 1
+    assert sorted(api.ovsdb_connection.committed[0]) == [
+        'a1',
+        'a2',
+        'b1',
+        'c1',
+    ]
+
+
+def test_rejected_group_is_committed_one_by_one():
+    api = FakeApi(FakeConnection())
+    committer = GroupCommitter(api, WINDOW)
+    transactions = [
+        _transaction(api, FakeCommand('a')),
+        _transaction(api, FakeCommand('b', fails=True)),
+        _transaction(api, FakeCommand('c')),
+    ]
+
+    results = _commit_concurrently(committer, transactions)
+
+    assert results[0] == ['a']
+    assert isinstance(results[1], RuntimeError)
+    assert str(results[1]) == 'b failed'
+    assert results[2] == ['c']
+    assert len(api.ovsdb_connection.committed) == 4
+
+
+def test_timed_out_group_is_not_committed_again():
+    error = TimeoutException(commands=[], timeout=5, cause='test')
+    api = FakeApi(FakeConnection(error))
+    committer = GroupCommitter(api, WINDOW)
+    transactions = [
+        _transaction(api, FakeCommand('a')),
+        _transaction(api, FakeCommand('b')),
+    ]
+
+    results = _commit_concurrently(committer, transactions)
+
+    assert results == [error, error]
+    assert len(api.ovsdb_connection.committed) == 1
+
+
+def test_single_transaction_is_committed_alone():
+    api = FakeApi(FakeConnection())
+    committer = GroupCommitter(api, 0)
+    with pytest.raises(RuntimeError, match='a failed'):
+        committer.commit(_transaction(api, FakeCommand('a', fails=True)))
+    assert committer.commit(_transaction(api, FakeCommand('b'))) == ['b']
+
+
+def test_members_get_the_error_of_a_failed_leader():
+    api = FakeApi(FakeConnection())
+    committer = GroupCommitter(api, WINDOW)
+    error = RuntimeError('leader failed')
+
+    def commit_group(group):
+        raise error
+
+    committer._commit_group = commit_group
+    transactions = [
+        _transaction(api, FakeCommand('a')),
+        _transaction(api, FakeCommand('b')),
+    ]
+
+    results = _commit_concurrently(committer, transactions)
+
+    assert results == [error, error]
+    assert committer._group is None
+
+
+def test_wait_for_the_group_is_bounded():
+    connection = FakeConnection()
+    connection.timeout = 0.1
+    api = FakeApi(connection)
+    committer = GroupCommitter(api, WINDOW)
+    release = threading.Event()
+
+    def commit_group(group):
+        release.wait(5)
+        for member in group:
+            member.commit()
+
+    committer._commit_group = commit_group
+    transactions = [
+        _transaction(api, FakeCommand('a')),
+        _transaction(api, FakeCommand('b')),
+    ]
+    leader = threading.Thread(target=committer.commit, args=(transactions[0],))
+    leader.start()
+    while committer._group is None:
+        time.sleep(0.001)
+    try:
+        with pytest.raises(TimeoutException):
+            committer.commit(transactions[1])
+    finally:
+        release.set()
+        leader.join()
+    assert connection.committed == [['a']]
@@ -0,0 +1,736 @@
+# Copyright 2026 Red Hat, Inc.
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA
+#
+# Refer to the README and COPYING files for full details of the license
+from __future__ import absolute_import
+
+import unittest.mock as mock
+
+import pytest
+
+import constants as ovnconst
+from neutron.neutron_api_mappers import PortMapper
+from neutron.neutron_api_mappers import RouterMapper
+from neutron.neutron_api_mappers import SecurityGroupMapper
+from neutron.neutron_api_mappers import SecurityGroupRuleMapper
+from neutron.neutron_api_mappers import SubnetMapper
+from ovndb.nb_index import create_nb_index
+from ovndb.ovn_north import OvnNorth
+
+from ovntestlib import NbReplica
+from ovntestlib import NbReplicaApi
+from ovntestlib import replica_neutron_api
+
+
+@pytest.fixture
+def replica():
+    return NbReplica()
+
+
+@pytest.fixture
+def nb_index(replica):
+    return create_nb_index(replica)
+
+
+def _add_switch_with_port(replica):
+    lsp = replica.insert(ovnconst.TABLE_LSP, name='port')
+    ls = replica.insert(ovnconst.TABLE_LS, name='network', ports=[lsp])
+    return ls, lsp
+
+
+class TestPortSwitchIndex(object):
+    def test_rows_present_at_creation_are_indexed(self, replica):
+        ls, lsp = _add_switch_with_port(replica)
+        nb_index = create_nb_index(replica)
+        assert nb_index.get_port_switch(lsp.uuid).uuid == ls.uuid
+
+    def test_port_added_to_switch(self, replica, nb_index):
+        ls = replica.insert(ovnconst.TABLE_LS, name='network')
+        lsp = replica.insert(ovnconst.TABLE_LSP, name='port')
+        assert nb_index.get_port_switch(lsp.uuid) is None
+        replica.update(ls, ports=[lsp])
+        assert nb_index.get_port_switch(lsp.uuid).uuid == ls.uuid
+
+    def test_port_removed_from_switch(self, replica, nb_index):
+        ls, lsp = _add_switch_with_port(replica)
+        replica.update(ls, ports=[])
+        assert nb_index.get_port_switch(lsp.uuid) is None
+
+    def test_switch_deleted(self, replica, nb_index):
+        ls, lsp = _add_switch_with_port(replica)
+        replica.delete(ls)
+        assert nb_index.get_port_switch(lsp.uuid) is None
+
+    def test_replica_reloaded(self, replica, nb_index):
+        ls, lsp = _add_switch_with_port(replica)
+        replica.clear()
+        assert nb_index.get_port_switch(lsp.uuid) is None
+        replica.tables[ovnconst.TABLE_LS].rows[ls.uuid] = ls
+        assert nb_index.get_port_switch(lsp.uuid).uuid == ls.uuid
+
+    def test_lookup_by_port_id_string(self, replica, nb_index):
+        ls, lsp = _add_switch_with_port(replica)
+        assert nb_index.get_port_switch(str(lsp.uuid)).uuid == ls.uuid
+        assert nb_index.get_port_switch('port') is None
+
+    def test_no_index_without_custom_index_support(self):
+        assert create_nb_index(mock.MagicMock()) is None
+
+
+class TestOvnNorthWithPortSwitchIndex(object):
+    def test_get_ls_by_lsp(self, replica, nb_index):
+        ls, lsp = _add_switch_with_port(replica)
+        ovn_north = OvnNorth(mock.MagicMock(), nb_index)
+        assert ovn_north.get_ls(lsp=lsp).uuid == ls.uuid
+
+    def test_get_dhcp_by_lsp_id(self, replica, nb_index):
+        ls, lsp = _add_switch_with_port(replica)
+        dhcp = _add_dhcp(replica, ls)
+        ovn_north = OvnNorth(mock.MagicMock(), nb_index)
+        assert ovn_north.get_dhcp(lsp_id=str(lsp.uuid)).uuid == dhcp.uuid
+        assert ovn_north.get_dhcp(lsp_id=lsp.uuid).uuid == dhcp.uuid
+
+
+def _add_dhcp(replica, ls):
+    return replica.insert(
+        ovnconst.TABLE_DHCP_Options,
+        cidr='10.0.0.0/24',
+        external_ids={SubnetMapper.OVN_NETWORK_ID: str(ls.uuid)},
+    )
+
+
+class TestDhcpByNetworkIndex(object):
+    def test_network_dhcps(self, replica, nb_index):
+        ls = replica.insert(ovnconst.TABLE_LS, name='network')
+        dhcp = _add_dhcp(replica, ls)
+        replica.insert(ovnconst.TABLE_DHCP_Options, cidr='10.0.1.0/24')
+        assert [d.uuid for d in nb_index.get_network_dhcps(ls.uuid)] == [
+            dhcp.uuid
+        ]
+
+    def test_dhcp_moved_to_other_network(self, replica, nb_index):
+        ls = replica.insert(ovnconst.TABLE_LS, name='network')
+        other_ls = replica.insert(ovnconst.TABLE_LS, name='other')
+        dhcp = _add_dhcp(replica, ls)
+        replica.update(
+            dhcp,
+            external_ids={SubnetMapper.OVN_NETWORK_ID: str(other_ls.uuid)},
+        )
+        assert nb_index.get_network_dhcps(ls.uuid) == []
+        assert [d.uuid for d in nb_index.get_network_dhcps(other_ls.uuid)] == [
+            dhcp.uuid
+        ]
+
+    def test_dhcp_deleted(self, replica, nb_index):
+        ls = replica.insert(ovnconst.TABLE_LS, name='network')
+        dhcp = _add_dhcp(replica, ls)
+        replica.delete(dhcp)
+        assert nb_index.get_network_dhcps(ls.uuid) == []
+
+    def test_ovn_north_lookups(self, replica, nb_index):
+        ls = replica.insert(ovnconst.TABLE_LS, name='network')
+        dhcp = _add_dhcp(replica, ls)
+        ovn_north = OvnNorth(mock.MagicMock(), nb_index)
+        with mock.patch.object(OvnNorth, 'list_dhcp') as list_dhcp:
+            assert ovn_north.get_dhcp(ls_id=ls.uuid).uuid == dhcp.uuid
+            assert ovn_north.get_dhcp(ls_id=str(ls.uuid)).uuid == dhcp.uuid
+            assert list_dhcp.call_count == 0
+        with mock.patch.object(OvnNorth, 'list_ls') as list_ls:
+            assert ovn_north.get_ls(dhcp=dhcp).uuid == ls.uuid
+            assert list_ls.call_count == 0
+        replica.delete(ls)
+        assert ovn_north.get_ls(dhcp=dhcp) is None
+
+
+class TestListPorts(object):
+    def test_ports_are_joined_with_subnets_and_router_ports(
+        self, replica, nb_index
+    ):
+        ls = replica.insert(ovnconst.TABLE_LS, name='network')
+        dhcp = _add_dhcp(replica, ls)
+        replica.insert(
+            ovnconst.TABLE_LRP,
+            name='lrp1',
+            mac='00:00:00:00:00:01',
+            networks=['10.0.0.1/24'],
+        )
+        vm_port = replica.insert(
+            ovnconst.TABLE_LSP,
+            name='vm_port',
+            addresses=['00:00:00:00:00:02 10.0.0.2'],
+            external_ids={PortMapper.OVN_NIC_NAME: 'nic0'},
+        )
+        router_port = replica.insert(
+            ovnconst.TABLE_LSP,
+            name='router_port',
+            type=ovnconst.LSP_TYPE_ROUTER,
+            addresses=[ovnconst.LSP_ADDRESS_TYPE_ROUTER],
+            options={ovnconst.LSP_OPTION_ROUTER_PORT: 'lrp1'},
+            external_ids={PortMapper.OVN_NIC_NAME: 'nic1'},
+        )
+        other_port = replica.insert(ovnconst.TABLE_LSP, name='not_ovirt')
+        replica.update(ls, ports=[vm_port, router_port, other_port])
+
+        ports = list(replica_neutron_api(replica, nb_index).list_ports())
+
+        assert {port['id']: port['fixed_ips'] for port in ports} == {
+            'vm_port': [
+                {'ip_address': '10.0.0.2', 'subnet_id': str(dhcp.uuid)}
+            ],
+            'router_port': [
+                {'ip_address': '10.0.0.1', 'subnet_id': str(dhcp.uuid)}
+            ],
+        }
+        assert all(port['network_id'] == str(ls.uuid) for port in ports)
+
+    @pytest.mark.parametrize(
+        'filters,expected',
+        [
+            ({'id': 'port1-0'}, ['port1-0']),
+            ({'id': 'port1-0', 'network_id': 'net0'}, []),
+            ({'id': 'missing'}, []),
+            ({'network_id': 'net1'}, ['port1-0', 'port1-1']),
+            ({'network_id': 'missing'}, []),
+            ({'name': 'nic1'}, ['port0-1', 'port1-1']),
+            ({'mac_address': '00:00:00:00:01:01'}, ['port1-1']),
+            ({'device_id': 'vm1', 'name': 'nic0'}, ['port1-0']),
+            (
+                {'status': 'ACTIVE'},
+                ['port0-0', 'port0-1', 'port1-0', 'port1-1'],
+            ),
+        ],
+    )
+    def test_filters_on_lsp_and_ls_fields(
+        self, replica, nb_index, filters, expected
+    ):
+        # the ovsdbapp name indexes only follow rows added after creation
+        neutron_api = replica_neutron_api(replica, nb_index)
+        networks = {}
+        for network in range(2):
+            ls = replica.insert(
+                ovnconst.TABLE_LS, name='net{}'.format(network)
+            )
+            networks[ls.name] = str(ls.uuid)
+            replica.update(
+                ls,
+                ports=[
+                    replica.insert(
+                        ovnconst.TABLE_LSP,
+                        name='port{}-{}'.format(network, port),
+                        addresses=[
+                            '00:00:00:00:{:02x}:{:02x}'.format(network, port)
+                        ],
+                        external_ids={
+                            PortMapper.OVN_NIC_NAME: 'nic{}'.format(port),
+                            PortMapper.OVN_DEVICE_ID: 'vm{}'.format(network),
+                        },
+                    )
+                    for port in range(2)
+                ],
+            )
+        filters = {
+            field: networks.get(value, value)
+            for field, value in filters.items()
+        }
+
+        ports = list(neutron_api.list_ports(filters))
+
+        assert sorted(port['id'] for port in ports) == expected
+
+
+def _add_rule(replica, sec_group, action='allow', remote_group=None):
+    external_ids = {
+        SecurityGroupRuleMapper.OVN_SEC_GROUP_RULE_SEC_GROUP_ID: str(
+            sec_group.uuid
+        )
+    }
+    if remote_group:
+        external_ids[
+            SecurityGroupRuleMapper.OVN_SEC_GROUP_RULE_REMOTE_GROUP_ID
+        ] = str(remote_group.uuid)
+    return replica.insert(
+        ovnconst.TABLE_ACL,
+        priority=1001,
+        direction='to-lport',
+        match='ip4',
+        action=action,
+        external_ids=external_ids,
+    )
+
+
+class TestSecurityGroupAclsIndex(object):
+    def test_acls_by_group_uuid_and_name(self, replica, nb_index):
+        sec_group = replica.insert(ovnconst.TABLE_PORT_GROUP, name='pg')
+        other_group = replica.insert(ovnconst.TABLE_PORT_GROUP, name='other')
+        by_uuid = _add_rule(replica, sec_group)
+        by_name = replica.insert(
+            ovnconst.TABLE_ACL,
+            external_ids={
+                SecurityGroupRuleMapper.OVN_SEC_GROUP_RULE_SEC_GROUP_ID: 'pg'
+            },
+        )
+        _add_rule(replica, other_group)
+        assert {
+            acl.uuid for acl in nb_index.get_security_group_acls(sec_group)
+        } == {by_uuid.uuid, by_name.uuid}
+
+    def test_deleted_acl(self, replica, nb_index):
+        sec_group = replica.insert(ovnconst.TABLE_PORT_GROUP, name='pg')
+        acl = _add_rule(replica, sec_group)
+        replica.delete(acl)
+        assert nb_index.get_security_group_acls(sec_group) == []
+
+    def test_list_security_groups_looks_up_remote_groups_once(
+        self, replica, nb_index
+    ):
+        remote_group = replica.insert(ovnconst.TABLE_PORT_GROUP, name='remote')
+        sec_group = replica.insert(ovnconst.TABLE_PORT_GROUP, name='pg')
+        _add_rule(replica, sec_group, remote_group=remote_group)
+        _add_rule(replica, sec_group, remote_group=remote_group)
+        _add_rule(replica, sec_group, action='drop')
+        neutron_api = replica_neutron_api(replica, nb_index)
+
+        with mock.patch.object(
+            neutron_api.ovn_north,
+            'get_security_group',
+            wraps=neutron_api.ovn_north.get_security_group,
+        ) as get_security_group:
+            security_groups = {
+                group.sec_group.name: group
+                for group in neutron_api._list_security_groups()
+            }
+
+        assert get_security_group.call_count == 1
+        assert security_groups['remote'].sec_group_rules == []
+        rules = security_groups['pg'].sec_group_rules
+        assert len(rules) == 2
+        assert all(
+            rule.remote_group.uuid == remote_group.uuid for rule in rules
+        )
+
+
+class TestPortGroupIndex(object):
+    def test_port_groups_of_port(self, replica, nb_index):
+        ls, lsp = _add_switch_with_port(replica)
+        other_lsp = replica.insert(ovnconst.TABLE_LSP, name='other')
+        sec_group = replica.insert(
+            ovnconst.TABLE_PORT_GROUP, name='pg', ports=[lsp, other_lsp]
+        )
+        replica.insert(
+            ovnconst.TABLE_PORT_GROUP, name='other', ports=[other_lsp]
+        )
+        assert [pg.uuid for pg in nb_index.get_port_groups(lsp.uuid)] == [
+            sec_group.uuid
+        ]
+
+    def test_port_removed_from_group(self, replica, nb_index):
+        ls, lsp = _add_switch_with_port(replica)
+        other_lsp = replica.insert(ovnconst.TABLE_LSP, name='other')
+        sec_group = replica.insert(
+            ovnconst.TABLE_PORT_GROUP, name='pg', ports=[lsp, other_lsp]
+        )
+        replica.update(sec_group, ports=[other_lsp])
+        assert nb_index.get_port_groups(lsp.uuid) == []
+        assert [
+            pg.uuid for pg in nb_index.get_port_groups(other_lsp.uuid)
+        ] == [sec_group.uuid]
+
+    def test_deleted_group(self, replica, nb_index):
+        ls, lsp = _add_switch_with_port(replica)
+        sec_group = replica.insert(
+            ovnconst.TABLE_PORT_GROUP, name='pg', ports=[lsp]
+        )
+        other_group = replica.insert(
+            ovnconst.TABLE_PORT_GROUP, name='other', ports=[lsp]
+        )
+        replica.delete(sec_group)
+        replica.update(other_group, name='renamed')
+        assert [pg.uuid for pg in nb_index.get_port_groups(lsp.uuid)] == [
+            other_group.uuid
+        ]
+        replica.delete(other_group)
+        assert nb_index.get_port_groups(lsp.uuid) == []
+
+    def test_update_reindexes_changed_ports_only(self, replica, nb_index):
+        lsps = [
+            replica.insert(ovnconst.TABLE_LSP, name=str(i)) for i in range(3)
+        ]
+        sec_group = replica.insert(
+            ovnconst.TABLE_PORT_GROUP, name='pg', ports=lsps[:2]
+        )
+        index = nb_index._port_groups_by_port
+        with mock.patch.object(
+            index, '_discard', wraps=index._discard
+        ) as discard:
+            replica.update(sec_group, ports=lsps[1:])
+        discard.assert_called_once_with(lsps[0].uuid, sec_group.uuid)
+        assert nb_index.get_port_groups(lsps[0].uuid) == []
+        assert len(nb_index.get_port_groups(lsps[2].uuid)) == 1
+
+    def test_ovn_north_skips_drop_all_group(self, replica, nb_index):
+        ls, lsp = _add_switch_with_port(replica)
+        sec_group = replica.insert(
+            ovnconst.TABLE_PORT_GROUP, name='pg', ports=[lsp]
+        )
+        replica.insert(
+            ovnconst.TABLE_PORT_GROUP,
+            name=SecurityGroupMapper.DROP_ALL_IP_PG_NAME,
+            ports=[lsp],
+        )
+        ovn_north = OvnNorth(mock.MagicMock(), nb_index)
+        assert [
+            pg.uuid for pg in ovn_north.list_port_security_groups(lsp.uuid)
+        ] == [sec_group.uuid]
+
+
+class TestRouters(object):
+    def _router_with_gateway(self, replica):
+        ls = replica.insert(ovnconst.TABLE_LS, name='external')
+        dhcp = _add_dhcp(replica, ls)
+        lrp = replica.insert(
+            ovnconst.TABLE_LRP,
+            name='lrp-gw',
+            mac='00:00:00:00:00:01',
+            networks=['10.0.0.1/24'],
+        )
+        lsp = replica.insert(
+            ovnconst.TABLE_LSP,
+            name='gw',
+            options={ovnconst.LSP_OPTION_ROUTER_PORT: 'lrp-gw'},
+        )
+        replica.update(ls, ports=[lsp])
+        lr = replica.insert(
+            ovnconst.TABLE_LR,
+            name='router',
+            ports=[lrp],
+            external_ids={RouterMapper.OVN_ROUTER_GATEWAY_PORT: str(lsp.uuid)},
+        )
+        return lr, lrp, ls, dhcp
+
+    def test_list_routers(self, replica, nb_index):
+        neutron_api = replica_neutron_api(replica, nb_index)
+        lr, lrp, ls, dhcp = self._router_with_gateway(replica)
+        replica.insert(ovnconst.TABLE_LR, name='isolated')
+
+        with mock.patch.object(
+            OvnNorth, 'list_ls'
+        ) as list_ls, mock.patch.object(OvnNorth, 'list_dhcp') as list_dhcp:
+            routers = {
+                router[RouterMapper.REST_ROUTER_NAME]: router
+                for router in neutron_api.list_routers()
+            }
+
+        assert list_ls.call_count == 0
+        assert list_dhcp.call_count == 0
+        assert routers['router'][
+            RouterMapper.REST_ROUTER_EXTERNAL_GATEWAY_INFO
+        ] == {
+            RouterMapper.REST_ROUTER_NETWORK_ID: str(ls.uuid),
+            RouterMapper.REST_ROUTER_ENABLE_SNAT: False,
+            RouterMapper.REST_ROUTER_FIXED_IPS: [
+                {
+                    RouterMapper.REST_ROUTER_SUBNET_ID: str(dhcp.uuid),
+                    RouterMapper.REST_ROUTER_IP_ADDRESS: '10.0.0.1',
+                }
+            ],
+        }
+        assert (
+            routers['isolated'][RouterMapper.REST_ROUTER_EXTERNAL_GATEWAY_INFO]
+            is None
+        )
+
+    def test_router_ports(self, replica, nb_index):
+        lr, lrp, ls, dhcp = self._router_with_gateway(replica)
+        replica.insert(
+            ovnconst.TABLE_LRP, name='other', mac='00:00:00:00:00:02'
+        )
+        ovn_north = OvnNorth(NbReplicaApi(replica), nb_index)
+        with mock.patch.object(OvnNorth, 'list_lrp_rows') as list_lrp_rows:
+            lrps = ovn_north.list_lrp(router_id=str(lr.uuid))
+        assert list_lrp_rows.call_count == 0
+        assert [router_port.uuid for router_port in lrps] == [lrp.uuid]
+
+    def test_lrp_by_subnet(self, replica, nb_index):
+        lr, lrp, ls, dhcp = self._router_with_gateway(replica)
+        replica.update(
+            dhcp,
+            external_ids={
+                SubnetMapper.OVN_NETWORK_ID: str(ls.uuid),
+                SubnetMapper.OVN_GATEWAY: '10.0.0.1',
+            },
+        )
+        ovn_north = OvnNorth(NbReplicaApi(replica), nb_index)
+        with mock.patch.object(OvnNorth, 'list_lrp') as list_lrp:
+            assert ovn_north.get_lrp_by_subnet(dhcp).uuid == lrp.uuid
+        assert list_lrp.call_count == 0
+        replica.update(
+            dhcp,
+            external_ids={
+                SubnetMapper.OVN_NETWORK_ID: str(ls.uuid),
+                SubnetMapper.OVN_GATEWAY: '10.0.0.1',
+                SubnetMapper.OVN_GATEWAY_ROUTER_ID: str(lr.uuid),
+            },
+        )
+        assert ovn_north.get_lrp_by_subnet(dhcp).uuid == lrp.uuid
+
+
+class TestMacIndex(object):
+    MAC = '00:00:00:00:00:0A'
+
+    def test_switch_and_router_port_macs(self, replica, nb_index):
+        lsp = replica.insert(
+            ovnconst.TABLE_LSP, addresses=[self.MAC + ' 10.0.0.2']
+        )
+        lrp = replica.insert(ovnconst.TABLE_LRP, mac='00:00:00:00:00:0b')
+        assert nb_index.is_mac_used(self.MAC.lower())
+        assert nb_index.is_mac_used('00:00:00:00:00:0B')
+        replica.delete(lsp)
+        replica.update(lrp, mac='00:00:00:00:00:0c')
+        assert not nb_index.is_mac_used(self.MAC)
+        assert not nb_index.is_mac_used('00:00:00:00:00:0b')
+
+    def test_reserved_mac_is_used_until_released(self, nb_index):
+        with nb_index.reserved_mac() as mac:
+            assert nb_index.is_mac_used(mac)
+        assert not nb_index.is_mac_used(mac)
+
+    def test_reserved_mac_is_not_taken(self, nb_index):
+        macs = iter([self.MAC.lower(), self.MAC.lower(), '02:00:00:00:00:01'])
+        with mock.patch('neutron.ip._random_mac', lambda: next(macs)):
+            with nb_index.reserved_mac() as first:
+                with nb_index.reserved_mac() as second:
+                    assert first == self.MAC.lower()
+                    assert second == '02:00:00:00:00:01'
+
+    def test_ovn_north_reserves_mac_from_index(self, replica, nb_index):
+        ovn_north = OvnNorth(mock.MagicMock(), nb_index)
+        with mock.patch.object(ovn_north, 'list_lsp') as list_lsp:
+            with ovn_north.reserved_mac() as mac:
+                assert nb_index.is_mac_used(mac)
+        list_lsp.assert_not_called()
+
+
+class TestIpIndex(object):
+    def _network(self, replica, *addresses, **other_config):
+        lsps = [
+            replica.insert(ovnconst.TABLE_LSP, addresses=[address])
+            for address in addresses
+        ]
+        return replica.insert(
+            ovnconst.TABLE_LS, ports=lsps, other_config=other_config
+        )
+
+    def test_port_ips_of_the_network_are_taken(self, replica, nb_index):
+        ls = self._network(replica, '00:00:00:00:00:01 10.0.0.2')
+        other_ls = self._network(replica)
+        assert not nb_index.is_ip_available(ls.uuid, '10.0.0.2')
+        assert nb_index.is_ip_available(other_ls.uuid, '10.0.0.2')
+        assert nb_index.is_ip_available(ls.uuid, '10.0.0.3')
+
+    def test_dynamic_ip(self, replica, nb_index):
+        ls = self._network(replica, '00:00:00:00:00:01 dynamic')
+        lsp = ls.ports[0]
+        assert nb_index.is_ip_available(ls.uuid, '10.0.0.2')
+        replica.update(lsp, dynamic_addresses=['00:00:00:00:00:01 10.0.0.2'])
+        assert not nb_index.is_ip_available(ls.uuid, '10.0.0.2')
+
+    def test_port_leaving_the_network_frees_its_ip(self, replica, nb_index):
+        ls = self._network(replica, '00:00:00:00:00:01 10.0.0.2')
+        replica.update(ls, ports=[])
+        assert nb_index.is_ip_available(ls.uuid, '10.0.0.2')
+
+    def test_excluded_ips(self, replica, nb_index):
+        ls = self._network(replica, exclude_ips='10.0.0.1 10.0.0.5')
+        assert not nb_index.is_ip_available(ls.uuid, '10.0.0.5')
+        replica.update(ls, other_config={'exclude_ips': '10.0.0.1'})
+        assert nb_index.is_ip_available(ls.uuid, '10.0.0.5')
+
+    def test_excluded_ranges(self, replica, nb_index):
+        ls = self._network(replica, exclude_ips='10.0.0.1..10.0.0.5 10.0.0.9')
+        assert not nb_index.is_ip_available(ls.uuid, '10.0.0.3')
+        assert not nb_index.is_ip_available(ls.uuid, '10.0.0.9')
+        assert nb_index.is_ip_available(ls.uuid, '10.0.0.6')
+
+    def test_next_free_ip(self, replica, nb_index):
+        ls = self._network(
+            replica,
+            '00:00:00:00:00:01 10.0.0.2',
+            '00:00:00:00:00:02 10.0.0.3',
+            exclude_ips='10.0.0.1 10.0.0.5..10.0.0.9',
+        )
+        assert nb_index.next_free_ip(ls.uuid, '10.0.0.0/24') == '10.0.0.4'
+        assert (
+            nb_index.next_free_ip(ls.uuid, '10.0.0.0/24', ('10.0.0.4',))
+            == '10.0.0.10'
+        )
+        assert nb_index.next_free_ip(ls.uuid, '10.0.0.0/30') is None
+
+    def test_router_gateway_takes_the_next_free_ip(self, replica, nb_index):
+        neutron_api = replica_neutron_api(replica, nb_index)
+        ls = self._network(
+            replica, '00:00:00:00:00:01 10.0.0.2', exclude_ips='10.0.0.3'
+        )
+        dhcp = replica.insert(
+            ovnconst.TABLE_DHCP_Options,
+            cidr='10.0.0.0/24',
+            options={'router': '10.0.0.1'},
+            external_ids={SubnetMapper.OVN_NETWORK_ID: str(ls.uuid)},
+        )
+        assert (
+            neutron_api._free_gateway_ip(str(ls.uuid), str(dhcp.uuid))
+            == '10.0.0.4'
+        )
+
+    def test_invalid_exclude_ips_are_ignored(self, replica, nb_index):
+        ls = self._network(replica, exclude_ips='10.0.0.5..10.0.0.1')
+        assert nb_index.is_ip_available(ls.uuid, '10.0.0.3')
+
+    def test_ovn_north_checks_ips_with_the_index(self, replica, nb_index):
+        ls = self._network(replica, '00:00:00:00:00:01 10.0.0.2')
+        ovn_north = OvnNorth(mock.MagicMock(), nb_index)
+        with mock.patch(
+            'ovndb.ovn_north.is_ip_available_in_network'
+        ) as port_scan:
+            assert not ovn_north.is_ip_available_in_network(ls, '10.0.0.2')
+        port_scan.assert_not_called()
+
+
+class TestChangeTag(object):
+    TABLES = (ovnconst.TABLE_LS, ovnconst.TABLE_LSP)
+
+    def test_tag_changes_with_the_tables(self, replica, nb_index):
+        ls, lsp = _add_switch_with_port(replica)
+        tags = [nb_index.change_tag(self.TABLES)]
+        replica.update(lsp, addresses=['00:00:00:00:00:01'])
+        tags.append(nb_index.change_tag(self.TABLES))
+        replica.delete(lsp)
+        tags.append(nb_index.change_tag(self.TABLES))
+        replica.clear()
+        tags.append(nb_index.change_tag(self.TABLES))
+        assert len(set(tags)) == len(tags)
+
+    def test_tag_kept_by_changes_of_other_tables(self, replica, nb_index):
+        _add_switch_with_port(replica)
+        tag = nb_index.change_tag(self.TABLES)
+        pg_tag = nb_index.change_tag([ovnconst.TABLE_PORT_GROUP])
+        replica.insert(ovnconst.TABLE_PORT_GROUP, name='pg')
+        assert nb_index.change_tag(self.TABLES) == tag
+        assert nb_index.change_tag([ovnconst.TABLE_PORT_GROUP]) != pg_tag
+
+    def test_tags_differ_between_indexes(self, replica, nb_index):
+        other_index = create_nb_index(NbReplica())
+        assert nb_index.change_tag(self.TABLES) != other_index.change_tag(
+            self.TABLES
+        )
+
+
+class TestSortedIds(object):
+    def test_ids_in_order_across_batches(self, replica, nb_index):
+        switches = [
+            replica.insert(ovnconst.TABLE_LS, name=str(i)) for i in range(5)
+        ]
+        replica.delete(switches[2])
+        ids = sorted(str(ls.uuid) for ls in switches if ls is not switches[2])
+        with mock.patch('ovndb.nb_index.SORTED_IDS_BATCH', 2):
+            assert list(nb_index.sorted_ids(ovnconst.TABLE_LS)) == ids
+            assert list(nb_index.sorted_ids(ovnconst.TABLE_LS, ids[0])) == (
+                ids[1:]
+            )
+            assert list(
+                nb_index.sorted_ids(ovnconst.TABLE_LS, ids[3], reverse=True)
+            ) == (ids[2::-1])
+
+    @mock.patch('ovndb.nb_index.SORTED_KEYS_MERGE', 2)
+    def test_keys_added_together_are_sorted_in(self, replica):
+        loaded = [replica.insert(ovnconst.TABLE_LS) for _ in range(3)]
+        nb_index = create_nb_index(replica)
+        added = [replica.insert(ovnconst.TABLE_LS) for _ in range(3)]
+        replica.delete(loaded[0])
+        inserted = replica.insert(ovnconst.TABLE_LS)
+
+        assert list(nb_index.sorted_ids(ovnconst.TABLE_LS)) == sorted(
+            str(ls.uuid) for ls in loaded[1:] + added + [inserted]
+        )
+
+    def test_ovirt_ports_by_name(self, replica, nb_index):
+        replica.insert(ovnconst.TABLE_LSP, name='b')
+        for name in ('c', 'a'):
+            replica.insert(
+                ovnconst.TABLE_LSP,
+                name=name,
+                external_ids={PortMapper.OVN_NIC_NAME: 'nic'},
+            )
+        assert list(nb_index.sorted_ids(ovnconst.TABLE_LSP)) == ['a', 'c']
+
+    def test_neutron_api_reads_the_ports_of_the_page(self, replica, nb_index):
+        neutron_api = replica_neutron_api(replica, nb_index)
+        lsps = [
+            replica.insert(
+                ovnconst.TABLE_LSP,
+                name=name,
+                external_ids={PortMapper.OVN_NIC_NAME: 'nic' + name},
+            )
+            for name in ('a', 'b', 'c')
+        ]
+        replica.insert(ovnconst.TABLE_LS, name='network', ports=lsps)
+        ports = neutron_api.iter_ports(marker='a')
+        assert next(ports)['id'] == 'b'
+        assert [port['id'] for port in ports] == ['c']
+
+    def _ports(self, replica, network_name, names):
+        lsps = [
+            replica.insert(
+                ovnconst.TABLE_LSP,
+                name=name,
+                external_ids={PortMapper.OVN_NIC_NAME: 'nic' + name},
+            )
+            for name in names
+        ]
+        return replica.insert(ovnconst.TABLE_LS, name=network_name, ports=lsps)
+
+    def test_neutron_api_pages_the_ports_of_a_network(self, replica, nb_index):
+        neutron_api = replica_neutron_api(replica, nb_index)
+        ls = self._ports(replica, 'network', ('a', 'c', 'e'))
+        self._ports(replica, 'other', ('b', 'd'))
+        filters = {PortMapper.REST_PORT_NETWORK_ID: str(ls.uuid)}
+
+        with mock.patch.object(OvnNorth, 'sorted_ids') as sorted_ids:
+            ports = neutron_api.iter_ports(
+                marker='e', reverse=True, filters=filters
+            )
+            assert [port['id'] for port in ports] == ['c', 'a']
+        assert sorted_ids.call_count == 0
+        ports = neutron_api.iter_ports(filters={PortMapper.REST_PORT_ID: 'd'})
+        assert [port['id'] for port in ports] == ['d']
+
+    def test_neutron_api_reads_the_ports_a_batch_at_a_time(
+        self, replica, nb_index
+    ):
+        neutron_api = replica_neutron_api(replica, nb_index)
+        self._ports(replica, 'network', ('a', 'b', 'c'))
+
+        with mock.patch('neutron.neutron_api.PORTS_BATCH', 2):
+            with mock.patch.object(
+                OvnNorth,
+                'snapshot',
+                autospec=True,
+                side_effect=OvnNorth.snapshot,
+            ) as snapshot:
+                ports = neutron_api.iter_ports(
+                    filters={PortMapper.REST_PORT_NAME: 'nicb'}
+                )
+                assert [port['id'] for port in ports] == ['b']
+        assert snapshot.call_count == 2
@@ -0,0 +1,86 @@
+# Copyright 2026 Red Hat, Inc.
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA
+#
+# Refer to the README and COPYING files for full details of the license
+from __future__ import absolute_import
+
+import unittest.mock as mock
+
+import pytest
+
+import constants as ovnconst
+from handlers.base_handler import ElementNotFoundError
+from ovndb.nb_reader import CommandReader
+from ovndb.nb_reader import IdlReader
+from ovndb.nb_reader import create_nb_reader
+
+from ovntestlib import NbReplica
+from ovntestlib import NbReplicaApi
+
+
+@pytest.fixture
+def replica():
+    return NbReplica()
+
+
+@pytest.fixture
+def api(replica):
+    return NbReplicaApi(replica)
+
+
+class TestIdlReader(object):
+    def test_replica_is_read_directly(self, api):
+        assert isinstance(create_nb_reader(api), IdlReader)
+
+    def test_list_rows(self, replica, api):
+        ls = replica.insert(ovnconst.TABLE_LS, name='network')
+        rows = create_nb_reader(api).list_rows(ovnconst.TABLE_LS)
+        assert [row.uuid for row in rows] == [ls.uuid]
+
+    def test_get_row_by_uuid_and_name(self, replica, api):
+        lsp = replica.insert(ovnconst.TABLE_LSP, name='port')
+        reader = create_nb_reader(api)
+        assert reader.get_row(ovnconst.TABLE_LSP, str(lsp.uuid)) is lsp
+        assert reader.get_row(ovnconst.TABLE_LSP, 'port') is lsp
+
+    def test_missing_row(self, api):
+        with pytest.raises(ElementNotFoundError):
+            create_nb_reader(api).get_row(ovnconst.TABLE_LSP, 'missing')
+
+    def test_rows_are_read_under_the_replica_lock(self, replica, api):
+        replica.lock = mock.MagicMock()
+        create_nb_reader(api).list_rows(ovnconst.TABLE_LS)
+        replica.lock.__enter__.assert_called_once_with()
+
+
+class TestCommandReader(object):
+    def test_mocked_connection_is_read_by_commands(self):
+        assert isinstance(create_nb_reader(mock.MagicMock()), CommandReader)
+
+    def test_list_rows(self):
+        api = mock.MagicMock()
+        reader = create_nb_reader(api)
+        reader.list_rows(ovnconst.TABLE_LS)
+        reader.list_rows(ovnconst.TABLE_ACL)
+        api.ls_list.return_value.execute.assert_called_once_with(
+            check_error=True
+        )
+        api.db_list_rows.assert_called_once_with(ovnconst.TABLE_ACL)
+
+    def test_get_row(self):
+        api = mock.MagicMock()
+        create_nb_reader(api).get_row(ovnconst.TABLE_LSP, 'port')
+        api.lsp_get.assert_called_once_with('port')
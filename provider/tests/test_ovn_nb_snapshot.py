@@ -0,0 +1,171 @@
+# Copyright 2026 Red Hat, Inc.
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA
+#
+# Refer to the README and COPYING files for full details of the license
+from __future__ import absolute_import
+
+import json
+import threading
+import time
+
+from ovs import poller
+from ovs.db.idl import Idl
+from ovs.db.idl import SchemaHelper
+import pytest
+
+import constants as ovnconst
+from ovn_connection import register_nb_tables
+from ovndb.nb_snapshot import SnapshotWriter
+from ovndb.nb_snapshot import load_snapshot
+from ovndb.nb_snapshot import take_snapshot
+from ovndb.nb_snapshot import write_snapshot
+
+from ovntestlib import NB_SCHEMA
+from ovntestlib import OvsdbServerStandIn
+
+
+@pytest.fixture
+def server(tmp_path):
+    server = OvsdbServerStandIn(str(tmp_path / 'nb.sock'))
+    yield server
+    server.close()
+
+
+@pytest.fixture
+def snapshot_file(tmp_path):
+    return str(tmp_path / 'nb.snapshot')
+
+
+def _idl(server):
+    helper = SchemaHelper(schema_json=NB_SCHEMA)
+    register_nb_tables(helper)
+    return Idl(server.remote, helper)
+
+
+def _sync(idl):
+    deadline = time.monotonic() + 5
+    while idl.change_seqno == 0 or idl._monitor_request_id is not None:
+        assert time.monotonic() < deadline, 'the idl did not sync'
+        idl.run()
+        wait = poller.Poller()
+        idl.wait(wait)
+        wait.timer_wait(100)
+        wait.block()
+    return idl
+
+
+def _switch_names(idl):
+    return sorted(
+        ls.name for ls in idl.tables[ovnconst.TABLE_LS].rows.values()
+    )
+
+
+def _save(server, snapshot_file):
+    idl = _sync(_idl(server))
+    write_snapshot(take_snapshot(idl), snapshot_file)
+    idl.close()
+
+
+class TestSnapshot(object):
+    def test_restart_gets_changes_since_the_snapshot(
+        self, server, snapshot_file
+    ):
+        server.insert(ovnconst.TABLE_LS, name='net0')
+        gone = server.insert(ovnconst.TABLE_LS, name='net1')
+        _save(server, snapshot_file)
+        snapshot_last_id = server.last_id
+        server.insert(ovnconst.TABLE_LS, name='net2')
+        server.delete(ovnconst.TABLE_LS, gone)
+
+        idl = _idl(server)
+        assert load_snapshot(idl, snapshot_file)
+        assert _switch_names(idl) == ['net0', 'net1']
+        _sync(idl)
+
+        assert server.requested_last_ids[-1] == snapshot_last_id
+        assert _switch_names(idl) == ['net0', 'net2']
+        assert idl.last_id == server.last_id
+        idl.close()
+
+    def test_full_sync_when_history_is_exceeded(self, server, snapshot_file):
+        gone = server.insert(ovnconst.TABLE_LS, name='net0')
+        _save(server, snapshot_file)
+        server.delete(ovnconst.TABLE_LS, gone)
+        server.insert(ovnconst.TABLE_LS, name='net1')
+        server.forget_history()
+
+        idl = _idl(server)
+        assert load_snapshot(idl, snapshot_file)
+        _sync(idl)
+
+        assert _switch_names(idl) == ['net1']
+        idl.close()
+
+    def test_references_and_maps_are_restored(self, server, snapshot_file):
+        lsp = server.insert(
+            ovnconst.TABLE_LSP,
+            name='port',
+            external_ids=['map', [['ovirt_nic_name', 'nic0']]],
+        )
+        server.insert(
+            ovnconst.TABLE_LS, name='net0', ports=['set', [['uuid', lsp]]]
+        )
+        _save(server, snapshot_file)
+
+        idl = _idl(server)
+        load_snapshot(idl, snapshot_file)
+
+        ls = next(iter(idl.tables[ovnconst.TABLE_LS].rows.values()))
+        assert [port.name for port in ls.ports] == ['port']
+        assert ls.ports[0].external_ids == {'ovirt_nic_name': 'nic0'}
+        idl.close()
+
+    def test_missing_snapshot(self, server, snapshot_file):
+        assert not load_snapshot(_idl(server), snapshot_file)
+
+    def test_corrupt_snapshot(self, server, snapshot_file):
+        with open(snapshot_file, 'w') as f:
+            f.write('{"format": 1, "sche')
+        assert not load_snapshot(_idl(server), snapshot_file)
+
+    def test_snapshot_of_another_schema(self, server, snapshot_file):
+        server.insert(ovnconst.TABLE_LS, name='net0')
+        _save(server, snapshot_file)
+        with open(snapshot_file) as f:
+            snapshot = json.load(f)
+        del snapshot['schema'][ovnconst.TABLE_ACL]
+        with open(snapshot_file, 'w') as f:
+            json.dump(snapshot, f)
+
+        idl = _idl(server)
+        assert not load_snapshot(idl, snapshot_file)
+        assert _switch_names(idl) == []
+
+
+class TestSnapshotWriter(object):
+    def test_only_changed_replica_is_saved(self, server, snapshot_file):
+        server.insert(ovnconst.TABLE_LS, name='net0')
+        idl = _sync(_idl(server))
+        writer = SnapshotWriter(idl, threading.RLock(), snapshot_file, 60)
+
+        writer.save()
+        with open(snapshot_file, 'w') as f:
+            f.write('unchanged')
+        writer.save()
+
+        with open(snapshot_file) as f:
+            assert f.read() == 'unchanged'
+        idl.close()
@@ -279,6 +279,10 @@ class TestOvnNorth(object):
 
     subnets = [SUBNET_101, SUBNET_102]
 
+    @mock.patch('neutron.neutron_api.NeutronApi._instance', None)
+    def test_neutron_api_instance_is_shared(self, mock_connection):
+        assert NeutronApi.instance() is NeutronApi.instance()
+
     @mock.patch(
         'ovsdbapp.schema.ovn_northbound.commands.LsListCommand', autospec=False
     )
@@ -444,8 +448,8 @@ class TestOvnNorth(object):
     )
     @mock.patch(
         'ovsdbapp.schema.ovn_northbound.commands.DhcpOptionsAddCommand.'
-        'execute',
-        lambda cmd, check_error: TestOvnNorth.SUBNET_MTU,
+        'result',
+        property(lambda cmd: TestOvnNorth.SUBNET_MTU),
     )
     @mock.patch(
         'ovsdbapp.schema.ovn_northbound.commands.DhcpOptionsListCommand.'
@@ -492,7 +496,7 @@ class TestOvnNorth(object):
 
         expected_options_call = mock.call(
             ovn_north.idl,
-            TestOvnNorth.SUBNET_IDMTU,
+            mock.ANY,
             dns_server='1.1.1.1',
             lease_time=dhcp_lease_time(),
             router='1.1.1.0',
@@ -518,8 +522,8 @@ class TestOvnNorth(object):
     )
     @mock.patch(
         'ovsdbapp.schema.ovn_northbound.commands.DhcpOptionsAddCommand.'
-        'execute',
-        lambda cmd, check_error: TestOvnNorth.SUBNET_MTU,
+        'result',
+        property(lambda cmd: TestOvnNorth.SUBNET_MTU),
     )
     @mock.patch(
         'ovsdbapp.schema.ovn_northbound.commands.LsAddCommand.execute',
@@ -950,7 +954,7 @@ class TestOvnNorth(object):
     )
     def test_list_ports(self, mock_connection):
         ovn_north = NeutronApi()
-        ports = ovn_north.list_ports()
+        ports = list(ovn_north.list_ports())
         assert len(ports) == 3
         logical_switch = OvnNetworkRow(
             TestOvnNorth.NETWORK_ID11,
@@ -1073,6 +1077,10 @@ class TestOvnNorth(object):
         )
         assert mock_del_command.mock_calls[0] == expected_del_call
 
+    @mock.patch(
+        'ovsdbapp.backend.ovs_idl.transaction.Transaction.commit',
+        lambda x: None,
+    )
     @mock.patch(
         'ovsdbapp.schema.ovn_northbound.commands.DhcpOptionsListCommand.'
         'execute',
@@ -1105,8 +1113,7 @@ class TestOvnNorth(object):
         mock_dbset_command,
         mock_connection,
     ):
-        add_execute = mock_add_command.return_value.execute
-        add_execute.return_value = TestOvnNorth.SUBNET_102
+        mock_add_command.return_value.result = TestOvnNorth.SUBNET_102
         ovn_north = NeutronApi()
         rest_data = SubnetApiInputMaker(
             TestOvnNorth.SUBNET_102.external_ids.get(SubnetMapper.OVN_NAME),
@@ -1149,7 +1156,7 @@ class TestOvnNorth(object):
 
         expected_options_call = mock.call(
             ovn_north.idl,
-            TestOvnNorth.SUBNET_ID102,
+            mock_add_command.return_value,
             dns_server='1.1.1.1',
             lease_time=dhcp_lease_time(),
             router='1.1.1.0',
@@ -1159,6 +1166,10 @@ class TestOvnNorth(object):
         )
         assert mock_setoptions_command.mock_calls[0] == expected_options_call
 
+    @mock.patch(
+        'ovsdbapp.backend.ovs_idl.transaction.Transaction.commit',
+        lambda x: None,
+    )
     @mock.patch(
         'ovsdbapp.schema.ovn_northbound.commands.DhcpOptionsListCommand.'
         'execute',
@@ -1191,8 +1202,7 @@ class TestOvnNorth(object):
         mock_dbset_command,
         mock_connection,
     ):
-        add_execute = mock_add_command.return_value.execute
-        add_execute.return_value = TestOvnNorth.SUBNET_102
+        mock_add_command.return_value.result = TestOvnNorth.SUBNET_102
         ovn_north = NeutronApi()
         rest_data = SubnetApiInputMaker(
             'subnet_name',
@@ -1208,6 +1218,70 @@ class TestOvnNorth(object):
         assert mock_add_command.call_count == 1
         assert mock_setoptions_command.call_count == 1
 
+    @mock.patch(
+        'ovsdbapp.schema.ovn_northbound.commands.DhcpOptionsListCommand.'
+        'execute',
+        lambda cmd, check_error: [],
+    )
+    @mock.patch(
+        'ovsdbapp.schema.ovn_northbound.commands.LsGetCommand.execute',
+        lambda cmd, check_error: OvnNetworkRow(
+            TestOvnNorth.NETWORK_ID11,
+            TestOvnNorth.NETWORK_NAME11,
+            ports=[
+                OvnPortRow(
+                    TestOvnNorth.PORT_ID01,
+                    addresses=[TestOvnNorth.MAC_ADDRESS],
+                ),
+                OvnPortRow(
+                    TestOvnNorth.PORT_ID02,
+                    addresses=['router'],
+                    port_type=ovnconst.LSP_TYPE_ROUTER,
+                ),
+            ],
+        ),
+    )
+    @mock.patch(
+        'ovsdbapp.schema.ovn_northbound.commands.DhcpOptionsGetCommand.'
+        'execute',
+        lambda cmd, check_error: TestOvnNorth.SUBNET_102,
+    )
+    @mock.patch('ovsdbapp.backend.ovs_idl.transaction.Transaction.commit')
+    @mock.patch(
+        'ovsdbapp.backend.ovs_idl.command.DbSetCommand', autospec=False
+    )
+    @mock.patch(
+        'ovsdbapp.schema.ovn_northbound.commands.DhcpOptionsAddCommand',
+        autospec=False,
+    )
+    @mock.patch(
+        'ovsdbapp.schema.ovn_northbound.commands.DhcpOptionsSetOptionsCommand',
+        autospec=False,
+    )
+    def test_add_subnet_in_one_transaction(
+        self,
+        mock_setoptions_command,
+        mock_add_command,
+        mock_dbset_command,
+        mock_commit,
+        mock_connection,
+    ):
+        mock_add_command.return_value.result = TestOvnNorth.SUBNET_102
+        ovn_north = NeutronApi()
+        rest_data = SubnetApiInputMaker(
+            'subnet_name',
+            cidr=TestOvnNorth.SUBNET_CIDR,
+            network_id=str(TestOvnNorth.NETWORK_ID11),
+            gateway_ip='1.1.1.0',
+            ip_version=4,
+        ).get()
+        ovn_north.add_subnet(rest_data)
+
+        assert mock_commit.call_count == 1
+        # the ports of the network are left as they are
+        assert mock_dbset_command.call_count == 1
+        assert mock_dbset_command.call_args[0][1] == ovnconst.TABLE_LS
+
     """
     TODO: This test causes Jenkins to get stuck. Commenting out until the
     issue is solved.
@@ -1949,6 +2023,10 @@ class TestOvnNorth(object):
             'cidr=1.1.1.0/24 or gateway=1.1.1.0'
         )
 
+    @mock.patch(
+        'ovsdbapp.backend.ovs_idl.transaction.Transaction.commit',
+        lambda x: None,
+    )
     @mock.patch(
         'ovsdbapp.schema.ovn_northbound.commands.DhcpOptionsGetCommand.'
         'execute',
@@ -1956,8 +2034,8 @@ class TestOvnNorth(object):
     )
     @mock.patch(
         'ovsdbapp.schema.ovn_northbound.commands.DhcpOptionsAddCommand.'
-        'execute',
-        lambda cmd, check_error: TestOvnNorth.SUBNET_IPV6,
+        'result',
+        property(lambda cmd: TestOvnNorth.SUBNET_IPV6),
     )
     @mock.patch(
         'ovsdbapp.schema.ovn_northbound.commands.DhcpOptionsListCommand.'